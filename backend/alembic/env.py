@@ -6,7 +6,7 @@ from sqlalchemy.ext.asyncio import create_async_engine
 
 from src.core.config import settings
 from src.core.models import Base  # noqa: F401 — ensure all models registered
-from src.core.models import Prediction  # noqa: F401
+from src.core.models import Prediction, PredictionRollup  # noqa: F401
 
 config = context.config
 
@@ -0,0 +1,43 @@
+"""prediction_history_indexes
+
+Revision ID: 3b8d41c2e9a7
+Revises: f0e4d6f346e5
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8d41c2e9a7'
+down_revision: Union[str, None] = 'f0e4d6f346e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FILTER_COLUMNS = ("model_name", "carrier", "origin", "dest")
+PAYLOAD_COLUMNS = ["predicted_delayed", "delay_probability"]
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_predictions_created_at_id",
+        "predictions",
+        ["created_at", "id"],
+        postgresql_include=["model_name", *PAYLOAD_COLUMNS],
+    )
+    for column in FILTER_COLUMNS:
+        op.create_index(
+            f"ix_predictions_{column}_created_at_id",
+            "predictions",
+            [column, "created_at", "id"],
+            postgresql_include=[c for c in FILTER_COLUMNS if c != column] + PAYLOAD_COLUMNS,
+        )
+
+
+def downgrade() -> None:
+    for column in reversed(FILTER_COLUMNS):
+        op.drop_index(f"ix_predictions_{column}_created_at_id", table_name="predictions")
+    op.drop_index("ix_predictions_created_at_id", table_name="predictions")
@@ -0,0 +1,26 @@
+"""prediction_model_version
+
+Revision ID: 7c2e5a9d1f04
+Revises: 3b8d41c2e9a7
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e5a9d1f04'
+down_revision: Union[str, None] = '3b8d41c2e9a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('predictions', sa.Column('model_version', sa.String(length=12), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('predictions', 'model_version')
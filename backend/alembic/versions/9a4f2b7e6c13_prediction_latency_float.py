@@ -0,0 +1,39 @@
+"""prediction_latency_float
+
+Revision ID: 9a4f2b7e6c13
+Revises: 7c2e5a9d1f04
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4f2b7e6c13'
+down_revision: Union[str, None] = '7c2e5a9d1f04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        'predictions',
+        'latency_ms',
+        existing_type=sa.Integer(),
+        type_=sa.Float(),
+        existing_nullable=True,
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'predictions',
+        'latency_ms',
+        existing_type=sa.Float(),
+        type_=sa.Integer(),
+        existing_nullable=True,
+        postgresql_using='round(latency_ms)::integer',
+    )
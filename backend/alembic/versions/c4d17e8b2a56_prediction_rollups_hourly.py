@@ -0,0 +1,49 @@
+"""prediction_rollups_hourly
+
+Revision ID: c4d17e8b2a56
+Revises: 9a4f2b7e6c13
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d17e8b2a56'
+down_revision: Union[str, None] = '9a4f2b7e6c13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'prediction_rollups_hourly',
+        sa.Column('bucket', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('model_name', sa.String(length=50), nullable=False),
+        sa.Column('carrier', sa.String(length=3), nullable=False),
+        sa.Column('origin', sa.String(length=4), nullable=False),
+        sa.Column('dest', sa.String(length=4), nullable=False),
+        sa.Column('predictions', sa.Integer(), nullable=False),
+        sa.Column('delayed', sa.Integer(), nullable=False),
+        sa.Column('delay_probability_sum', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('bucket', 'model_name', 'carrier', 'origin', 'dest'),
+    )
+    # Backfill from the existing predictions; new ones are added as they
+    # are inserted.
+    op.execute(
+        """
+        INSERT INTO prediction_rollups_hourly
+        SELECT date_trunc('hour', created_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+               model_name, carrier, origin, dest,
+               count(*), count(*) FILTER (WHERE predicted_delayed), sum(delay_probability)
+        FROM predictions
+        GROUP BY 1, 2, 3, 4, 5
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('prediction_rollups_hourly')
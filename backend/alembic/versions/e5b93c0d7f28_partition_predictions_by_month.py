@@ -0,0 +1,111 @@
+"""partition_predictions_by_month
+
+Revision ID: e5b93c0d7f28
+Revises: c4d17e8b2a56
+Create Date: 2026-10-19 09:00:00.000000
+
+Rebuilds ``predictions`` as a table range-partitioned by month on
+``created_at`` and copies the existing rows over, so it holds an exclusive
+lock on the table for the length of the copy. Partitions are created from
+the oldest row's month through ``MONTHS_AHEAD`` months from now; the API's
+partition manager keeps creating them after that.
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b93c0d7f28'
+down_revision: Union[str, None] = 'c4d17e8b2a56'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+FILTER_COLUMNS = ("model_name", "carrier", "origin", "dest")
+PAYLOAD_COLUMNS = ["predicted_delayed", "delay_probability"]
+
+
+def _month(value: datetime, offset: int = 0) -> datetime:
+    index = value.year * 12 + value.month - 1 + offset
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def _create_history_indexes() -> None:
+    op.create_index(
+        "ix_predictions_created_at_id",
+        "predictions",
+        ["created_at", "id"],
+        postgresql_include=["model_name", *PAYLOAD_COLUMNS],
+    )
+    for column in FILTER_COLUMNS:
+        op.create_index(
+            f"ix_predictions_{column}_created_at_id",
+            "predictions",
+            [column, "created_at", "id"],
+            postgresql_include=[c for c in FILTER_COLUMNS if c != column] + PAYLOAD_COLUMNS,
+        )
+
+
+def _drop_history_indexes() -> None:
+    for column in reversed(FILTER_COLUMNS):
+        op.drop_index(f"ix_predictions_{column}_created_at_id", table_name="predictions")
+    op.drop_index("ix_predictions_created_at_id", table_name="predictions")
+
+
+def upgrade() -> None:
+    _drop_history_indexes()
+    op.rename_table("predictions", "predictions_unpartitioned")
+    op.execute(
+        "ALTER TABLE predictions_unpartitioned "
+        "RENAME CONSTRAINT predictions_pkey TO predictions_unpartitioned_pkey"
+    )
+    # The partition key has to be part of the primary key.
+    op.execute(
+        "CREATE TABLE predictions (LIKE predictions_unpartitioned INCLUDING DEFAULTS, "
+        "PRIMARY KEY (id, created_at)) PARTITION BY RANGE (created_at)"
+    )
+
+    oldest = op.get_bind().execute(
+        sa.text("SELECT min(created_at) FROM predictions_unpartitioned")
+    ).scalar()
+    now = datetime.now(timezone.utc)
+    start = _month(oldest.astimezone(timezone.utc) if oldest else now)
+    while start <= _month(now, MONTHS_AHEAD):
+        end = _month(start, 1)
+        op.execute(
+            f"CREATE TABLE predictions_y{start.year}m{start.month:02d} PARTITION OF predictions "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        start = end
+
+    op.execute("INSERT INTO predictions SELECT * FROM predictions_unpartitioned")
+    op.drop_table("predictions_unpartitioned")
+
+    # Indexes on the parent are created on every partition, current and future.
+    _create_history_indexes()
+    op.create_index(
+        "ix_predictions_created_at_brin",
+        "predictions",
+        ["created_at"],
+        postgresql_using="brin",
+    )
+    op.execute("ANALYZE predictions")
+
+
+def downgrade() -> None:
+    # Partitions already moved to the archive schema are left there.
+    op.execute(
+        "CREATE TABLE predictions_unpartitioned "
+        "(LIKE predictions INCLUDING DEFAULTS, PRIMARY KEY (id))"
+    )
+    op.execute("INSERT INTO predictions_unpartitioned SELECT * FROM predictions")
+    op.drop_table("predictions")
+    op.rename_table("predictions_unpartitioned", "predictions")
+    op.execute(
+        "ALTER TABLE predictions "
+        "RENAME CONSTRAINT predictions_unpartitioned_pkey TO predictions_pkey"
+    )
+    _create_history_indexes()
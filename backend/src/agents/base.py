@@ -1,34 +1,151 @@
+import hashlib
 import logging
+import threading
+import time
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any
+from typing import Any, ClassVar
+
+import numpy as np
+
+from src.core.config import settings
+
+from .compiled import compile_model
+from .features import FeatureBatch, flight_encoder
 
 logger = logging.getLogger(__name__)
 
+# A realistic flight used to push each model through its first-call
+# allocations before real traffic arrives.
+WARMUP_ROW: dict[str, Any] = {
+    "month": 7,
+    "day_of_month": 15,
+    "day_of_week": 3,
+    "dep_time": 1200,
+    "carrier": "AA",
+    "origin": "ORD",
+    "dest": "LAX",
+    "distance": 1745,
+}
+
 
 class BaseMLAgent(ABC):
-    def __init__(self, model_path: str) -> None:
-        self.model_path = Path(model_path)
+    # Suffix of the library's own model format, loaded instead of the pickle
+    # according to ``settings.ml.model_format``.
+    native_suffix: ClassVar[str | None] = None
+
+    def __init__(self, model_path: str, lazy: bool = False, compiled: bool = False) -> None:
+        self.model_path = self.resolve_model_path(Path(model_path))
         self.model: Any = None
+        # Compiled NumPy copy of ``model`` used for small batches, if requested.
+        self.compiled = compiled
+        self.engine: Any = None
+        self.version: str | None = None
+        self.lazy = lazy
+        self.load_error: str | None = None
+        self.load_ms: float | None = None
+        self.warmup_ms: float | None = None
         self._is_loaded = False
-        self._init_model()
+        self._load_lock = threading.Lock()
+        if not lazy:
+            self._init_model()
 
     def _init_model(self) -> None:
         if not self.model_path.exists():
-            logger.warning(f"Model file not found: {self.model_path}")
+            self.load_error = f"Model file not found: {self.model_path}"
+            logger.warning(self.load_error)
             return
+        start = time.perf_counter()
         try:
             self.model = self.load(self.model_path)
+            self.engine = self._compile() if self.compiled else None
+            self.version = self.checksum()
             self._is_loaded = True
-            logger.info(f"{self.name} loaded from {self.model_path}")
+            self.load_error = None
+            self.load_ms = (time.perf_counter() - start) * 1000
+            logger.info(f"{self.name} loaded from {self.model_path} in {self.load_ms:.0f} ms")
         except Exception as e:
+            self.load_error = str(e)
             logger.error(f"Failed to load {self.name}: {e}")
 
+    def ensure_loaded(self) -> bool:
+        """Load and warm up a lazy agent on first use; cheap once loaded."""
+        if self.is_loaded() or not self.lazy:
+            return self.is_loaded()
+        with self._load_lock:
+            if not self.is_loaded():
+                self._init_model()
+                if self.is_loaded():
+                    self.warmup()
+        return self.is_loaded()
+
+    def warmup(self) -> float:
+        start = time.perf_counter()
+        self.predict_batch([WARMUP_ROW])
+        self.warmup_ms = (time.perf_counter() - start) * 1000
+        return self.warmup_ms
+
+    @property
+    def warmed_up(self) -> bool:
+        return self.warmup_ms is not None
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "lazy": self.lazy,
+            "is_loaded": self.is_loaded(),
+            "warmed_up": self.warmed_up,
+            "compiled": self.engine is not None,
+            "load_ms": self.load_ms,
+            "warmup_ms": self.warmup_ms,
+            "error": self.load_error,
+        }
+
+    @classmethod
+    def resolve_model_path(cls, path: Path) -> Path:
+        if cls.native_suffix is None or settings.ml.model_format == "pickle":
+            return path
+        native = path.with_suffix(cls.native_suffix)
+        if settings.ml.model_format == "native" or native.exists():
+            return native
+        return path
+
     @abstractmethod
     def load(self, path: Path) -> Any: ...
 
+    def _compile(self) -> Any:
+        try:
+            engine = compile_model(self.model)
+        except NotImplementedError as e:
+            logger.warning(f"{self.name}: compiled engine unavailable, using the library predictor ({e})")
+            return None
+        logger.info(f"{self.name}: compiled engine enabled")
+        return engine
+
+    def predictor(self, batch_size: int) -> Any:
+        if self.engine is not None and batch_size <= settings.ml.compiled_max_batch_size:
+            return self.engine
+        return self.model
+
+    def artifact_paths(self) -> list[Path]:
+        return [self.model_path]
+
+    def checksum(self) -> str:
+        """Short sha256 over every artifact the predictions depend on."""
+        digest = hashlib.sha256()
+        for path in self.artifact_paths():
+            if path.exists():
+                with open(path, "rb") as f:
+                    digest.update(hashlib.file_digest(f, "sha256").digest())
+        return digest.hexdigest()[:12]
+
     @abstractmethod
-    def preprocess(self, data: dict[str, Any]) -> Any: ...
+    def build_input(self, batch: FeatureBatch) -> Any: ...
+
+    def preprocess_batch(self, data: list[dict[str, Any]]) -> Any:
+        return self.build_input(flight_encoder.encode(data))
+
+    def preprocess(self, data: dict[str, Any]) -> Any:
+        return self.preprocess_batch([data])
 
     def is_loaded(self) -> bool:
         return self._is_loaded and self.model is not None
@@ -37,12 +154,72 @@ class BaseMLAgent(ABC):
         if not self.is_loaded():
             raise RuntimeError(f"{self.name} is not loaded")
         processed = self.preprocess(data)
-        proba = self.model.predict_proba(processed)[0]
-        return {
-            "delayed": bool(proba[1] > 0.5),
-            "delay_probability": float(proba[1]),
-            "no_delay_probability": float(proba[0]),
-        }
+        proba = self.predictor(1).predict_proba(processed)
+        return self._to_results(proba)[0]
+
+    def predict_batch(
+        self, data: list[dict[str, Any]], timings: dict[str, float] | None = None
+    ) -> list[dict[str, Any] | Exception]:
+        start = time.perf_counter()
+        batch = flight_encoder.encode(data)
+        if timings is not None:
+            timings["preprocess"] = time.perf_counter() - start
+        return self.predict_features(batch, timings)
+
+    def predict_features(
+        self, batch: FeatureBatch, timings: dict[str, float] | None = None
+    ) -> list[dict[str, Any] | Exception]:
+        """Score all rows with a single ``predict_proba`` call.
+
+        Results keep the input order and carry the ``model_version`` that
+        produced them. Rows that fail preprocessing (e.g. an unknown
+        category) are returned as the raised exception instead of failing
+        the whole batch. Seconds spent in ``preprocess`` and ``inference``
+        are added to ``timings`` when given.
+        """
+        if not self.is_loaded():
+            raise RuntimeError(f"{self.name} is not loaded")
+
+        start = time.perf_counter()
+        results: list[dict[str, Any] | Exception] = [None] * len(batch)  # type: ignore[list-item]
+        try:
+            valid = list(range(len(batch)))
+            processed = self.build_input(batch)
+        except ValueError:
+            valid = []
+            for i in range(len(batch)):
+                try:
+                    self.build_input(batch.take([i]))
+                except ValueError as e:
+                    results[i] = e
+                else:
+                    valid.append(i)
+            if not valid:
+                return results
+            processed = self.build_input(batch.take(valid))
+
+        preprocessed = time.perf_counter()
+        proba = self.predictor(len(valid)).predict_proba(processed)
+        if timings is not None:
+            timings["preprocess"] = timings.get("preprocess", 0.0) + preprocessed - start
+            timings["inference"] = time.perf_counter() - preprocessed
+        for i, result in zip(valid, self._to_results(proba)):
+            result["model_version"] = self.version
+            results[i] = result
+        return results
+
+    @staticmethod
+    def _to_results(proba: np.ndarray) -> list[dict[str, Any]]:
+        delay = proba[:, 1].tolist()
+        no_delay = proba[:, 0].tolist()
+        return [
+            {
+                "delayed": p > 0.5,
+                "delay_probability": p,
+                "no_delay_probability": q,
+            }
+            for p, q in zip(delay, no_delay)
+        ]
 
     @property
     def name(self) -> str:
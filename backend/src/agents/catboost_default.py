@@ -2,33 +2,26 @@ import pickle
 from pathlib import Path
 from typing import Any
 
-import pandas as pd
+import numpy as np
 
 from src.core.config import settings
 
 from .base import BaseMLAgent
+from .features import FeatureBatch, flight_encoder
+from .native import load_catboost
 
 
 class CatBoostDefaultAgent(BaseMLAgent):
-    def __init__(self) -> None:
-        super().__init__(settings.ml.catboost_default_path)
+    native_suffix = ".cbm"
+
+    def __init__(self, lazy: bool = False, compiled: bool = False) -> None:
+        super().__init__(settings.ml.catboost_default_path, lazy=lazy, compiled=compiled)
 
     def load(self, path: Path) -> Any:
+        if path.suffix == self.native_suffix:
+            return load_catboost(path)
         with open(path, "rb") as f:
             return pickle.load(f)
 
-    def preprocess(self, data: dict[str, Any]) -> pd.DataFrame:
-        return pd.DataFrame(
-            [
-                {
-                    "Month": data["month"],
-                    "DayofMonth": data["day_of_month"],
-                    "DayOfWeek": data["day_of_week"],
-                    "DepTime": data["dep_time"],
-                    "UniqueCarrier": data["carrier"],
-                    "Origin": data["origin"],
-                    "Dest": data["dest"],
-                    "Distance": data["distance"],
-                }
-            ]
-        )
+    def build_input(self, batch: FeatureBatch) -> np.ndarray:
+        return flight_encoder.object_matrix(batch)
@@ -0,0 +1,93 @@
+import logging
+import os
+import pickle
+import threading
+from collections.abc import Callable, Mapping, Sequence
+from functools import lru_cache
+from pathlib import Path
+from typing import ClassVar
+
+import numpy as np
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CategoryIndex:
+    """Precomputed category -> code tables built from the training label encoders.
+
+    Encodes a whole column in one pass. Values the encoders never saw map to
+    ``unknown_code`` (NaN by default, which LightGBM routes as missing), or
+    raise ``ValueError`` when ``strict`` is set. ``listeners`` are called
+    with the feature, the values looked up and the unknown ones after every
+    ``encode``, in the process that encoded them.
+    """
+
+    listeners: ClassVar[list[Callable[[str, int, int], None]]] = []
+
+    def __init__(
+        self,
+        classes: Mapping[str, Sequence[str]],
+        unknown_code: float = float("nan"),
+        strict: bool = False,
+    ) -> None:
+        self._codes = {
+            name: {str(value): code for code, value in enumerate(values)}
+            for name, values in classes.items()
+        }
+        self.unknown_code = unknown_code
+        self.strict = strict
+
+    @classmethod
+    def from_label_encoders(cls, encoders: Mapping, **kwargs) -> "CategoryIndex":
+        return cls({name: list(enc.classes_) for name, enc in encoders.items()}, **kwargs)
+
+    def values(self, name: str) -> list[str]:
+        return list(self._codes[name])
+
+    def encode(self, name: str, values: np.ndarray) -> np.ndarray:
+        get = self._codes[name].get
+        codes = np.fromiter((get(v, -1) for v in values), dtype=np.int64, count=len(values))
+        missing = codes < 0
+        n_missing = int(np.count_nonzero(missing))
+        for listener in self.listeners:
+            listener(name, len(values), n_missing)
+        if not n_missing:
+            return codes
+
+        if self.strict:
+            unseen = sorted({str(v) for v in values[missing]})
+            raise ValueError(f"Unknown {name} value(s): {', '.join(unseen)}")
+        out = codes.astype(np.float64)
+        out[missing] = self.unknown_code
+        return out
+
+    def sizes(self) -> dict[str, int]:
+        return {name: len(codes) for name, codes in self._codes.items()}
+
+
+# lru_cache does not stop two threads from building the same entry, and
+# agents that share an index must get the same instance.
+_index_lock = threading.Lock()
+
+
+@lru_cache(maxsize=4)
+def _load_category_index(path: str, mtime_ns: int) -> CategoryIndex:
+    with open(path, "rb") as f:
+        encoders = pickle.load(f)
+    logger.info(f"Category index built from {path}")
+    return CategoryIndex.from_label_encoders(
+        encoders,
+        unknown_code=settings.ml.unknown_category_code,
+        strict=settings.ml.unknown_category_strict,
+    )
+
+
+def load_category_index(path: str | None = None) -> CategoryIndex | None:
+    """Shared index for ``path``; rebuilt only when the file changes."""
+    path = path or settings.ml.label_encoders_path
+    if not Path(path).exists():
+        return None
+    with _index_lock:
+        return _load_category_index(path, os.stat(path).st_mtime_ns)
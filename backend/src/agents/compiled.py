@@ -0,0 +1,156 @@
+"""Pure-NumPy LightGBM ensembles compiled from the loaded boosters.
+
+Each model is flattened once into arrays. Batches are then evaluated for
+all trees at once, one tree level per step, with no per-call setup in the
+library. This pays off for the small batches the API sees. Only LightGBM is
+compiled: the CatBoost agents pass raw string categories that CatBoost
+turns into one-hot and CTR features internally. For CatBoost models, and
+for LightGBM models using features this engine does not implement,
+``compile_model`` raises ``NotImplementedError`` and the agent keeps the
+library predictor.
+"""
+from typing import Any
+
+import numpy as np
+
+_ZERO_THRESHOLD = 1e-35
+
+
+def _sigmoid(raw: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-raw))
+
+
+def _to_proba(p: np.ndarray) -> np.ndarray:
+    return np.column_stack((1.0 - p, p))
+
+
+class CompiledLightGBM:
+    """Flattened LightGBM binary classifier built from ``Booster.dump_model()``.
+
+    Nodes of all trees share one set of arrays, and leaves are nodes that
+    point back at themselves. Every step then moves each (row, tree) pair
+    down one level with a fixed number of array operations, for
+    ``max_depth`` steps. Numerical splits follow LightGBM's missing-value
+    rules. With ``None``, NaN is compared as 0; with ``Zero``/``NaN``,
+    missing values go to the default side. Categorical splits look the
+    category up in a per-node membership table. NaN, negative and unseen
+    categories go right.
+    """
+
+    def __init__(self, dump: dict[str, Any]) -> None:
+        objective = dump["objective"].split()
+        if objective[0] != "binary" or dump["num_tree_per_iteration"] != 1:
+            raise NotImplementedError(f"Unsupported LightGBM objective: {dump['objective']}")
+        if dump.get("average_output"):
+            raise NotImplementedError("Averaged (random forest) LightGBM models are not supported")
+        params = dict(p.split(":") for p in objective[1:] if ":" in p)
+        self.sigmoid = float(params.get("sigmoid", 1.0))
+        self.num_features = dump["max_feature_idx"] + 1
+
+        nodes: list[dict[str, Any]] = []
+        categories: list[list[int]] = [[]]  # row 0: no members, used by numerical nodes
+        roots: list[int] = []
+
+        def add(node: dict[str, Any], depth: int) -> tuple[int, int]:
+            i = len(nodes)
+            if "leaf_value" in node:
+                nodes.append({"leaf": node["leaf_value"], "left": i, "right": i})
+                return i, depth
+            entry: dict[str, Any] = {"feature": node["split_feature"]}
+            nodes.append(entry)
+            missing = node["missing_type"]
+            if node["decision_type"] == "==":
+                entry["cat"] = len(categories)
+                categories.append([int(c) for c in str(node["threshold"]).split("||")])
+            elif node["decision_type"] == "<=":
+                threshold = float(node["threshold"])
+                entry["threshold"] = threshold
+                # Where NaN goes: None compares it as 0, Zero and NaN use the default side.
+                entry["nan_left"] = node["default_left"] if missing != "None" else 0.0 <= threshold
+                if missing == "Zero":
+                    entry["zero_left"] = node["default_left"]
+            else:
+                raise NotImplementedError(f"Unsupported split type {node['decision_type']}")
+            entry["left"], left_depth = add(node["left_child"], depth + 1)
+            entry["right"], right_depth = add(node["right_child"], depth + 1)
+            return i, max(left_depth, right_depth)
+
+        self.max_depth = 0
+        for tree in dump["tree_info"]:
+            root, depth = add(tree["tree_structure"], 0)
+            roots.append(root)
+            self.max_depth = max(self.max_depth, depth)
+
+        def column(key: str, default: Any, dtype: Any) -> np.ndarray:
+            return np.asarray([n.get(key, default) for n in nodes], dtype=dtype)
+
+        self.feature = column("feature", 0, np.intp)
+        self.threshold = column("threshold", np.inf, np.float64)
+        self.nan_left = column("nan_left", False, bool)
+        self.left = column("left", 0, np.intp)
+        self.right = column("right", 0, np.intp)
+        self.cat_index = column("cat", 0, np.intp)
+        self.is_categorical = self.cat_index > 0
+        self.leaf_values = column("leaf", 0.0, np.float64)
+        self.roots = np.asarray(roots, dtype=np.intp)
+
+        zero = [i for i, n in enumerate(nodes) if "zero_left" in n]
+        self.zero_nodes = np.zeros(len(nodes), dtype=bool)
+        self.zero_nodes[zero] = True
+        self.zero_left = column("zero_left", False, bool)
+        self.has_zero_missing = bool(zero)
+
+        self.cat_width = max((max(c) for c in categories if c), default=-1) + 1
+        self.cat_members = np.zeros((len(categories), self.cat_width + 1), dtype=bool)
+        for i, members in enumerate(categories):
+            self.cat_members[i, members] = True
+        self.cat_features = np.unique(self.feature[self.is_categorical])
+
+    @classmethod
+    def from_model(cls, model: Any) -> "CompiledLightGBM":
+        booster = getattr(model, "booster_", None) or getattr(model, "booster", None) or model
+        return cls(booster.dump_model())
+
+    def raw_score(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)
+        n = X.shape[0]
+        # Category codes per cell; NaN, negative and unseen values map to
+        # the always-empty last column of the membership table.
+        codes = np.full(X.shape, self.cat_width, dtype=np.intp)
+        if self.cat_features.size:
+            cats = X[:, self.cat_features]
+            ok = (cats >= 0) & (cats < self.cat_width)
+            codes[:, self.cat_features] = np.where(ok, np.nan_to_num(cats), self.cat_width)
+
+        flat_x = X.ravel()
+        flat_codes = codes.ravel()
+        offsets = (np.arange(n, dtype=np.intp) * X.shape[1])[:, None]
+        node = np.broadcast_to(self.roots, (n, self.roots.size)).copy()
+        for _ in range(self.max_depth):
+            cell = offsets + self.feature.take(node)
+            values = flat_x.take(cell)
+            with np.errstate(invalid="ignore"):
+                go_left = values <= self.threshold.take(node)
+            nan = np.isnan(values)
+            if nan.any():
+                go_left = np.where(nan, self.nan_left.take(node), go_left)
+            if self.has_zero_missing:
+                zero = self.zero_nodes.take(node) & (np.abs(np.nan_to_num(values)) <= _ZERO_THRESHOLD)
+                go_left = np.where(zero, self.zero_left.take(node), go_left)
+            categorical = self.is_categorical.take(node)
+            if categorical.any():
+                row = self.cat_index.take(node) * self.cat_members.shape[1]
+                members = self.cat_members.ravel().take(row + flat_codes.take(cell))
+                go_left = np.where(categorical, members, go_left)
+            node = np.where(go_left, self.left.take(node), self.right.take(node))
+        return self.leaf_values.take(node).sum(axis=1)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        return _to_proba(_sigmoid(self.sigmoid * self.raw_score(X)))
+
+
+def compile_model(model: Any) -> CompiledLightGBM:
+    module = type(model).__module__
+    if module.startswith("lightgbm") or hasattr(model, "booster"):
+        return CompiledLightGBM.from_model(model)
+    raise NotImplementedError(f"No compiled engine for {type(model).__name__}")
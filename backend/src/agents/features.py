@@ -0,0 +1,112 @@
+import operator
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+
+@dataclass(frozen=True, slots=True)
+class FeatureSpec:
+    name: str
+    source: str
+    categorical: bool = False
+
+
+FLIGHT_FEATURES: tuple[FeatureSpec, ...] = (
+    FeatureSpec("Month", "month"),
+    FeatureSpec("DayofMonth", "day_of_month"),
+    FeatureSpec("DayOfWeek", "day_of_week"),
+    FeatureSpec("DepTime", "dep_time"),
+    FeatureSpec("UniqueCarrier", "carrier", categorical=True),
+    FeatureSpec("Origin", "origin", categorical=True),
+    FeatureSpec("Dest", "dest", categorical=True),
+    FeatureSpec("Distance", "distance"),
+)
+
+CategoryEncodeFn = Callable[[str, np.ndarray], np.ndarray]
+
+
+class FeatureBatch:
+    """Column buffers for N rows, keyed by model feature name."""
+
+    __slots__ = ("columns", "size")
+
+    def __init__(self, columns: dict[str, np.ndarray], size: int) -> None:
+        self.columns = columns
+        self.size = size
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def take(self, indices: Sequence[int]) -> "FeatureBatch":
+        idx = np.asarray(indices, dtype=np.intp)
+        return FeatureBatch({k: v[idx] for k, v in self.columns.items()}, len(idx))
+
+
+class FeatureEncoder:
+    """Compiles a feature spec once into column extractors and model input builders.
+
+    Numeric features become ``int64`` buffers, categorical ones ``object``
+    buffers of strings. ``object_matrix`` is what CatBoost takes (raw
+    categories, cat feature indices come from the model) and
+    ``numeric_matrix`` is the label-encoded ``float64`` matrix for LightGBM.
+    """
+
+    def __init__(self, specs: Sequence[FeatureSpec] = FLIGHT_FEATURES) -> None:
+        self.specs = tuple(specs)
+        self.names = [spec.name for spec in self.specs]
+        self.categorical = [spec.name for spec in self.specs if spec.categorical]
+        self._extractors = [
+            (
+                spec.name,
+                spec.source,
+                operator.itemgetter(spec.source),
+                np.dtype(object) if spec.categorical else np.dtype(np.int64),
+            )
+            for spec in self.specs
+        ]
+        self.sources = [spec.source for spec in self.specs]
+        self._row_key = operator.itemgetter(*self.sources)
+
+    def encode(self, rows: Sequence[Mapping[str, Any]]) -> FeatureBatch:
+        n = len(rows)
+        columns = {
+            name: np.fromiter(map(getter, rows), dtype=dtype, count=n)
+            for name, _, getter, dtype in self._extractors
+        }
+        return FeatureBatch(columns, n)
+
+    def encode_columns(self, columns: Mapping[str, Sequence[Any]]) -> FeatureBatch:
+        """Build a batch from request-field columns (e.g. ``{"month": [...], ...}``)."""
+        sizes = {len(columns[source]) for _, source, _, _ in self._extractors}
+        if len(sizes) != 1:
+            raise ValueError("All feature columns must have the same length")
+        buffers = {
+            name: np.asarray(columns[source], dtype=dtype)
+            for name, source, _, dtype in self._extractors
+        }
+        return FeatureBatch(buffers, sizes.pop())
+
+    def row_key(self, row: Mapping[str, Any]) -> tuple:
+        """Feature values of one row in spec order, usable as a hashable key."""
+        return self._row_key(row)
+
+    def object_matrix(self, batch: FeatureBatch) -> np.ndarray:
+        out = np.empty((batch.size, len(self.names)), dtype=object)
+        for j, name in enumerate(self.names):
+            out[:, j] = batch[name]
+        return out
+
+    def numeric_matrix(self, batch: FeatureBatch, encode: CategoryEncodeFn) -> np.ndarray:
+        out = np.empty((batch.size, len(self.names)), dtype=np.float64)
+        for j, spec in enumerate(self.specs):
+            column = batch[spec.name]
+            out[:, j] = encode(spec.name, column) if spec.categorical else column
+        return out
+
+
+flight_encoder = FeatureEncoder()
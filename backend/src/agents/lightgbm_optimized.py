@@ -1,4 +1,3 @@
-import pickle
 import logging
 from pathlib import Path
 from typing import Any
@@ -9,46 +8,35 @@ import numpy as np
 from src.core.config import settings
 
 from .base import BaseMLAgent
+from .categories import CategoryIndex, load_category_index
+from .features import FeatureBatch, flight_encoder
+from .native import load_lightgbm
 
 
 class LightGBMOptimizedAgent(BaseMLAgent):
-    def __init__(self) -> None:
-        self.encoders: dict | None = None
-        super().__init__(settings.ml.lightgbm_optimized_path)
+    native_suffix = ".txt"
 
-    def load(self, path: Path) -> Any:
-        model = joblib.load(path)
-        encoders_path = Path(settings.ml.label_encoders_path)
-        if encoders_path.exists():
-            with open(encoders_path, "rb") as f:
-                self.encoders = pickle.load(f)
-        return model
+    def __init__(self, lazy: bool = False, compiled: bool = False) -> None:
+        self.categories: CategoryIndex | None = None
+        super().__init__(settings.ml.lightgbm_optimized_path, lazy=lazy, compiled=compiled)
 
-    def preprocess(self, data: dict[str, Any]) -> np.ndarray:
-        if self.encoders is None:
+    def load(self, path: Path) -> Any:
+        model = load_lightgbm(path) if path.suffix == self.native_suffix else joblib.load(path)
+        self.categories = load_category_index(settings.ml.label_encoders_path)
+        if self.categories is None:
             logging.getLogger(__name__).warning(
                 "Label encoders not available for LightGBM — using fallback encoding (zeros)"
             )
+        return model
+
+    def artifact_paths(self) -> list[Path]:
+        return [self.model_path, Path(settings.ml.label_encoders_path)]
+
+    def build_input(self, batch: FeatureBatch) -> np.ndarray:
+        return flight_encoder.numeric_matrix(batch, self._encode_category)
+
+    def _encode_category(self, name: str, values: np.ndarray) -> np.ndarray:
+        if self.categories is None:
             # Fallback numeric encoding: use 0 for unknown categories.
-            carrier_enc = 0
-            origin_enc = 0
-            dest_enc = 0
-        else:
-            carrier_enc = self.encoders["UniqueCarrier"].transform([data["carrier"]])[0]
-            origin_enc = self.encoders["Origin"].transform([data["origin"]])[0]
-            dest_enc = self.encoders["Dest"].transform([data["dest"]])[0]
-
-        return np.array(
-            [
-                [
-                    data["month"],
-                    data["day_of_month"],
-                    data["day_of_week"],
-                    data["dep_time"],
-                    carrier_enc,
-                    origin_enc,
-                    dest_enc,
-                    data["distance"],
-                ]
-            ]
-        )
+            return np.zeros(len(values), dtype=np.int64)
+        return self.categories.encode(name, values)
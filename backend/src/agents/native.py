@@ -0,0 +1,44 @@
+"""Loaders for the libraries' own model formats.
+
+CatBoost ``.cbm`` and LightGBM text models are loaded straight into the
+libraries' native structures. That is faster than unpickling, and it keeps
+almost all of the model memory outside the Python heap. After a fork those
+pages stay shared between workers, because garbage collection and
+refcounting never write to them.
+"""
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+
+class BoosterProbaAdapter:
+    """Gives a binary ``lightgbm.Booster`` the sklearn ``predict_proba`` shape."""
+
+    def __init__(self, booster: Any) -> None:
+        self.booster = booster
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        p = self.booster.predict(X)
+        return np.column_stack((1.0 - p, p))
+
+
+def load_catboost(path: Path) -> Any:
+    from catboost import CatBoostClassifier
+
+    return CatBoostClassifier().load_model(str(path), format="cbm")
+
+
+def load_lightgbm(path: Path) -> BoosterProbaAdapter:
+    import lightgbm as lgb
+
+    return BoosterProbaAdapter(lgb.Booster(model_file=str(path)))
+
+
+def save_catboost(model: Any, path: Path) -> None:
+    model.save_model(str(path), format="cbm")
+
+
+def save_lightgbm(model: Any, path: Path) -> None:
+    booster = getattr(model, "booster_", model)
+    booster.save_model(str(path))
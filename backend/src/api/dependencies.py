@@ -1,16 +1,34 @@
+import secrets
+from datetime import datetime
 from typing import Annotated
 
-from fastapi import Depends, Request
+from fastapi import Depends, Header, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.agents.base import BaseMLAgent
+from src.core.config import settings
 from src.core.db_helper import db_helper
+from src.core.enums import AgentNameEnum
+from src.core.schemas.predictions import PredictionFilterSchema
 from src.dao.predictions import PredictionDAO
+from src.dao.rollups import RollupBuffer, RollupDAO
+from src.dao.writer import PredictionWriter
+from src.services.analytics import AnalyticsService
+from src.services.batching import MicroBatcher
+from src.services.cache import PredictionCache
+from src.services.counting import PredictionCounter
+from src.services.export import ExportService
+from src.services.inference import InferenceExecutor
+from src.services.partitions import PartitionManager
 from src.services.predictions import PredictionService
+from src.services.profiling import RequestProfiler
+from src.services.reload import ModelReloader
+from src.services.score_index import ScoreIndex
 
 
 # ── Session ──────────────────────────────────────────────────────────
 SessionDep = Annotated[AsyncSession, Depends(db_helper.session_getter)]
+ReadSessionDep = Annotated[AsyncSession, Depends(db_helper.read_session_getter)]
 
 # ── Agents ───────────────────────────────────────────────────────────
 def get_agents(request: Request) -> dict[str, BaseMLAgent]:
@@ -19,19 +37,157 @@ def get_agents(request: Request) -> dict[str, BaseMLAgent]:
 
 AgentsDep = Annotated[dict[str, BaseMLAgent], Depends(get_agents)]
 
+
+def get_batchers(request: Request) -> dict[str, MicroBatcher]:
+    return request.app.state.batchers
+
+
+BatchersDep = Annotated[dict[str, MicroBatcher], Depends(get_batchers)]
+
+
+def get_executor(request: Request) -> InferenceExecutor:
+    return request.app.state.executor
+
+
+ExecutorDep = Annotated[InferenceExecutor, Depends(get_executor)]
+
+
+def get_prediction_cache(request: Request) -> PredictionCache | None:
+    return request.app.state.prediction_cache
+
+
+PredictionCacheDep = Annotated[PredictionCache | None, Depends(get_prediction_cache)]
+
+
+def get_prediction_writer(request: Request) -> PredictionWriter | None:
+    return request.app.state.prediction_writer
+
+
+PredictionWriterDep = Annotated[PredictionWriter | None, Depends(get_prediction_writer)]
+
+
+def get_rollup_buffer(request: Request) -> RollupBuffer:
+    return request.app.state.rollup_buffer
+
+
+RollupBufferDep = Annotated[RollupBuffer, Depends(get_rollup_buffer)]
+
+
+def get_prediction_counter(request: Request) -> PredictionCounter:
+    return request.app.state.prediction_counter
+
+
+PredictionCounterDep = Annotated[PredictionCounter, Depends(get_prediction_counter)]
+
+
+def get_model_reloader(request: Request) -> ModelReloader:
+    return request.app.state.model_reloader
+
+
+ModelReloaderDep = Annotated[ModelReloader, Depends(get_model_reloader)]
+
+
+def get_score_index(request: Request) -> ScoreIndex | None:
+    return request.app.state.score_index
+
+
+ScoreIndexDep = Annotated[ScoreIndex | None, Depends(get_score_index)]
+
+
+def get_partition_manager(request: Request) -> PartitionManager | None:
+    return request.app.state.partition_manager
+
+
+PartitionManagerDep = Annotated[PartitionManager | None, Depends(get_partition_manager)]
+
+
+def get_request_profiler(request: Request) -> RequestProfiler:
+    return request.app.state.request_profiler
+
+
+RequestProfilerDep = Annotated[RequestProfiler, Depends(get_request_profiler)]
+
+# ── Admin ────────────────────────────────────────────────────────────
+def require_admin(x_admin_token: str | None = Header(default=None)) -> None:
+    expected = settings.app.admin_token
+    if expected is None:
+        # Fail closed: the admin API is off until a token is configured.
+        raise HTTPException(status_code=404, detail="Admin API is disabled; set ADMIN_TOKEN")
+    if x_admin_token is None or not secrets.compare_digest(x_admin_token, expected):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
 # ── DAO ──────────────────────────────────────────────────────────────
-def get_prediction_dao(session: SessionDep) -> PredictionDAO:
-    return PredictionDAO(session)
+def get_prediction_dao(session: SessionDep, read_session: ReadSessionDep) -> PredictionDAO:
+    return PredictionDAO(session, read_session)
 
 
 PredictionDAODep = Annotated[PredictionDAO, Depends(get_prediction_dao)]
 
+
+def get_rollup_dao(session: SessionDep, read_session: ReadSessionDep) -> RollupDAO:
+    return RollupDAO(session, read_session)
+
+
+RollupDAODep = Annotated[RollupDAO, Depends(get_rollup_dao)]
+
+# ── Filters ──────────────────────────────────────────────────────────
+def get_prediction_filters(
+    model_name: AgentNameEnum | None = Query(default=None),
+    carrier: str | None = Query(default=None, min_length=2, max_length=3),
+    origin: str | None = Query(default=None, min_length=3, max_length=4),
+    dest: str | None = Query(default=None, min_length=3, max_length=4),
+    created_from: datetime | None = Query(default=None),
+    created_to: datetime | None = Query(default=None),
+) -> PredictionFilterSchema:
+    return PredictionFilterSchema(
+        model_name=model_name.value if model_name else None,
+        carrier=carrier,
+        origin=origin,
+        dest=dest,
+        created_from=created_from,
+        created_to=created_to,
+    )
+
+
+PredictionFilterDep = Annotated[PredictionFilterSchema, Depends(get_prediction_filters)]
+
 # ── Service ──────────────────────────────────────────────────────────
 def get_prediction_service(
     dao: PredictionDAODep,
     agents: AgentsDep,
+    executor: ExecutorDep,
+    batchers: BatchersDep,
+    cache: PredictionCacheDep,
+    writer: PredictionWriterDep,
+    counter: PredictionCounterDep,
+    score_index: ScoreIndexDep,
+    rollups: RollupBufferDep,
 ) -> PredictionService:
-    return PredictionService(agents=agents, dao=dao)
+    return PredictionService(
+        agents=agents,
+        dao=dao,
+        executor=executor,
+        batchers=batchers,
+        cache=cache,
+        writer=writer,
+        counter=counter,
+        score_index=score_index,
+        rollups=rollups,
+    )
 
 
 PredictionServiceDep = Annotated[PredictionService, Depends(get_prediction_service)]
+
+
+def get_export_service() -> ExportService:
+    return ExportService(db_helper.read_session_factory)
+
+
+ExportServiceDep = Annotated[ExportService, Depends(get_export_service)]
+
+
+def get_analytics_service(dao: RollupDAODep) -> AnalyticsService:
+    return AnalyticsService(dao)
+
+
+AnalyticsServiceDep = Annotated[AnalyticsService, Depends(get_analytics_service)]
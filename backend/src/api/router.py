@@ -1,12 +1,20 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from src.api.dependencies import AgentsDep
+from src.api.dependencies import AgentsDep, require_admin
+from src.api.v1.admin import router as admin_router
+from src.api.v1.analytics import router as analytics_router
 from src.api.v1.predictions import router as predictions_router
+from src.api.v1.stats import router as stats_router
 from src.core.schemas.agents import ModelInfoSchema, StatusResponse
 
 router = APIRouter(prefix="/api/v1")
 
 router.include_router(predictions_router, prefix="/predictions", tags=["predictions"])
+router.include_router(stats_router, prefix="/stats", tags=["stats"])
+router.include_router(analytics_router, prefix="/analytics", tags=["analytics"])
+router.include_router(
+    admin_router, prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)]
+)
 
 
 @router.get("/models", tags=["models"])
@@ -14,7 +22,7 @@ async def list_models(
     agents: AgentsDep,
 ) -> StatusResponse:
     models = [
-        ModelInfoSchema(name=name, is_loaded=agent.is_loaded())
+        ModelInfoSchema(name=name, is_loaded=agent.is_loaded(), version=agent.version)
         for name, agent in agents.items()
     ]
     return StatusResponse(status="ok", models=models)
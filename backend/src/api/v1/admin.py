@@ -0,0 +1,62 @@
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
+
+from src.api.dependencies import ModelReloaderDep, RequestProfilerDep
+from src.core.config import settings
+from src.core.enums import AgentNameEnum, ProfileKindEnum
+from src.core.schemas.agents import ModelReloadResponse
+from src.core.schemas.stats import (
+    ProfileListResponse,
+    ProfilerStatsSchema,
+    ProfileSummarySchema,
+    ScoreIndexStatsSchema,
+)
+from src.services.score_index import load_score_index
+
+router = APIRouter()
+
+
+@router.post("/models/{model_name}/reload", response_model=ModelReloadResponse)
+async def reload_model(model_name: AgentNameEnum, reloader: ModelReloaderDep):
+    return ModelReloadResponse(**await reloader.reload(model_name.value))
+
+
+@router.post("/score-index/reload", response_model=ScoreIndexStatsSchema)
+async def reload_score_index(request: Request):
+    """Re-open the score index after ``src.cli.build_index`` has replaced it."""
+    index = await asyncio.to_thread(load_score_index, settings.ml.score_index_path)
+    request.app.state.score_index = index
+    if index is None:
+        return ScoreIndexStatsSchema(enabled=False)
+    return ScoreIndexStatsSchema(enabled=True, **index.stats())
+
+
+@router.get("/profiles", response_model=ProfileListResponse)
+async def list_profiles(profiler: RequestProfilerDep):
+    return ProfileListResponse(
+        profiler=ProfilerStatsSchema(**profiler.stats()),
+        profiles=[ProfileSummarySchema(**p) for p in profiler.summaries()],
+    )
+
+
+@router.get("/profiles/folded", response_class=PlainTextResponse)
+async def merged_profile(
+    profiler: RequestProfilerDep,
+    kind: ProfileKindEnum = Query(default=ProfileKindEnum.WALL),
+):
+    """Every buffered profile merged, as folded stacks for flamegraph tools."""
+    return profiler.folded(kind.value)
+
+
+@router.get("/profiles/{profile_id}/folded", response_class=PlainTextResponse)
+async def profile(
+    profile_id: int,
+    profiler: RequestProfilerDep,
+    kind: ProfileKindEnum = Query(default=ProfileKindEnum.WALL),
+):
+    try:
+        return profiler.folded(kind.value, profile_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Profile not found") from None
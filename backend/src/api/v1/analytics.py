@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Query
+
+from src.api.dependencies import AnalyticsServiceDep, PredictionFilterDep
+from src.core.enums import AnalyticsBucketEnum, AnalyticsDimensionEnum, AnalyticsMetricEnum
+from src.core.schemas.analytics import DelayRateSchema
+
+router = APIRouter()
+
+
+@router.get("/delay-rates", response_model=list[DelayRateSchema])
+async def delay_rates(
+    service: AnalyticsServiceDep,
+    filters: PredictionFilterDep,
+    bucket: AnalyticsBucketEnum = Query(default=AnalyticsBucketEnum.DAY),
+    group_by: list[AnalyticsDimensionEnum] = Query(default=[]),
+    limit: int = Query(default=1000, ge=1, le=10_000),
+):
+    """Delay rate and mean delay probability per time bucket (UTC), oldest first.
+
+    ``created_from``/``created_to`` are applied at hour granularity.
+    """
+    return await service.delay_rates(bucket, group_by, filters=filters, limit=limit)
+
+
+@router.get("/ranking", response_model=list[DelayRateSchema])
+async def ranking(
+    service: AnalyticsServiceDep,
+    filters: PredictionFilterDep,
+    group_by: list[AnalyticsDimensionEnum] = Query(default=[AnalyticsDimensionEnum.ROUTE]),
+    order_by: AnalyticsMetricEnum = Query(default=AnalyticsMetricEnum.DELAY_RATE),
+    min_predictions: int = Query(default=1, ge=1),
+    limit: int = Query(default=50, ge=1, le=1000),
+):
+    """Groups over the whole filtered window, highest ``order_by`` first."""
+    return await service.ranking(
+        group_by,
+        order_by,
+        filters=filters,
+        min_predictions=min_predictions,
+        limit=limit,
+    )
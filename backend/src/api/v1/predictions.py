@@ -1,10 +1,19 @@
 import uuid
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 
-from src.api.dependencies import PredictionServiceDep
-from src.core.enums import AgentNameEnum
-from src.core.schemas.predictions import FlightPredictionRequestSchema, FlightPredictionResponseSchema
+from src.api.dependencies import ExportServiceDep, PredictionFilterDep, PredictionServiceDep
+from src.core.enums import AgentNameEnum, EnsembleAggregationEnum, ExportFormatEnum
+from src.services import columnar
+from src.services.export import MEDIA_TYPES
+from src.core.schemas.predictions import (
+    EnsemblePredictionResponseSchema,
+    FlightBatchPredictionRequestSchema,
+    FlightBatchPredictionResponseSchema,
+    FlightPredictionRequestSchema,
+    FlightPredictionResponseSchema,
+)
 
 router = APIRouter()
 
@@ -18,16 +27,94 @@ async def create_prediction(
     return await service.predict(request, model_name.value)
 
 
+@router.post("/batch", response_model=FlightBatchPredictionResponseSchema)
+async def create_batch_prediction(
+    request: FlightBatchPredictionRequestSchema,
+    service: PredictionServiceDep,
+    model_name: AgentNameEnum = Query(default=AgentNameEnum.CATBOOST_DEFAULT),
+):
+    return await service.predict_batch(request.items, model_name.value)
+
+
+@router.post(
+    "/columnar",
+    response_class=Response,
+    responses={200: {"content": {m: {} for m in columnar.MEDIA_TYPES.values()}}},
+)
+async def create_columnar_prediction(
+    request: Request,
+    service: PredictionServiceDep,
+    model_name: AgentNameEnum = Query(default=AgentNameEnum.CATBOOST_DEFAULT),
+):
+    """Score one array per request field, sent as Arrow IPC, MessagePack or JSON.
+
+    The response has the same column layout, in the ``Accept`` format or
+    else the request's.
+    """
+    fmt = columnar.format_for(request.headers.get("content-type"))
+    if fmt is None:
+        supported = ", ".join(columnar.MEDIA_TYPES.values())
+        raise HTTPException(status_code=415, detail=f"Send one of: {supported}")
+    columns = columnar.read_columns(await request.body(), fmt)
+    result = await service.predict_columns(columns, model_name.value)
+    out = columnar.accepted_format(request.headers.get("accept"), default=fmt)
+    return Response(
+        content=columnar.write_columns(result, out), media_type=columnar.MEDIA_TYPES[out]
+    )
+
+
+@router.post("/ensemble", response_model=EnsemblePredictionResponseSchema)
+async def create_ensemble_prediction(
+    request: FlightPredictionRequestSchema,
+    service: PredictionServiceDep,
+    models: list[AgentNameEnum] | None = Query(default=None),
+    aggregation: EnsembleAggregationEnum | None = Query(default=None),
+):
+    return await service.predict_ensemble(
+        request,
+        model_names=[m.value for m in models] if models else None,
+        aggregation=aggregation,
+    )
+
+
 @router.get("/", response_model=list[FlightPredictionResponseSchema])
 async def list_predictions(
     service: PredictionServiceDep,
+    response: Response,
+    filters: PredictionFilterDep,
     limit: int = Query(default=50, ge=1, le=500),
     offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(default=None),
+    include_total: bool = Query(default=False),
 ):
-    predictions, _ = await service.get_history(limit=limit, offset=offset)
+    predictions, total, next_cursor = await service.get_history(
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+        filters=filters,
+        include_total=include_total,
+    )
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total)
     return predictions
 
 
+@router.get("/export")
+async def export_predictions(
+    exporter: ExportServiceDep,
+    filters: PredictionFilterDep,
+    format: ExportFormatEnum = Query(default=ExportFormatEnum.NDJSON),
+    chunk_size: int = Query(default=5000, ge=100, le=100_000),
+):
+    return StreamingResponse(
+        exporter.export(format, filters=filters, chunk_size=chunk_size),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="predictions.{format.value}"'},
+    )
+
+
 @router.get("/{prediction_id}", response_model=FlightPredictionResponseSchema)
 async def get_prediction(
     prediction_id: uuid.UUID,
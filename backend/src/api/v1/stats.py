@@ -0,0 +1,102 @@
+from fastapi import APIRouter
+
+from src.agents.categories import load_category_index
+from src.api.dependencies import (
+    BatchersDep,
+    ExecutorDep,
+    ModelReloaderDep,
+    PartitionManagerDep,
+    PredictionCacheDep,
+    PredictionWriterDep,
+    ScoreIndexDep,
+)
+from src.core.db_helper import TimedQueuePool, db_helper
+from src.core.schemas.stats import (
+    BatcherStatsSchema,
+    CacheStatsSchema,
+    CategoryStatsSchema,
+    DatabasePoolStatsSchema,
+    ExecutorStatsSchema,
+    PartitionSchema,
+    PartitionStatsSchema,
+    ReloaderStatsSchema,
+    ScoreIndexStatsSchema,
+    WriterStatsSchema,
+)
+from src.services import metrics
+
+router = APIRouter()
+
+
+@router.get("/batching", response_model=list[BatcherStatsSchema])
+async def batching_stats(batchers: BatchersDep):
+    return [
+        BatcherStatsSchema(model_name=name, **batcher.stats())
+        for name, batcher in batchers.items()
+    ]
+
+
+@router.get("/executor", response_model=ExecutorStatsSchema)
+async def executor_stats(executor: ExecutorDep):
+    return ExecutorStatsSchema(**executor.stats())
+
+
+@router.get("/categories", response_model=list[CategoryStatsSchema])
+async def category_stats():
+    """Counts since this API worker started, including its inference workers."""
+    index = load_category_index()
+    if index is None:
+        return []
+    totals = metrics.category_totals()
+    stats = []
+    for feature, size in index.sizes().items():
+        lookups, unknown = totals.get(feature, (0, 0))
+        stats.append(CategoryStatsSchema(feature=feature, size=size, lookups=lookups, unknown=unknown))
+    return stats
+
+
+@router.get("/cache", response_model=CacheStatsSchema)
+async def cache_stats(cache: PredictionCacheDep):
+    if cache is None:
+        return CacheStatsSchema(enabled=False)
+    return CacheStatsSchema(enabled=True, **cache.stats())
+
+
+@router.get("/writer", response_model=WriterStatsSchema)
+async def writer_stats(writer: PredictionWriterDep):
+    if writer is None:
+        return WriterStatsSchema(enabled=False)
+    return WriterStatsSchema(enabled=True, **writer.stats())
+
+
+@router.get("/database", response_model=list[DatabasePoolStatsSchema])
+async def database_stats():
+    """Writer and reader pool occupancy and checkout waits."""
+    return [
+        DatabasePoolStatsSchema(**engine.pool.stats())
+        for engine in db_helper.engines
+        if isinstance(engine.pool, TimedQueuePool)
+    ]
+
+
+@router.get("/reload", response_model=ReloaderStatsSchema)
+async def reload_stats(reloader: ModelReloaderDep):
+    return ReloaderStatsSchema(**reloader.stats())
+
+
+@router.get("/score-index", response_model=ScoreIndexStatsSchema)
+async def score_index_stats(score_index: ScoreIndexDep):
+    if score_index is None:
+        return ScoreIndexStatsSchema(enabled=False)
+    return ScoreIndexStatsSchema(enabled=True, **score_index.stats())
+
+
+@router.get("/partitions", response_model=PartitionStatsSchema)
+async def partition_stats(manager: PartitionManagerDep):
+    if manager is None:
+        return PartitionStatsSchema(enabled=False)
+    return PartitionStatsSchema(
+        enabled=True,
+        **manager.stats(),
+        partitions=[PartitionSchema(**p) for p in await manager.partitions()],
+    )
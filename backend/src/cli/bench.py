@@ -0,0 +1,316 @@
+"""Benchmark the agents, the prediction service and the API.
+
+Every case is timed for at least ``--min-rounds`` rounds and ``--min-time``
+seconds, after one untimed call. There are three layers:
+
+* ``agent``: ``preprocess_batch`` and ``predict_proba`` of every loaded
+  model at each ``--sizes`` batch size, timed separately.
+* ``service``: ``PredictionService.predict`` and ``predict_batch`` end to
+  end, with the result cache and score index off. Predictions are saved to
+  a throwaway SQLite database in place of PostgreSQL.
+* ``api``: ``POST /api/v1/predictions/`` and ``/batch`` through an
+  in-process ASGI client, with the app lifespan running against the same
+  database.
+
+``--out`` writes the results as JSON. ``--baseline`` compares the medians
+against an earlier run and exits non-zero if any case is more than
+``--threshold`` slower. Requires the ``bench`` extra (aiosqlite, httpx).
+
+    python -m src.cli.bench --out bench.json
+    python -m src.cli.bench --layers agent --baseline bench.json --threshold 0.15
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from src.agents.base import BaseMLAgent
+from src.core.config import settings
+from src.utils.flights import synthetic_flights
+
+LAYERS = ("agent", "service", "api")
+
+
+def _summary(samples: list[float]) -> dict[str, Any]:
+    us = np.asarray(samples) * 1e6
+    return {
+        "rounds": len(samples),
+        "median_us": round(float(np.median(us)), 2),
+        "mean_us": round(float(us.mean()), 2),
+        "p95_us": round(float(np.percentile(us, 95)), 2),
+        "min_us": round(float(us.min()), 2),
+        "stdev_us": round(statistics.pstdev(us.tolist()), 2),
+    }
+
+
+def _measure(fn: Callable[[], Any], min_rounds: int, min_time: float) -> dict[str, Any]:
+    fn()
+    samples: list[float] = []
+    deadline = time.perf_counter() + min_time
+    while len(samples) < min_rounds or time.perf_counter() < deadline:
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return _summary(samples)
+
+
+async def _ameasure(
+    fn: Callable[[], Awaitable[Any]], min_rounds: int, min_time: float
+) -> dict[str, Any]:
+    await fn()
+    samples: list[float] = []
+    deadline = time.perf_counter() + min_time
+    while len(samples) < min_rounds or time.perf_counter() < deadline:
+        start = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - start)
+    return _summary(samples)
+
+
+def bench_agents(
+    agents: dict[str, BaseMLAgent], sizes: list[int], min_rounds: int, min_time: float
+) -> list[dict[str, Any]]:
+    flights = synthetic_flights(max(sizes), seed=1)
+    results = []
+    for name, agent in agents.items():
+        if not agent.is_loaded():
+            print(f"agent/{name}: not loaded ({agent.load_error}), skipped", file=sys.stderr)
+            continue
+        for size in sizes:
+            rows = flights[:size]
+            X = agent.preprocess_batch(rows)
+            predictor = agent.predictor(size)
+            engine = "compiled" if predictor is agent.engine else "library"
+            results.append({
+                "name": f"agent/{name}/preprocess",
+                "batch_size": size,
+                **_measure(lambda: agent.preprocess_batch(rows), min_rounds, min_time),
+            })
+            results.append({
+                "name": f"agent/{name}/predict_proba",
+                "batch_size": size,
+                "engine": engine,
+                **_measure(lambda: predictor.predict_proba(X), min_rounds, min_time),
+            })
+    return results
+
+
+@asynccontextmanager
+async def local_app(database_url: str | None = None) -> AsyncIterator[tuple[Any, Any]]:
+    """Run the app's lifespan against ``database_url`` (a throwaway SQLite file by default).
+
+    Yields the app and its session factory. Tables are created if missing,
+    so a local PostgreSQL works without running migrations first.
+    """
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from src.core.db_helper import db_helper
+    from src.core.models import Base
+    from src.main import app
+
+    workdir = tempfile.TemporaryDirectory(prefix="api-ml-")
+    url = database_url or f"sqlite+aiosqlite:///{Path(workdir.name) / 'local.sqlite'}"
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    # Reads and writes share the one local engine.
+    swapped = ("engine", "session_factory", "read_engine", "read_session_factory")
+    previous = [getattr(db_helper, name) for name in swapped]
+    for name, value in zip(swapped, (engine, session_factory) * 2):
+        setattr(db_helper, name, value)
+    try:
+        async with app.router.lifespan_context(app):
+            yield app, session_factory
+    finally:
+        for name, value in zip(swapped, previous):
+            setattr(db_helper, name, value)
+        await engine.dispose()
+        workdir.cleanup()
+
+
+async def bench_service_and_api(
+    layers: set[str], batch_size: int, min_rounds: int, min_time: float
+) -> list[dict[str, Any]]:
+    import httpx
+
+    from src.core.schemas.predictions import FlightPredictionRequestSchema
+    from src.dao.predictions import PredictionDAO
+    from src.services.predictions import PredictionService
+
+    # Measure the scoring path itself: no cached or pre-scored answers and
+    # no write-behind buffer between the request and the insert.
+    settings.ml.cache_enabled = False
+    settings.ml.score_index_path = None
+    settings.db.write_behind_enabled = False
+
+    flights = synthetic_flights(max(batch_size, 1000), seed=2)
+    results: list[dict[str, Any]] = []
+    cursor = 0
+
+    def next_flight() -> dict[str, Any]:
+        nonlocal cursor
+        cursor = (cursor + 1) % len(flights)
+        return flights[cursor]
+
+    async with local_app() as (app, session_factory):
+        state = app.state
+        loaded = [name for name, agent in state.agents.items() if agent.is_loaded()]
+        if not loaded:
+            raise RuntimeError("No models are loaded")
+        model_name = loaded[0]
+        batch = [FlightPredictionRequestSchema(**f) for f in flights[:batch_size]]
+        batch_json = {"items": flights[:batch_size]}
+
+        if "service" in layers:
+            async with session_factory() as session:
+                service = PredictionService(
+                    agents=state.agents,
+                    dao=PredictionDAO(session),
+                    executor=state.executor,
+                    batchers=state.batchers,
+                    counter=state.prediction_counter,
+                )
+                results.append({
+                    "name": f"service/{model_name}/predict",
+                    "batch_size": 1,
+                    **await _ameasure(
+                        lambda: service.predict(
+                            FlightPredictionRequestSchema(**next_flight()), model_name
+                        ),
+                        min_rounds,
+                        min_time,
+                    ),
+                })
+                results.append({
+                    "name": f"service/{model_name}/predict_batch",
+                    "batch_size": batch_size,
+                    **await _ameasure(
+                        lambda: service.predict_batch(batch, model_name),
+                        min_rounds,
+                        min_time,
+                    ),
+                })
+
+        if "api" in layers:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+                async def post(path: str, body: dict[str, Any]) -> None:
+                    response = await client.post(
+                        path, params={"model_name": model_name}, json=body
+                    )
+                    response.raise_for_status()
+
+                results.append({
+                    "name": f"api/{model_name}/predict",
+                    "batch_size": 1,
+                    **await _ameasure(
+                        lambda: post("/api/v1/predictions/", next_flight()),
+                        min_rounds,
+                        min_time,
+                    ),
+                })
+                results.append({
+                    "name": f"api/{model_name}/predict_batch",
+                    "batch_size": batch_size,
+                    **await _ameasure(
+                        lambda: post("/api/v1/predictions/batch", batch_json),
+                        min_rounds,
+                        min_time,
+                    ),
+                })
+    return results
+
+
+def compare(
+    results: list[dict[str, Any]], baseline: list[dict[str, Any]], threshold: float
+) -> bool:
+    """Print median changes against the baseline; False if any case regressed."""
+    previous = {(r["name"], r["batch_size"]): r for r in baseline}
+    ok = True
+    print(f"{'case':<44} {'batch':>6} {'base us':>10} {'now us':>10} {'change':>8}")
+    for result in results:
+        key = (result["name"], result["batch_size"])
+        if key not in previous:
+            print(f"{key[0]:<44} {key[1]:>6} {'-':>10} {result['median_us']:>10.1f} {'new':>8}")
+            continue
+        base = previous[key]["median_us"]
+        change = result["median_us"] / base - 1 if base else 0.0
+        regressed = change > threshold
+        ok &= not regressed
+        print(f"{key[0]:<44} {key[1]:>6} {base:>10.1f} {result['median_us']:>10.1f} "
+              f"{change:>+7.1%}{' REGRESSED' if regressed else ''}")
+    return ok
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark agents, service and API.")
+    parser.add_argument("--layers", nargs="+", choices=LAYERS, default=list(LAYERS))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000, 10000],
+                        help="agent batch sizes")
+    parser.add_argument("--batch-size", type=int, default=100,
+                        help="batch size for the service and API batch cases")
+    parser.add_argument("--min-rounds", type=int, default=20)
+    parser.add_argument("--min-time", type=float, default=0.5,
+                        help="minimum seconds spent timing each case")
+    parser.add_argument("--out", type=Path, help="write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="earlier --out file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed median slowdown before a case counts as a regression")
+    args = parser.parse_args(argv)
+
+    if args.batch_size > settings.ml.batch_max_size:
+        parser.error(f"--batch-size exceeds BATCH_MAX_SIZE ({settings.ml.batch_max_size})")
+
+    layers = set(args.layers)
+    results: list[dict[str, Any]] = []
+    if "agent" in layers:
+        from src.utils.agents_setup import agents_setup
+
+        results += bench_agents(agents_setup(), args.sizes, args.min_rounds, args.min_time)
+    if layers & {"service", "api"}:
+        results += asyncio.run(
+            bench_service_and_api(layers, args.batch_size, args.min_rounds, args.min_time)
+        )
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "numpy": np.__version__,
+            "inference_executor": settings.ml.inference_executor,
+            "compiled_models": settings.ml.compiled_models,
+        },
+        "results": results,
+    }
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2))
+
+    ok = True
+    if args.baseline:
+        ok = compare(results, json.loads(args.baseline.read_text())["results"], args.threshold)
+    else:
+        for r in results:
+            print(f"{r['name']:<44} {r['batch_size']:>6} median {r['median_us']:>10.1f} us "
+                  f"p95 {r['p95_us']:>10.1f} us ({r['rounds']} rounds)")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
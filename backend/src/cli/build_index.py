@@ -0,0 +1,150 @@
+"""Pre-score a flight schedule into a ScoreIndex.
+
+The schedule lists flights as ``carrier, origin, dest, dep_time,
+distance``, plus a ``date`` column or a ``--start``/``--days`` window to
+expand every flight over. Every (flight, date) row is scored with each
+model on a process pool. The result is written as sorted keys and
+per-model probabilities, which ``SCORE_INDEX_PATH`` then serves without
+inference.
+
+    python -m src.cli.build_index schedule.csv --out ml/score_index --days 30
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from itertools import repeat
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.cli.score import _score_chunk
+from src.core.config import settings
+from src.services import inference
+from src.services.score_index import KEYS_FILE, META_FILE, hash_columns
+from src.utils.agents_setup import AGENT_CLASSES
+
+logger = logging.getLogger("build_index")
+
+_FLIGHT_COLUMNS = ["carrier", "origin", "dest", "dep_time", "distance"]
+
+
+def _read_schedule(path: Path) -> pd.DataFrame:
+    frame = pd.read_parquet(path) if path.suffix == ".parquet" else pd.read_csv(path)
+    missing = set(_FLIGHT_COLUMNS) - set(frame.columns)
+    if missing:
+        raise ValueError(f"Schedule is missing columns: {', '.join(sorted(missing))}")
+    return frame
+
+
+def _expand(frame: pd.DataFrame, start: date, days: int) -> dict[str, np.ndarray]:
+    if "date" in frame.columns:
+        dates = pd.to_datetime(frame["date"])
+        flights = frame
+    else:
+        window = pd.date_range(start, periods=days, freq="D")
+        dates = pd.Series(np.tile(window.values, len(frame)))
+        flights = frame.loc[frame.index.repeat(days)].reset_index(drop=True)
+    columns = {name: flights[name].to_numpy() for name in _FLIGHT_COLUMNS}
+    columns["month"] = dates.dt.month.to_numpy(dtype=np.int64)
+    columns["day_of_month"] = dates.dt.day.to_numpy(dtype=np.int64)
+    columns["day_of_week"] = dates.dt.dayofweek.to_numpy(dtype=np.int64) + 1
+    for name in ("dep_time", "distance"):
+        columns[name] = columns[name].astype(np.int64)
+    for name in ("carrier", "origin", "dest"):
+        columns[name] = columns[name].astype(str).astype(object)
+    return columns
+
+
+def build(args: argparse.Namespace) -> dict:
+    start_time = time.perf_counter()
+    columns = _expand(_read_schedule(args.schedule), args.start, args.days)
+    hashes = hash_columns(columns)
+    keys, first = np.unique(hashes, return_index=True)
+    columns = {name: values[first] for name, values in columns.items()}
+    logger.info(f"{len(hashes)} scheduled rows, {len(keys)} distinct feature rows")
+
+    chunks = [
+        {name: values[i : i + args.chunk_size] for name, values in columns.items()}
+        for i in range(0, len(keys), args.chunk_size)
+    ]
+    tmp = args.out.with_name(args.out.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    np.save(tmp / KEYS_FILE, keys)
+
+    versions: dict[str, str] = {}
+    with ProcessPoolExecutor(
+        max_workers=args.workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=inference.init_worker,
+    ) as pool:
+        for model in args.models:
+            model_start = time.perf_counter()
+            probabilities = np.empty(len(keys), dtype=np.float32)
+            offset = 0
+            version = None
+            try:
+                for proba, _, version in pool.map(_score_chunk, repeat(model), chunks):
+                    probabilities[offset : offset + len(proba)] = proba
+                    offset += len(proba)
+            except RuntimeError as e:
+                logger.warning(f"{model}: skipped ({e})")
+                continue
+            np.save(tmp / f"{model}.npy", probabilities)
+            versions[model] = version
+            logger.info(
+                f"{model} ({version}): {len(keys)} rows in {time.perf_counter() - model_start:.1f}s, "
+                f"{int(np.isnan(probabilities).sum())} failed"
+            )
+
+    meta = {
+        "built_at": datetime.now(timezone.utc).isoformat(),
+        "build_seconds": round(time.perf_counter() - start_time, 3),
+        "rows": int(len(keys)),
+        "schedule": str(args.schedule),
+        "models": versions,
+    }
+    (tmp / META_FILE).write_text(json.dumps(meta, indent=2))
+
+    # Swap the finished index into place; a running API keeps its mmaps of
+    # the old files until it reloads the index.
+    old = args.out.with_name(args.out.name + ".old")
+    shutil.rmtree(old, ignore_errors=True)
+    if args.out.exists():
+        args.out.rename(old)
+    tmp.rename(args.out)
+    shutil.rmtree(old, ignore_errors=True)
+
+    meta["size_bytes"] = sum(f.stat().st_size for f in args.out.iterdir())
+    return meta
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Pre-score a schedule into a score index.")
+    parser.add_argument("schedule", type=Path, help="CSV or .parquet schedule")
+    parser.add_argument("--out", type=Path, default=Path(settings.ml.score_index_path or "ml/score_index"))
+    parser.add_argument("--start", type=date.fromisoformat, default=date.today() + timedelta(days=1))
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--models", nargs="+", choices=list(AGENT_CLASSES), default=list(AGENT_CLASSES))
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s", stream=sys.stderr)
+    meta = build(args)
+    logger.info(
+        f"Index written to {args.out}: {meta['rows']} rows x {len(meta['models'])} models, "
+        f"{meta['size_bytes'] / 1e6:.1f} MB, built in {meta['build_seconds']:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Convert pickled models to the libraries' native formats.
+
+Writes ``.cbm`` (CatBoost) / ``.txt`` (LightGBM) next to each configured
+pickle. Each converted model is scored on a few synthetic flights and
+compared with the pickle before it is kept.
+
+    python -m src.cli.convert
+"""
+import argparse
+import logging
+import sys
+
+import numpy as np
+
+from src.agents import BaseMLAgent
+from src.agents.base import WARMUP_ROW
+from src.agents.native import save_catboost, save_lightgbm
+from src.core.config import settings
+from src.utils.agents_setup import AGENT_CLASSES
+
+logger = logging.getLogger("convert")
+
+_SAMPLE_ROWS = [
+    WARMUP_ROW,
+    {**WARMUP_ROW, "month": 12, "day_of_week": 7, "dep_time": 630, "origin": "LAX", "dest": "ORD"},
+    {**WARMUP_ROW, "month": 1, "dep_time": 2245, "carrier": "ZZ", "distance": 300},
+]
+
+
+def _load(cls: type[BaseMLAgent], model_format: str) -> BaseMLAgent:
+    settings.ml.model_format = model_format
+    return cls()
+
+
+def convert(name: str, cls: type[BaseMLAgent], tolerance: float) -> bool:
+    source = _load(cls, "pickle")
+    if not source.is_loaded():
+        logger.warning(f"{name}: skipped ({source.load_error})")
+        return True
+
+    target = source.model_path.with_suffix(cls.native_suffix)
+    if name.startswith("catboost"):
+        save_catboost(source.model, target)
+    else:
+        save_lightgbm(source.model, target)
+
+    converted = _load(cls, "native")
+    if not converted.is_loaded():
+        target.unlink(missing_ok=True)
+        logger.error(f"{name}: converted model failed to load ({converted.load_error}), removed")
+        return False
+    expected = source.predict_batch(_SAMPLE_ROWS)
+    actual = converted.predict_batch(_SAMPLE_ROWS)
+    # Rows can fail to encode, e.g. the unknown carrier under strict categories.
+    failed = {
+        i: e if isinstance(e, Exception) else a
+        for i, (e, a) in enumerate(zip(expected, actual))
+        if isinstance(e, Exception) or isinstance(a, Exception)
+    }
+    for i, error in failed.items():
+        logger.warning(f"{name}: sample row {i} not compared ({error})")
+    if any(isinstance(expected[i], Exception) != isinstance(actual[i], Exception) for i in failed):
+        target.unlink(missing_ok=True)
+        logger.error(f"{name}: converted model fails on different rows than the pickle, removed")
+        return False
+    scored = [i for i in range(len(_SAMPLE_ROWS)) if i not in failed]
+    if not scored:
+        target.unlink(missing_ok=True)
+        logger.error(f"{name}: no sample row could be scored, removed")
+        return False
+    diff = float(np.abs(
+        np.array([expected[i]["delay_probability"] for i in scored])
+        - np.array([actual[i]["delay_probability"] for i in scored])
+    ).max())
+    if diff > tolerance:
+        target.unlink(missing_ok=True)
+        logger.error(f"{name}: converted model disagrees with the pickle (max diff {diff:.2e}), removed")
+        return False
+
+    logger.info(
+        f"{name}: {source.model_path} -> {target} "
+        f"({source.model_path.stat().st_size:,} -> {target.stat().st_size:,} bytes, max diff {diff:.1e})"
+    )
+    return True
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Convert pickled models to native formats.")
+    parser.add_argument("models", nargs="*", choices=list(AGENT_CLASSES))
+    parser.add_argument("--tolerance", type=float, default=1e-9)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stderr)
+    ok = all([convert(name, AGENT_CLASSES[name], args.tolerance) for name in args.models or AGENT_CLASSES])
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
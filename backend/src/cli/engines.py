@@ -0,0 +1,66 @@
+"""Check the compiled tree engine against the library predictors.
+
+For every model, scores the same synthetic flights with ``predict_proba`` of
+the loaded model and of its compiled engine, reports the largest
+probability difference and the per-batch latency of both, and exits
+non-zero if any difference exceeds ``--tolerance``.
+
+    python -m src.cli.engines --sizes 1 16 256
+"""
+import argparse
+import sys
+import time
+from typing import Any
+
+import numpy as np
+
+from src.agents.features import flight_encoder
+from src.utils.agents_setup import AGENT_CLASSES
+from src.utils.flights import synthetic_flights
+
+
+def _latency_us(predictor: Any, X: Any, repeat: int) -> float:
+    predictor.predict_proba(X)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        predictor.predict_proba(X)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Compiled engine parity and latency check.")
+    parser.add_argument("models", nargs="*", choices=list(AGENT_CLASSES))
+    parser.add_argument("--rows", type=int, default=5000, help="rows for the parity check")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 16, 64, 256, 1024])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--tolerance", type=float, default=1e-9)
+    args = parser.parse_args(argv)
+
+    flights = synthetic_flights(max(args.rows, *args.sizes))
+    ok = True
+    for name in args.models or AGENT_CLASSES:
+        agent = AGENT_CLASSES[name](compiled=True)
+        if not agent.is_loaded():
+            print(f"{name}: not loaded ({agent.load_error})")
+            continue
+        if agent.engine is None:
+            print(f"{name}: no compiled engine for this model, library predictor only")
+            continue
+
+        X = agent.build_input(flight_encoder.encode(flights[: args.rows]))
+        diff = float(np.abs(agent.model.predict_proba(X) - agent.engine.predict_proba(X)).max())
+        passed = diff <= args.tolerance
+        ok &= passed
+        print(f"{name}: max |p_library - p_compiled| = {diff:.2e} over {args.rows} rows "
+              f"{'ok' if passed else 'FAILED'}")
+        print(f"  {'batch':>6} {'library us':>11} {'compiled us':>12} {'speedup':>8}")
+        for size in args.sizes:
+            X = agent.build_input(flight_encoder.encode(flights[:size]))
+            library = _latency_us(agent.model, X, args.repeat)
+            compiled = _latency_us(agent.engine, X, args.repeat)
+            print(f"  {size:>6} {library:>11.0f} {compiled:>12.0f} {library / compiled:>7.2f}x")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
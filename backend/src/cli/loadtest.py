@@ -0,0 +1,320 @@
+"""Drive the API with a realistic flight mix and report latency against SLOs.
+
+Traffic is drawn from a synthetic schedule of ``--flights`` distinct
+flights whose carriers and airports follow Zipf distributions (a few hubs
+and large carriers dominate). Requests pick flights by Zipf rank too, so
+hot flights repeat the way popular departures do. Every request goes to a
+model drawn uniformly from ``--models`` (by default, the models
+``/api/v1/models`` reports as loaded) and to an endpoint drawn from
+``--mix``.
+
+Two load models are supported:
+
+* closed loop (default): ``--concurrency`` clients each send their next
+  request as soon as the previous one returns;
+* open loop (``--rate``): Poisson arrivals at a fixed rate, at most
+  ``--concurrency`` in flight. Latency is measured from each request's
+  scheduled time, so queueing behind a slow server is counted.
+
+Without ``--url`` the app runs in-process against a throwaway SQLite
+database (or ``--database-url``, e.g. a local PostgreSQL); the client then
+shares the event loop with the server, so use ``--url`` against a running
+replica for capacity numbers. Requires the ``bench`` extra.
+
+    python -m src.cli.loadtest --duration 30 --concurrency 32
+    python -m src.cli.loadtest --url http://127.0.0.1:8000 --rate 400 --slo-p99-ms 50
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import zlib
+from collections import defaultdict
+from contextlib import AsyncExitStack
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from src.agents.categories import load_category_index
+from src.core.config import settings
+from src.core.enums import AgentNameEnum
+
+ENDPOINTS = ("predict", "batch", "ensemble", "history")
+DEFAULT_MIX = "predict=0.85,batch=0.05,ensemble=0.05,history=0.05"
+
+_FALLBACK = {
+    "carrier": ["AA", "DL", "UA", "WN", "B6", "AS", "NK", "F9"],
+    "airport": ["ATL", "ORD", "DFW", "DEN", "LAX", "JFK", "SFO", "SEA", "LAS", "MCO", "CLT", "PHX"],
+}
+
+
+def _zipf_weights(n: int, skew: float) -> np.ndarray:
+    weights = 1.0 / np.arange(1, n + 1) ** skew
+    return weights / weights.sum()
+
+
+def build_schedule(n: int, skew: float, seed: int = 0) -> list[dict[str, Any]]:
+    """``n`` distinct flights over the next 30 days, busiest carriers and hubs first."""
+    rng = np.random.default_rng(seed)
+    index = load_category_index(settings.ml.label_encoders_path)
+    carriers = index.values("UniqueCarrier") if index is not None else _FALLBACK["carrier"]
+    airports = (
+        sorted(set(index.values("Origin")) & set(index.values("Dest")))
+        if index is not None
+        else _FALLBACK["airport"]
+    )
+    rng.shuffle(carriers)
+    rng.shuffle(airports)
+    carrier_p = _zipf_weights(len(carriers), skew)
+    airport_p = _zipf_weights(len(airports), skew)
+    start = date.today()
+
+    flights: dict[tuple, dict[str, Any]] = {}
+    while len(flights) < n:
+        origin, dest = rng.choice(airports, size=2, replace=False, p=airport_p)
+        day = start + timedelta(days=int(rng.integers(0, 30)))
+        # Departures cluster around the morning and evening banks.
+        hour = int(np.clip(rng.choice([7, 12, 17]) + rng.normal(0, 2.5), 5, 23))
+        flight = {
+            "month": day.month,
+            "day_of_month": day.day,
+            "day_of_week": day.isoweekday(),
+            "dep_time": hour * 100 + int(rng.integers(0, 12)) * 5,
+            "carrier": str(rng.choice(carriers, p=carrier_p)),
+            "origin": str(origin),
+            "dest": str(dest),
+            # Stable per route, so repeated routes look like the same city pair.
+            "distance": 150 + zlib.crc32(f"{origin}{dest}".encode()) % 2600,
+        }
+        flights.setdefault(tuple(flight.values()), flight)
+    return list(flights.values())
+
+
+class Traffic:
+    """Draws the next request: endpoint, model and body."""
+
+    def __init__(
+        self,
+        schedule: list[dict[str, Any]],
+        skew: float,
+        models: list[str],
+        mix: dict[str, float],
+        batch_size: int,
+        seed: int = 0,
+    ) -> None:
+        self.schedule = schedule
+        self.flight_p = _zipf_weights(len(schedule), skew).cumsum()
+        self.models = models
+        self.endpoints = list(mix)
+        self.endpoint_weights = list(mix.values())
+        self.batch_size = batch_size
+        self.rng = random.Random(seed)
+
+    def flight(self) -> dict[str, Any]:
+        rank = int(np.searchsorted(self.flight_p, self.rng.random()))
+        return self.schedule[min(rank, len(self.schedule) - 1)]
+
+    def next(self) -> tuple[str, str, str, dict[str, Any], dict[str, Any] | None]:
+        """Returns (endpoint, method, path, params, json body)."""
+        endpoint = self.rng.choices(self.endpoints, self.endpoint_weights)[0]
+        model = self.rng.choice(self.models)
+        if endpoint == "predict":
+            return endpoint, "POST", "/api/v1/predictions/", {"model_name": model}, self.flight()
+        if endpoint == "batch":
+            body = {"items": [self.flight() for _ in range(self.batch_size)]}
+            return endpoint, "POST", "/api/v1/predictions/batch", {"model_name": model}, body
+        if endpoint == "ensemble":
+            return endpoint, "POST", "/api/v1/predictions/ensemble", {}, self.flight()
+        return endpoint, "GET", "/api/v1/predictions/", {"limit": 50}, None
+
+
+class Recorder:
+    def __init__(self, measure_from: float) -> None:
+        self.measure_from = measure_from
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.statuses: dict[str, dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    def record(self, endpoint: str, scheduled: float, status: int | None) -> None:
+        if scheduled < self.measure_from:
+            return
+        self.latencies[endpoint].append(time.perf_counter() - scheduled)
+        self.statuses[endpoint][status or 0] += 1
+        if status is None or status >= 400:
+            self.errors[endpoint] += 1
+
+    def report(self, seconds: float) -> dict[str, Any]:
+        def summarize(latencies: list[float], errors: int) -> dict[str, Any]:
+            ms = np.asarray(latencies) * 1000
+            return {
+                "requests": len(latencies),
+                "errors": errors,
+                "error_rate": errors / len(latencies) if latencies else 0.0,
+                "throughput_rps": len(latencies) / seconds,
+                "p50_ms": float(np.percentile(ms, 50)) if latencies else None,
+                "p95_ms": float(np.percentile(ms, 95)) if latencies else None,
+                "p99_ms": float(np.percentile(ms, 99)) if latencies else None,
+                "max_ms": float(ms.max()) if latencies else None,
+            }
+
+        endpoints = {
+            name: {
+                **summarize(latencies, self.errors[name]),
+                "statuses": {str(k): v for k, v in sorted(self.statuses[name].items())},
+            }
+            for name, latencies in sorted(self.latencies.items())
+        }
+        everything = [x for latencies in self.latencies.values() for x in latencies]
+        return {"endpoints": endpoints, "total": summarize(everything, sum(self.errors.values()))}
+
+
+async def _send(client: Any, traffic: Traffic, recorder: Recorder, scheduled: float) -> None:
+    endpoint, method, path, params, body = traffic.next()
+    try:
+        response = await client.request(method, path, params=params, json=body)
+        status = response.status_code
+    except Exception:
+        status = None
+    recorder.record(endpoint, scheduled, status)
+
+
+async def closed_loop(client, traffic, recorder, concurrency: int, until: float) -> None:
+    async def user() -> None:
+        while time.perf_counter() < until:
+            await _send(client, traffic, recorder, time.perf_counter())
+
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+
+
+async def open_loop(client, traffic, recorder, rate: float, concurrency: int, until: float) -> None:
+    slots = asyncio.Semaphore(concurrency)
+    tasks: set[asyncio.Task] = set()
+
+    async def arrival(scheduled: float) -> None:
+        async with slots:
+            await _send(client, traffic, recorder, scheduled)
+
+    rng = random.Random(1)
+    scheduled = time.perf_counter()
+    while scheduled < until:
+        scheduled += rng.expovariate(rate)
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        task = asyncio.create_task(arrival(scheduled))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    await asyncio.gather(*tasks)
+
+
+async def _loaded_models(client: Any) -> list[str]:
+    response = await client.get("/api/v1/models")
+    response.raise_for_status()
+    models = [m["name"] for m in response.json()["models"] if m["is_loaded"]]
+    if not models:
+        raise SystemExit("The app reports no loaded models; pass --models")
+    return models
+
+
+async def run(args: argparse.Namespace, traffic: Traffic) -> dict[str, Any]:
+    import httpx
+
+    from src.cli.bench import local_app
+
+    async with AsyncExitStack() as stack:
+        if args.url:
+            transport = httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(max_connections=args.concurrency)
+            )
+            base_url = args.url
+        else:
+            app, _ = await stack.enter_async_context(local_app(args.database_url))
+            transport = httpx.ASGITransport(app=app)
+            base_url = "http://loadtest"
+        client = await stack.enter_async_context(
+            httpx.AsyncClient(transport=transport, base_url=base_url, timeout=args.timeout)
+        )
+        if not traffic.models:
+            traffic.models = args.models = await _loaded_models(client)
+
+        start = time.perf_counter()
+        recorder = Recorder(measure_from=start + args.warmup)
+        until = start + args.warmup + args.duration
+        if args.rate:
+            await open_loop(client, traffic, recorder, args.rate, args.concurrency, until)
+        else:
+            await closed_loop(client, traffic, recorder, args.concurrency, until)
+        measured = time.perf_counter() - recorder.measure_from
+    return recorder.report(measured)
+
+
+def _parse_mix(value: str) -> dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"unknown endpoint '{name}', expected {ENDPOINTS}")
+        mix[name] = float(weight)
+    return mix
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Load-test the prediction API.")
+    parser.add_argument("--url", help="base URL of a running replica; in-process if omitted")
+    parser.add_argument("--database-url", help="database for the in-process app (default: temp SQLite)")
+    parser.add_argument("--duration", type=float, default=30.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="unmeasured seconds first")
+    parser.add_argument("--concurrency", type=int, default=16,
+                        help="closed-loop clients, or open-loop in-flight cap")
+    parser.add_argument("--rate", type=float, help="open-loop arrivals per second")
+    parser.add_argument("--mix", type=_parse_mix, default=_parse_mix(DEFAULT_MIX))
+    parser.add_argument("--models", nargs="+", choices=[m.value for m in AgentNameEnum],
+                        help="models to spread requests over (default: those the app has loaded)")
+    parser.add_argument("--flights", type=int, default=5000, help="distinct flights in the schedule")
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent of the flight mix")
+    parser.add_argument("--batch-size", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, help="write the report as JSON")
+    parser.add_argument("--slo-p99-ms", type=float, help="fail if any endpoint's p99 is above this")
+    parser.add_argument("--slo-error-rate", type=float, default=0.01,
+                        help="fail if any endpoint's error rate is above this")
+    args = parser.parse_args(argv)
+
+    schedule = build_schedule(args.flights, args.skew, args.seed)
+    traffic = Traffic(schedule, args.skew, args.models or [], args.mix, args.batch_size, args.seed)
+    report = asyncio.run(run(args, traffic))
+    report["config"] = {
+        k: str(v) if isinstance(v, Path) else v for k, v in vars(args).items()
+    }
+
+    print(f"{'endpoint':<10} {'requests':>9} {'rps':>8} {'errors':>7} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    rows = [*report["endpoints"].items(), ("total", report["total"])]
+    ok = True
+    for name, r in rows:
+        if not r["requests"]:
+            continue
+        print(f"{name:<10} {r['requests']:>9} {r['throughput_rps']:>8.1f} {r['error_rate']:>7.2%} "
+              f"{r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['max_ms']:>8.1f}")
+        if name == "total":
+            continue
+        if r["error_rate"] > args.slo_error_rate:
+            print(f"  SLO: {name} error rate {r['error_rate']:.2%} > {args.slo_error_rate:.2%}")
+            ok = False
+        if args.slo_p99_ms is not None and r["p99_ms"] > args.slo_p99_ms:
+            print(f"  SLO: {name} p99 {r['p99_ms']:.1f} ms > {args.slo_p99_ms:.1f} ms")
+            ok = False
+    report["slo_met"] = ok
+
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2))
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Measure model load time and per-worker memory.
+
+Forks ``--workers`` children that each score a batch of flights, then
+reports every child's RSS, PSS (RSS with shared pages split between the
+processes sharing them) and USS (private pages) from
+``/proc/<pid>/smaps_rollup``. With ``--prefork`` the models are loaded once
+in the parent, as ``src.cli.serve`` does; otherwise every child loads its
+own copy, as independent uvicorn workers do. Linux only.
+
+    python -m src.cli.memory --workers 4 --format native --prefork
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from src.agents.base import WARMUP_ROW
+from src.core.config import settings
+
+_FIELDS = {"Rss": "rss_mb", "Pss": "pss_mb", "Private_Clean": "uss_mb", "Private_Dirty": "uss_mb"}
+
+
+def _memory() -> dict[str, float]:
+    usage = {"rss_mb": 0.0, "pss_mb": 0.0, "uss_mb": 0.0}
+    for line in Path("/proc/self/smaps_rollup").read_text().splitlines():
+        key, _, value = line.partition(":")
+        if key in _FIELDS:
+            usage[_FIELDS[key]] += int(value.split()[0]) / 1024
+    return usage
+
+
+def _load() -> tuple[dict, float]:
+    from src.utils.agents_setup import agents_setup
+
+    start = time.perf_counter()
+    agents = agents_setup()
+    return agents, (time.perf_counter() - start) * 1000
+
+
+def _child(agents: dict | None, write_fd: int, release_fd: int, batch_size: int) -> None:
+    load_ms = 0.0
+    if agents is None:
+        agents, load_ms = _load()
+    for agent in agents.values():
+        if agent.is_loaded():
+            agent.predict_batch([WARMUP_ROW] * batch_size)
+    report = {"pid": os.getpid(), "load_ms": load_ms, **_memory()}
+    os.write(write_fd, (json.dumps(report) + "\n").encode())
+    # Stay alive until every sibling has measured, so that shared pages are
+    # still split between all of them.
+    os.read(release_fd, 1)
+    os._exit(0)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure per-worker model memory.")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--format", choices=["auto", "pickle", "native"], default=settings.ml.model_format)
+    parser.add_argument("--prefork", action="store_true")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    settings.ml.model_format = args.format
+    agents, load_ms = _load() if args.prefork else (None, 0.0)
+    if args.prefork:
+        gc.collect()
+        gc.freeze()
+
+    read_fd, write_fd = os.pipe()
+    release_read, release_write = os.pipe()
+    pids = []
+    for _ in range(args.workers):
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            os.close(release_write)
+            _child(agents, write_fd, release_read, args.batch_size)
+        pids.append(pid)
+    os.close(write_fd)
+    os.close(release_read)
+
+    with os.fdopen(read_fd) as pipe:
+        reports = [json.loads(pipe.readline()) for _ in pids]
+    os.close(release_write)
+    for pid in pids:
+        os.waitpid(pid, 0)
+
+    mode = "prefork" if args.prefork else "independent"
+    print(f"format={args.format} mode={mode} workers={args.workers}")
+    if args.prefork:
+        print(f"parent load: {load_ms:.0f} ms")
+    print(f"{'pid':>8} {'load ms':>8} {'RSS MB':>8} {'PSS MB':>8} {'USS MB':>8}")
+    for r in reports:
+        print(f"{r['pid']:>8} {r['load_ms']:>8.0f} {r['rss_mb']:>8.1f} {r['pss_mb']:>8.1f} {r['uss_mb']:>8.1f}")
+    print(f"{'total':>8} {'':>8} {sum(r['rss_mb'] for r in reports):>8.1f} "
+          f"{sum(r['pss_mb'] for r in reports):>8.1f} {sum(r['uss_mb'] for r in reports):>8.1f}")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Run partition maintenance for the ``predictions`` table once.
+
+Creates the next ``PARTITION_MONTHS_AHEAD`` monthly partitions and retires
+partitions older than ``PARTITION_RETENTION_MONTHS``, as the API does
+hourly. Useful from cron when the API runs with
+``PARTITION_MAINTENANCE_ENABLED=false``, or to preview a retention change.
+
+    python -m src.cli.partitions --dry-run --retention-months 12
+"""
+import argparse
+import asyncio
+import logging
+import sys
+
+from src.core.config import settings
+from src.services.partitions import PartitionManager
+
+logger = logging.getLogger("partitions")
+
+
+async def run(args: argparse.Namespace) -> None:
+    from src.core.db_helper import db_helper
+
+    manager = PartitionManager(
+        db_helper.session_factory,
+        months_ahead=args.months_ahead,
+        retention_months=args.retention_months,
+        retention_mode=args.mode,
+        archive_schema=settings.db.partition_archive_schema,
+    )
+    try:
+        plan = await manager.maintain(dry_run=args.dry_run)
+        if args.dry_run:
+            created, retired = "Would create", f"Would {args.mode}"
+        else:
+            created, retired = "Created", "Archived" if args.mode == "archive" else "Dropped"
+        logger.info(f"{created}: {', '.join(plan['create']) or 'none'}")
+        logger.info(f"{retired}: {', '.join(plan['retire']) or 'none'}")
+        for p in await manager.partitions():
+            logger.info(f"  {p['name']:<24} ~{p['estimated_rows']:>12,} rows {p['size_bytes'] / 2**20:>10.1f} MiB")
+    finally:
+        await db_helper.dispose()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Create and retire predictions partitions.")
+    parser.add_argument("--months-ahead", type=int, default=settings.db.partition_months_ahead)
+    parser.add_argument("--retention-months", type=int,
+                        default=settings.db.partition_retention_months)
+    parser.add_argument("--mode", choices=["archive", "drop"],
+                        default=settings.db.partition_retention_mode)
+    parser.add_argument("--dry-run", action="store_true", help="only print what would change")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stderr)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""Offline bulk scorer.
+
+Streams a CSV or Parquet file of flights in fixed-size chunks, scores the
+chunks across a process pool whose workers load the models once, and
+writes results incrementally. Peak memory is bounded by
+``chunk_size * (2 * workers + 1)`` rows. Rows that are missing a value or
+fall outside the request schema's bounds are not scored; their ``error``
+column says why.
+
+    python -m src.cli.score flights.parquet scored.parquet --model lightgbm_default
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from src.agents.features import flight_encoder
+from src.core.ids import uuid7
+from src.core.enums import AgentNameEnum
+from src.services import inference
+from src.services.columnar import check_rows
+
+logger = logging.getLogger("score")
+
+Columns = dict[str, np.ndarray]
+
+
+def _score_chunk(
+    model_name: str, columns: Columns
+) -> tuple[np.ndarray, list[str | None], str | None]:
+    agent = inference.worker_agent(model_name)
+    if agent is None or not agent.ensure_loaded():
+        raise RuntimeError(f"Model '{model_name}' is not loaded in the worker")
+    results = agent.predict_features(flight_encoder.encode_columns(columns))
+    proba = np.fromiter(
+        (np.nan if isinstance(r, Exception) else r["delay_probability"] for r in results),
+        dtype=np.float64,
+        count=len(results),
+    )
+    errors = [str(r) if isinstance(r, Exception) else None for r in results]
+    return proba, errors, agent.version
+
+
+def _read_chunks(path: Path, chunk_size: int) -> Iterator[Columns]:
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(
+            batch_size=chunk_size, columns=flight_encoder.sources
+        ):
+            yield {name: batch.column(name).to_numpy(zero_copy_only=False) for name in batch.schema.names}
+    else:
+        import pandas as pd
+
+        for frame in pd.read_csv(path, chunksize=chunk_size, usecols=flight_encoder.sources):
+            yield {name: frame[name].to_numpy() for name in frame.columns}
+
+
+class _ResultWriter:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._parquet = None
+        self._header = True
+
+    def write(self, columns: Columns, proba: np.ndarray, errors: list[str | None]) -> None:
+        out = dict(columns)
+        out["delay_probability"] = proba
+        out["delayed"] = proba > 0.5
+        out["error"] = np.asarray(errors, dtype=object)
+        if self.path.suffix == ".parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.table(out)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.path, table.schema)
+            self._parquet.write_table(table)
+        else:
+            import pandas as pd
+
+            pd.DataFrame(out).to_csv(
+                self.path, mode="w" if self._header else "a", header=self._header, index=False
+            )
+            self._header = False
+
+    def close(self) -> None:
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+async def _load_into_db(
+    model_name: str, model_version: str | None, columns: Columns, proba: np.ndarray, use_copy: bool
+) -> None:
+    from src.core.db_helper import db_helper
+    from src.dao.predictions import PredictionDAO
+
+    now = datetime.now(timezone.utc)
+    valid = np.flatnonzero(~np.isnan(proba))
+    rows: list[dict[str, Any]] = [
+        {
+            "id": uuid7(),
+            "created_at": now,
+            **{name: columns[name][i].item() for name in flight_encoder.sources},
+            "model_name": model_name,
+            "model_version": model_version,
+            "predicted_delayed": bool(proba[i] > 0.5),
+            "delay_probability": float(proba[i]),
+            "latency_ms": None,
+        }
+        for i in valid
+    ]
+    if rows:
+        async with db_helper.session_factory() as session:
+            await PredictionDAO(session).bulk_insert(rows, use_copy=use_copy)
+
+
+async def run(args: argparse.Namespace) -> None:
+    loop = asyncio.get_running_loop()
+    writer = _ResultWriter(args.output)
+    pending: deque = deque()
+    max_pending = args.workers * 2
+    rows = failed = 0
+    start = time.perf_counter()
+
+    async def drain_one() -> None:
+        nonlocal rows, failed
+        columns, checked, errors, valid, future = pending.popleft()
+        proba = np.full(len(errors), np.nan)
+        if future is not None:
+            scored, scored_errors, model_version = await future
+            proba[valid] = scored
+            for i, error in zip(valid, scored_errors):
+                errors[i] = error
+        writer.write(columns, proba, errors)
+        if args.load_db and future is not None:
+            await _load_into_db(args.model, model_version, checked, proba, args.copy)
+        rows += len(proba)
+        failed += sum(e is not None for e in errors)
+        elapsed = time.perf_counter() - start
+        logger.info(f"{rows} rows scored, {rows / elapsed:,.0f} rows/s")
+
+    with ProcessPoolExecutor(
+        max_workers=args.workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=inference.init_worker,
+    ) as pool:
+        try:
+            for columns in _read_chunks(args.input, args.chunk_size):
+                checked, errors = check_rows(columns)
+                valid = np.flatnonzero([e is None for e in errors])
+                future = None
+                if len(valid):
+                    subset = {name: values[valid] for name, values in checked.items()}
+                    future = loop.run_in_executor(pool, _score_chunk, args.model, subset)
+                pending.append((columns, checked, errors, valid, future))
+                if len(pending) >= max_pending:
+                    await drain_one()
+            while pending:
+                await drain_one()
+        finally:
+            writer.close()
+
+    if args.load_db:
+        from src.core.db_helper import db_helper
+
+        await db_helper.dispose()
+
+    elapsed = time.perf_counter() - start
+    logger.info(
+        f"Done: {rows} rows ({failed} failed) in {elapsed:.1f}s, "
+        f"{rows / elapsed if elapsed else 0:,.0f} rows/s -> {args.output}"
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Score a flight schedule file in bulk.")
+    parser.add_argument("input", type=Path, help="CSV or .parquet file with request fields as columns")
+    parser.add_argument("output", type=Path, help="CSV or .parquet file to write")
+    parser.add_argument(
+        "--model", choices=[m.value for m in AgentNameEnum], default=AgentNameEnum.CATBOOST_DEFAULT.value
+    )
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--load-db", action="store_true", help="also insert results into the predictions table")
+    parser.add_argument("--copy", action="store_true", help="use COPY for --load-db (asyncpg only)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s", stream=sys.stderr)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Pre-fork launcher sharing one copy of the models across workers.
+
+The parent loads every agent, freezes the GC so that collections in the
+children do not touch (and copy) the parent's objects, binds the listening
+socket and forks the uvicorn workers. Native model memory is then shared
+copy-on-write between all workers instead of being loaded once per worker.
+
+    python -m src.cli.serve --workers 4
+
+Use it with the ``thread`` inference executor: ``process`` mode spawns fresh
+interpreters that load their own models.
+"""
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+
+logger = logging.getLogger("serve")
+
+
+def _bind(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _spawn(sock: socket.socket, args: argparse.Namespace) -> int:
+    pid = os.fork()
+    if pid:
+        return pid
+    # Child: default signal handling, then hand over to uvicorn.
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    import uvicorn
+
+    from src.main import app
+
+    code = 0
+    try:
+        uvicorn.Server(uvicorn.Config(app, log_level=args.log_level)).run(sockets=[sock])
+    except BaseException:
+        logger.exception("Worker crashed")
+        code = 1
+    finally:
+        os._exit(code)
+
+
+def main(argv: list[str] | None = None) -> None:
+    from src.core.config import settings
+
+    parser = argparse.ArgumentParser(description="Serve the API from pre-forked workers.")
+    parser.add_argument("--host", default=settings.app.host)
+    parser.add_argument("--port", type=int, default=settings.app.port)
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "2")))
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    from src.utils.agents_setup import preload_agents
+
+    start = time.perf_counter()
+    agents = preload_agents()
+    import src.main  # noqa: F401  (import the app before forking, too)
+
+    logger.info(f"Preloaded {len(agents)} agents in {(time.perf_counter() - start) * 1000:.0f} ms")
+    gc.collect()
+    gc.freeze()
+
+    sock = _bind(args.host, args.port)
+    workers = {_spawn(sock, args) for _ in range(args.workers)}
+    logger.info(f"Listening on {args.host}:{args.port} with {len(workers)} workers")
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in workers:
+            os.kill(pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    while workers:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        workers.discard(pid)
+        if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+            from prometheus_client import multiprocess
+
+            # Drop the dead worker's live gauge files from the aggregate.
+            multiprocess.mark_process_dead(pid)
+        if not stopping:
+            logger.warning(f"Worker {pid} exited with status {status}, restarting")
+            workers.add(_spawn(sock, args))
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
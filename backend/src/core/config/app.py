@@ -7,3 +7,13 @@ class AppConfig(BaseConfig):
     debug: bool = False
     host: str = "0.0.0.0"
     port: int = 8000
+    # Required as X-Admin-Token on /api/v1/admin/*; the admin API is off without it.
+    admin_token: str | None = None
+
+    # Request profiling: profile this fraction of prediction requests, and
+    # any request sent with X-Profile: 1 when the header is enabled.
+    profile_sample_rate: float = 0.0
+    profile_header_enabled: bool = False
+    profile_interval_ms: float = 1.0
+    profile_buffer_size: int = 100
+    profile_max_concurrent: int = 4
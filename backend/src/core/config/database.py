@@ -1,3 +1,5 @@
+from typing import Literal
+
 from .base import BaseConfig
 
 
@@ -7,11 +9,49 @@ class DatabaseConfig(BaseConfig):
     postgres_user: str = "postgres"
     postgres_password: str = "postgres"
     postgres_db: str = "api_ml"
+    # Optional replica for the reader engine; defaults to the primary.
+    postgres_read_host: str | None = None
+    postgres_read_port: int | None = None
 
     echo: bool = False
     echo_pool: bool = False
     pool_size: int = 5
     max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_pre_ping: bool = False
+    pool_recycle: int = 1800
+    statement_cache_size: int = 100
+    prepared_statement_cache_size: int = 100
+
+    read_engine_enabled: bool = True
+    read_pool_size: int = 5
+    read_max_overflow: int = 5
+    read_pool_timeout: float = 10.0
+    read_pool_pre_ping: bool = True
+    read_pool_recycle: int = 1800
+    read_statement_cache_size: int = 100
+    read_prepared_statement_cache_size: int = 100
+
+    write_behind_enabled: bool = False
+    write_behind_batch_size: int = 500
+    write_behind_flush_interval_ms: float = 100.0
+    write_behind_max_buffer: int = 10_000
+    write_behind_use_copy: bool = False
+    write_behind_max_retries: int = 3
+    write_behind_retry_backoff_ms: float = 200.0
+
+    rollup_flush_interval_ms: float = 1000.0
+
+    history_count_mode: Literal["exact", "estimate"] = "estimate"
+    history_count_max_age_seconds: float = 30.0
+    history_count_max_entries: int = 1024
+
+    partition_maintenance_enabled: bool = True
+    partition_maintenance_interval_seconds: float = 3600.0
+    partition_months_ahead: int = 3
+    partition_retention_months: int | None = None
+    partition_retention_mode: Literal["drop", "archive"] = "archive"
+    partition_archive_schema: str = "archive"
 
     @property
     def url(self) -> str:
@@ -19,3 +59,11 @@ class DatabaseConfig(BaseConfig):
             f"postgresql+asyncpg://{self.postgres_user}:{self.postgres_password}"
             f"@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
         )
+
+    @property
+    def read_url(self) -> str:
+        return (
+            f"postgresql+asyncpg://{self.postgres_user}:{self.postgres_password}"
+            f"@{self.postgres_read_host or self.postgres_host}"
+            f":{self.postgres_read_port or self.postgres_port}/{self.postgres_db}"
+        )
@@ -1,3 +1,7 @@
+from typing import Literal
+
+from pydantic import NonNegativeFloat
+
 from .base import BaseConfig
 
 
@@ -7,3 +11,43 @@ class MLConfig(BaseConfig):
     lightgbm_default_path: str = "ml/lightgbm_default_model.pkl"
     lightgbm_optimized_path: str = "ml/lightgbm_optimized_model.pkl"
     label_encoders_path: str = "ml/label_encoders.pkl"
+    # "auto" prefers a converted native artifact (.cbm / .txt) next to the
+    # pickle when one exists; see `python -m src.cli.convert`.
+    model_format: Literal["auto", "pickle", "native"] = "auto"
+
+    reload_watch_enabled: bool = False
+    reload_watch_interval_seconds: float = 5.0
+
+    # Models scored by the NumPy engine in src/agents/compiled.py for
+    # batches up to compiled_max_batch_size; larger ones use the library.
+    compiled_models: list[str] = []
+    compiled_max_batch_size: int = 16
+
+    lazy_models: list[str] = []
+    model_load_workers: int = 4
+    warmup_enabled: bool = True
+
+    batch_max_size: int = 10_000
+    columnar_max_rows: int = 100_000
+
+    microbatch_enabled: bool = True
+    microbatch_max_size: int = 64
+    microbatch_max_wait_ms: float = 2.0
+
+    inference_executor: Literal["thread", "process"] = "thread"
+    inference_pool_size: int = 4
+    inference_max_pending: int = 256
+
+    unknown_category_code: float = float("nan")
+    unknown_category_strict: bool = False
+
+    ensemble_aggregation: Literal["mean", "weighted"] = "mean"
+    # Per-model weights for "weighted"; models not listed weigh 1.0.
+    ensemble_weights: dict[str, NonNegativeFloat] = {}
+
+    # Directory written by `python -m src.cli.build_index`.
+    score_index_path: str | None = None
+
+    cache_enabled: bool = True
+    cache_max_entries: int = 100_000
+    cache_ttl_seconds: float = 300.0
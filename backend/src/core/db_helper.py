@@ -1,54 +1,194 @@
 import logging
-from collections.abc import AsyncGenerator
+import time
+from collections.abc import AsyncGenerator, Callable
+from dataclasses import dataclass
+from typing import Any, ClassVar
 
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from src.core.config import settings
 
 log = logging.getLogger(__name__)
 
 
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that measures how long each checkout took.
+
+    The time covers waiting for a free connection, opening a new one when
+    the pool grows, and the pre-ping. ``listeners`` are called with the
+    pool's ``name`` and the wait in seconds after every checkout, including
+    ones that time out.
+    """
+
+    listeners: ClassVar[list[Callable[[str, float], None]]] = []
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.name = "default"
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+            for listener in self.listeners:
+                listener(self.name, waited)
+
+    def recreate(self) -> "TimedQueuePool":
+        pool = super().recreate()
+        pool.name = self.name
+        return pool
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            # QueuePool counts overflow from -pool_size up; report only the excess.
+            "overflow": max(self.overflow(), 0),
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "mean_wait_ms": self.wait_total / self.checkouts * 1000 if self.checkouts else 0.0,
+            "max_wait_ms": self.wait_max * 1000,
+        }
+
+
+@dataclass(frozen=True)
+class EngineOptions:
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_pre_ping: bool = False
+    pool_recycle: int = -1
+    # asyncpg's per-connection statement cache and SQLAlchemy's cache of
+    # prepared statements on top of it; set both to 0 behind PgBouncer in
+    # transaction mode.
+    statement_cache_size: int = 100
+    prepared_statement_cache_size: int = 100
+
+
+def _create_engine(url: str, name: str, options: EngineOptions, **kwargs: Any) -> AsyncEngine:
+    connect_args = {}
+    if make_url(url).get_driver_name() == "asyncpg":
+        connect_args = {
+            "statement_cache_size": options.statement_cache_size,
+            "prepared_statement_cache_size": options.prepared_statement_cache_size,
+        }
+    engine = create_async_engine(
+        url=url,
+        poolclass=TimedQueuePool,
+        pool_size=options.pool_size,
+        max_overflow=options.max_overflow,
+        pool_timeout=options.pool_timeout,
+        pool_pre_ping=options.pool_pre_ping,
+        pool_recycle=options.pool_recycle,
+        connect_args=connect_args,
+        **kwargs,
+    )
+    engine.pool.name = name
+    return engine
+
+
 class DatabaseHelper:
+    """Writer engine for inserts and DDL, reader engine for history and lookups.
+
+    The two engines have separate pools, so long reads cannot take the
+    connections inserts need. ``read_url`` may point at a replica. Without
+    it, or without ``reader`` options, reads share the writer engine.
+    """
+
     def __init__(
         self,
         url: str,
         echo: bool = False,
         echo_pool: bool = False,
-        pool_size: int = 5,
-        max_overflow: int = 10,
+        writer: EngineOptions = EngineOptions(),
+        reader: EngineOptions | None = None,
+        read_url: str | None = None,
     ) -> None:
-        self.engine: AsyncEngine = create_async_engine(
-            url=url,
-            echo=echo,
-            echo_pool=echo_pool,
-            pool_size=pool_size,
-            max_overflow=max_overflow,
+        self.engine: AsyncEngine = _create_engine(
+            url, "writer", writer, echo=echo, echo_pool=echo_pool
         )
-        self.session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
-            bind=self.engine,
+        self.session_factory: async_sessionmaker[AsyncSession] = self._session_factory(self.engine)
+        self.read_engine, self.read_session_factory = self.engine, self.session_factory
+        if reader is not None:
+            self.read_engine = _create_engine(
+                read_url or url, "reader", reader, echo=echo, echo_pool=echo_pool
+            )
+            self.read_session_factory = self._session_factory(self.read_engine)
+
+    @staticmethod
+    def _session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+        return async_sessionmaker(
+            bind=engine,
             autoflush=False,
             autocommit=False,
             expire_on_commit=False,
         )
 
+    @property
+    def engines(self) -> list[AsyncEngine]:
+        if self.read_engine is self.engine:
+            return [self.engine]
+        return [self.engine, self.read_engine]
+
     async def dispose(self) -> None:
-        await self.engine.dispose()
+        for engine in self.engines:
+            await engine.dispose()
         log.info("Database engine disposed")
 
     async def session_getter(self) -> AsyncGenerator[AsyncSession, None]:
         async with self.session_factory() as session:
             yield session
 
+    async def read_session_getter(self) -> AsyncGenerator[AsyncSession, None]:
+        async with self.read_session_factory() as session:
+            yield session
+
 
 db_helper = DatabaseHelper(
     url=settings.db.url,
     echo=settings.db.echo,
     echo_pool=settings.db.echo_pool,
-    pool_size=settings.db.pool_size,
-    max_overflow=settings.db.max_overflow,
-)
\ No newline at end of file
+    writer=EngineOptions(
+        pool_size=settings.db.pool_size,
+        max_overflow=settings.db.max_overflow,
+        pool_timeout=settings.db.pool_timeout,
+        pool_pre_ping=settings.db.pool_pre_ping,
+        pool_recycle=settings.db.pool_recycle,
+        statement_cache_size=settings.db.statement_cache_size,
+        prepared_statement_cache_size=settings.db.prepared_statement_cache_size,
+    ),
+    reader=EngineOptions(
+        pool_size=settings.db.read_pool_size,
+        max_overflow=settings.db.read_max_overflow,
+        pool_timeout=settings.db.read_pool_timeout,
+        pool_pre_ping=settings.db.read_pool_pre_ping,
+        pool_recycle=settings.db.read_pool_recycle,
+        statement_cache_size=settings.db.read_statement_cache_size,
+        prepared_statement_cache_size=settings.db.read_prepared_statement_cache_size,
+    )
+    if settings.db.read_engine_enabled
+    else None,
+    read_url=settings.db.read_url,
+)
@@ -1 +1,6 @@
 from .agents import AgentNameEnum
+from .analytics import AnalyticsBucketEnum, AnalyticsDimensionEnum, AnalyticsMetricEnum
+from .columnar import ColumnarFormatEnum
+from .ensemble import EnsembleAggregationEnum
+from .export import ExportFormatEnum
+from .profiling import ProfileKindEnum
@@ -0,0 +1,20 @@
+from enum import StrEnum
+
+
+class AnalyticsBucketEnum(StrEnum):
+    HOUR = "hour"
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class AnalyticsDimensionEnum(StrEnum):
+    MODEL = "model"
+    CARRIER = "carrier"
+    ROUTE = "route"
+
+
+class AnalyticsMetricEnum(StrEnum):
+    DELAY_RATE = "delay_rate"
+    MEAN_DELAY_PROBABILITY = "mean_delay_probability"
+    PREDICTIONS = "predictions"
@@ -0,0 +1,7 @@
+from enum import StrEnum
+
+
+class ColumnarFormatEnum(StrEnum):
+    ARROW = "arrow"
+    MSGPACK = "msgpack"
+    JSON = "json"
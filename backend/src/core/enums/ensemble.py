@@ -0,0 +1,6 @@
+from enum import StrEnum
+
+
+class EnsembleAggregationEnum(StrEnum):
+    MEAN = "mean"
+    WEIGHTED = "weighted"
@@ -0,0 +1,7 @@
+from enum import StrEnum
+
+
+class ExportFormatEnum(StrEnum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+    PARQUET = "parquet"
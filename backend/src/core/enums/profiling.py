@@ -0,0 +1,6 @@
+from enum import StrEnum
+
+
+class ProfileKindEnum(StrEnum):
+    WALL = "wall"
+    CPU = "cpu"
@@ -0,0 +1,30 @@
+"""Time-ordered prediction ids (UUIDv7, RFC 9562).
+
+The first 48 bits are the Unix time in milliseconds, so ids sort roughly by
+creation time, append to the right edge of the primary key index, and tell
+``PredictionDAO.get_by_id`` which monthly partition to look in.
+"""
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+
+
+def uuid7() -> uuid.UUID:
+    ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10))
+    value = (
+        (ms & 0xFFFF_FFFF_FFFF) << 80
+        | 0x7 << 76
+        | (rand >> 68) << 64
+        | 0b10 << 62
+        | rand & 0x3FFF_FFFF_FFFF_FFFF
+    )
+    return uuid.UUID(int=value)
+
+
+def uuid7_time(value: uuid.UUID) -> datetime | None:
+    """Creation time embedded in a UUIDv7; ``None`` for other versions."""
+    if value.version != 7:
+        return None
+    return datetime.fromtimestamp((value.int >> 80) / 1000, tz=timezone.utc)
@@ -1,7 +1,9 @@
 from src.core.models.base import Base
 from src.core.models.prediction import Prediction
+from src.core.models.rollup import PredictionRollup
 
 __all__ = [
     "Base",
     "Prediction",
+    "PredictionRollup",
 ]
@@ -1,18 +1,54 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import Boolean, DateTime, Float, Integer, String
+from sqlalchemy import Boolean, DateTime, Float, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.core.models.base import Base
+from src.core.ids import uuid7
 
 
 class Prediction(Base):
+    """One scored flight.
+
+    On Postgres the table is range-partitioned by month on ``created_at``
+    (see ``src.services.partitions``), which is why it is part of the
+    primary key.
+    """
+
     __tablename__ = "predictions"
+    __table_args__ = (
+        # Tiny, and enough for time-range scans over append-ordered rows.
+        Index("ix_predictions_created_at_brin", "created_at", postgresql_using="brin"),
+        # History pages seek on (created_at, id); the INCLUDE columns let
+        # Postgres answer them with index-only scans.
+        Index(
+            "ix_predictions_created_at_id",
+            "created_at",
+            "id",
+            postgresql_include=["model_name", "predicted_delayed", "delay_probability"],
+        ),
+        *(
+            Index(
+                f"ix_predictions_{column}_created_at_id",
+                column,
+                "created_at",
+                "id",
+                postgresql_include=[
+                    c
+                    for c in ("model_name", "carrier", "origin", "dest")
+                    if c != column
+                ]
+                + ["predicted_delayed", "delay_probability"],
+            )
+            for column in ("model_name", "carrier", "origin", "dest")
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
-    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid7)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+        DateTime(timezone=True), primary_key=True, default=lambda: datetime.now(timezone.utc)
     )
 
     month: Mapped[int] = mapped_column(Integer)
@@ -25,7 +61,8 @@ class Prediction(Base):
     distance: Mapped[int] = mapped_column(Integer)
 
     model_name: Mapped[str] = mapped_column(String(50))
+    model_version: Mapped[str | None] = mapped_column(String(12), nullable=True)
     predicted_delayed: Mapped[bool] = mapped_column(Boolean)
     delay_probability: Mapped[float] = mapped_column(Float)
 
-    latency_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    latency_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
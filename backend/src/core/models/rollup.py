@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.core.models.base import Base
+
+
+class PredictionRollup(Base):
+    """Hourly prediction counts per model, carrier and route.
+
+    Analytics read this table, whose size grows with hours x keys rather
+    than with raw predictions. ``bulk_insert`` (the write-behind writer, the
+    columnar endpoint, the bulk scorer) upserts rows in the same transaction
+    as the predictions they count. Predictions saved per request by
+    ``create``/``create_many`` are added to ``RollupBuffer`` after their
+    commit and upserted every ``ROLLUP_FLUSH_INTERVAL_MS`` in a separate
+    transaction. A failed flush keeps its totals for the next one, and totals
+    still buffered when a worker exits uncleanly are lost, so these rows can
+    trail or undercount the predictions table.
+    """
+
+    __tablename__ = "prediction_rollups_hourly"
+
+    # Primary key order puts ``bucket`` first so time-range queries are a
+    # single index range scan.
+    bucket: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    model_name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    carrier: Mapped[str] = mapped_column(String(3), primary_key=True)
+    origin: Mapped[str] = mapped_column(String(4), primary_key=True)
+    dest: Mapped[str] = mapped_column(String(4), primary_key=True)
+
+    predictions: Mapped[int] = mapped_column(Integer)
+    delayed: Mapped[int] = mapped_column(Integer)
+    delay_probability_sum: Mapped[float] = mapped_column(Float)
@@ -1,10 +1,63 @@
-from .agents import ErrorResponse, ModelInfoSchema, StatusResponse
-from .predictions import FlightPredictionRequestSchema, FlightPredictionResponseSchema
+from .agents import (
+    ErrorResponse,
+    ModelInfoSchema,
+    ModelReadinessSchema,
+    ModelReloadResponse,
+    ReadinessResponse,
+    StatusResponse,
+)
+from .analytics import DelayRateSchema
+from .predictions import (
+    BatchPredictionItemSchema,
+    EnsemblePredictionResponseSchema,
+    FlightBatchPredictionRequestSchema,
+    FlightBatchPredictionResponseSchema,
+    FlightPredictionRequestSchema,
+    FlightPredictionResponseSchema,
+    PredictionFilterSchema,
+)
+from .stats import (
+    BatcherStatsSchema,
+    CacheStatsSchema,
+    CategoryStatsSchema,
+    DatabasePoolStatsSchema,
+    ExecutorStatsSchema,
+    PartitionSchema,
+    PartitionStatsSchema,
+    ProfileListResponse,
+    ProfilerStatsSchema,
+    ProfileSummarySchema,
+    ReloaderStatsSchema,
+    ScoreIndexStatsSchema,
+    WriterStatsSchema,
+)
 
 __all__ = [
+    "BatchPredictionItemSchema",
+    "BatcherStatsSchema",
+    "CacheStatsSchema",
+    "CategoryStatsSchema",
+    "DatabasePoolStatsSchema",
+    "DelayRateSchema",
+    "EnsemblePredictionResponseSchema",
     "ErrorResponse",
+    "ExecutorStatsSchema",
+    "FlightBatchPredictionRequestSchema",
+    "FlightBatchPredictionResponseSchema",
     "FlightPredictionRequestSchema",
     "FlightPredictionResponseSchema",
     "ModelInfoSchema",
+    "ModelReadinessSchema",
+    "ModelReloadResponse",
+    "PartitionSchema",
+    "PartitionStatsSchema",
+    "PredictionFilterSchema",
+    "ProfileListResponse",
+    "ProfileSummarySchema",
+    "ProfilerStatsSchema",
+    "ReadinessResponse",
+    "ReloaderStatsSchema",
+    "ScoreIndexStatsSchema",
     "StatusResponse",
+    "WriterStatsSchema",
 ]
@@ -4,6 +4,31 @@ from pydantic import BaseModel
 class ModelInfoSchema(BaseModel):
     name: str
     is_loaded: bool
+    version: str | None = None
+
+
+class ModelReadinessSchema(BaseModel):
+    name: str
+    lazy: bool
+    is_loaded: bool
+    warmed_up: bool
+    compiled: bool = False
+    load_ms: float | None = None
+    warmup_ms: float | None = None
+    error: str | None = None
+
+
+class ReadinessResponse(BaseModel):
+    ready: bool
+    models: list[ModelReadinessSchema]
+
+
+class ModelReloadResponse(BaseModel):
+    name: str
+    reloaded: bool
+    version: str | None = None
+    previous_version: str | None = None
+    load_ms: float | None = None
 
 
 class StatusResponse(BaseModel):
@@ -0,0 +1,15 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class DelayRateSchema(BaseModel):
+    bucket: datetime | None = None
+    model_name: str | None = None
+    carrier: str | None = None
+    origin: str | None = None
+    dest: str | None = None
+    predictions: int
+    delayed: int
+    delay_rate: float
+    mean_delay_probability: float
@@ -3,6 +3,9 @@ from datetime import datetime
 
 from pydantic import BaseModel, Field
 
+from src.core.config import settings
+from src.core.enums import EnsembleAggregationEnum
+
 
 class FlightPredictionRequestSchema(BaseModel):
     month: int = Field(..., ge=1, le=12)
@@ -15,6 +18,15 @@ class FlightPredictionRequestSchema(BaseModel):
     distance: int = Field(..., ge=0)
 
 
+class PredictionFilterSchema(BaseModel):
+    model_name: str | None = None
+    carrier: str | None = Field(default=None, min_length=2, max_length=3)
+    origin: str | None = Field(default=None, min_length=3, max_length=4)
+    dest: str | None = Field(default=None, min_length=3, max_length=4)
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+
+
 class FlightPredictionResponseSchema(BaseModel):
     prediction_id: uuid.UUID
     delayed: bool
@@ -22,3 +34,32 @@ class FlightPredictionResponseSchema(BaseModel):
     no_delay_probability: float
     model_used: str
     created_at: datetime
+
+
+class FlightBatchPredictionRequestSchema(BaseModel):
+    items: list[FlightPredictionRequestSchema] = Field(
+        ..., min_length=1, max_length=settings.ml.batch_max_size
+    )
+
+
+class BatchPredictionItemSchema(BaseModel):
+    index: int
+    prediction: FlightPredictionResponseSchema | None = None
+    error: str | None = None
+
+
+class FlightBatchPredictionResponseSchema(BaseModel):
+    model_used: str
+    succeeded: int
+    failed: int
+    items: list[BatchPredictionItemSchema]
+
+
+class EnsemblePredictionResponseSchema(BaseModel):
+    delayed: bool
+    delay_probability: float
+    no_delay_probability: float
+    aggregation: EnsembleAggregationEnum
+    weights: dict[str, float]
+    predictions: list[FlightPredictionResponseSchema]
+    errors: dict[str, str] = {}
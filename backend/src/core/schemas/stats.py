@@ -0,0 +1,148 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class BatcherStatsSchema(BaseModel):
+    model_name: str
+    batches: int
+    items: int
+    queue_depth: int
+    mean_batch_size: float
+    max_batch_size: int
+    mean_queue_wait_ms: float
+    max_queue_wait_ms: float
+
+
+class ExecutorStatsSchema(BaseModel):
+    kind: str
+    pool_size: int
+    in_flight: int
+    queue_depth: int
+    submitted: int
+    completed: int
+    failed: int
+    mean_exec_ms: float
+    max_exec_ms: float
+    mean_queue_wait_ms: float
+    max_queue_wait_ms: float
+
+
+class CategoryStatsSchema(BaseModel):
+    feature: str
+    size: int
+    lookups: int
+    unknown: int
+
+
+class CacheStatsSchema(BaseModel):
+    enabled: bool
+    entries: int = 0
+    max_entries: int = 0
+    ttl_seconds: float = 0.0
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    hit_rate: float = 0.0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    in_flight: int = 0
+    memory_bytes: int = 0
+
+
+class WriterStatsSchema(BaseModel):
+    enabled: bool
+    buffered: int = 0
+    max_buffer: int = 0
+    written: int = 0
+    dropped: int = 0
+    retries: int = 0
+    flushes: int = 0
+    mean_flush_size: float = 0.0
+    mean_flush_ms: float = 0.0
+    max_flush_ms: float = 0.0
+
+
+class DatabasePoolStatsSchema(BaseModel):
+    name: str
+    size: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    mean_wait_ms: float
+    max_wait_ms: float
+
+
+class PartitionSchema(BaseModel):
+    name: str
+    range_from: datetime | None = None
+    range_to: datetime | None = None
+    estimated_rows: int
+    size_bytes: int
+
+
+class PartitionStatsSchema(BaseModel):
+    enabled: bool
+    months_ahead: int = 0
+    retention_months: int | None = None
+    retention_mode: str | None = None
+    runs: int = 0
+    created: int = 0
+    retired: int = 0
+    last_run_at: datetime | None = None
+    last_error: str | None = None
+    partitions: list[PartitionSchema] = []
+
+
+class ReloaderStatsSchema(BaseModel):
+    watching: bool
+    reloads: int
+    failures: int
+    last_error: str | None = None
+    versions: dict[str, str | None]
+
+
+class ScoreIndexStatsSchema(BaseModel):
+    enabled: bool
+    path: str | None = None
+    rows: int = 0
+    size_bytes: int = 0
+    built_at: str | None = None
+    build_seconds: float | None = None
+    models: dict[str, str] = {}
+    hits: int = 0
+    misses: int = 0
+    hit_rate: float = 0.0
+
+
+class ProfilerStatsSchema(BaseModel):
+    enabled: bool
+    sample_rate: float
+    header_enabled: bool
+    interval_ms: float
+    capacity: int
+    max_concurrent: int
+    active: int
+    buffered: int
+    profiled: int
+    skipped: int
+
+
+class ProfileSummarySchema(BaseModel):
+    id: int
+    created_at: datetime
+    method: str
+    path: str
+    query: str
+    status: int | None
+    wall_ms: float
+    cpu_ms: float
+    samples: int
+
+
+class ProfileListResponse(BaseModel):
+    profiler: ProfilerStatsSchema
+    profiles: list[ProfileSummarySchema]
@@ -1,36 +1,167 @@
 import uuid
+from collections.abc import AsyncIterator, Mapping, Sequence
+from datetime import datetime, timedelta
+from typing import Any
 
-from sqlalchemy import func, select
+from sqlalchemy import Row, Select, func, insert, select, text, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
+from src.core.ids import uuid7_time
 from src.core.models import Prediction
+from src.core.schemas.predictions import PredictionFilterSchema
+from src.dao.rollups import RollupDAO
+
+# Columns the history responses need; all of them are covered by the
+# history indexes, so pages are served by index-only scans.
+HISTORY_COLUMNS = (
+    Prediction.id,
+    Prediction.created_at,
+    Prediction.model_name,
+    Prediction.predicted_delayed,
+    Prediction.delay_probability,
+)
+# How far created_at may be from the time in a UUIDv7 id. Both are taken
+# when the prediction is built, so this is generous.
+ID_TIME_SKEW = timedelta(hours=1)
 
 
 class PredictionDAO:
-    def __init__(self, session: AsyncSession) -> None:
+    """Writes and lookups by id go through ``session``; history and counts
+    through ``read_session`` (the reader engine), which defaults to
+    ``session``. Lookups stay on the writer so an id is readable as soon as
+    the request that created it returns, even when the reader is a lagging
+    replica.
+    """
+
+    def __init__(self, session: AsyncSession, read_session: AsyncSession | None = None) -> None:
         self.session = session
+        self.read_session = read_session or session
 
     async def create(self, prediction: Prediction) -> Prediction:
+        # Ids and timestamps are generated client-side, so there is nothing
+        # to refresh after the commit.
         self.session.add(prediction)
         await self.session.commit()
-        await self.session.refresh(prediction)
         return prediction
 
+    # create and create_many leave the rollups to the caller (RollupBuffer),
+    # keeping the shared hourly rows out of per-request transactions.
+    async def create_many(self, predictions: list[Prediction]) -> list[Prediction]:
+        self.session.add_all(predictions)
+        await self.session.commit()
+        return predictions
+
+    async def bulk_insert(
+        self, rows: Sequence[Mapping[str, Any]], use_copy: bool = False
+    ) -> None:
+        """Insert column dicts without the ORM unit of work, via COPY when on asyncpg.
+
+        The hourly rollups are updated in the same transaction.
+        """
+        if use_copy and self.session.bind.dialect.driver == "asyncpg":
+            columns = list(rows[0])
+            connection = await self.session.connection()
+            raw = await connection.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                Prediction.__tablename__,
+                records=[tuple(row[c] for c in columns) for row in rows],
+                columns=columns,
+            )
+        else:
+            await self.session.execute(insert(Prediction), list(rows))
+        await RollupDAO(self.session).add(rows)
+        await self.session.commit()
+
     async def get_by_id(self, prediction_id: uuid.UUID) -> Prediction | None:
-        result = await self.session.execute(
-            select(Prediction).where(Prediction.id == prediction_id)
-        )
+        stmt = select(Prediction).where(Prediction.id == prediction_id)
+        # A UUIDv7 carries its creation time; bounding created_at with it
+        # lets Postgres skip every monthly partition but one or two.
+        created = uuid7_time(prediction_id)
+        if created is not None:
+            stmt = stmt.where(
+                Prediction.created_at >= created - ID_TIME_SKEW,
+                Prediction.created_at < created + ID_TIME_SKEW,
+            )
+        result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
-    async def get_all(self, limit: int = 100, offset: int = 0) -> list[Prediction]:
-        result = await self.session.execute(
-            select(Prediction)
-            .order_by(Prediction.created_at.desc())
-            .limit(limit)
-            .offset(offset)
+    async def get_all(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        after: tuple[datetime, uuid.UUID] | None = None,
+        filters: PredictionFilterSchema | None = None,
+    ) -> list[Prediction]:
+        """Newest-first page of history rows.
+
+        ``after`` is the (created_at, id) of the last row of the previous
+        page; seeking past it costs the same on every page, unlike ``offset``.
+        """
+        stmt = select(Prediction).options(load_only(*HISTORY_COLUMNS))
+        stmt = self._filter(stmt, filters)
+        if after is not None:
+            # Partition pruning does not see through the row comparison, so
+            # repeat its created_at bound as a plain predicate.
+            stmt = stmt.where(
+                Prediction.created_at <= after[0],
+                tuple_(Prediction.created_at, Prediction.id) < tuple_(*after),
+            )
+        elif offset:
+            stmt = stmt.offset(offset)
+        result = await self.read_session.execute(
+            stmt.order_by(Prediction.created_at.desc(), Prediction.id.desc()).limit(limit)
         )
         return list(result.scalars().all())
 
-    async def count(self) -> int:
-        result = await self.session.execute(select(func.count(Prediction.id)))
+    async def count(self, filters: PredictionFilterSchema | None = None) -> int:
+        stmt = self._filter(select(func.count(Prediction.id)), filters)
+        result = await self.read_session.execute(stmt)
         return result.scalar_one()
+
+    async def estimate_count(self) -> int | None:
+        """Planner row estimate; ``None`` when unavailable (not Postgres, never analyzed).
+
+        A partitioned table has no statistics of its own, so its partitions'
+        estimates are summed.
+        """
+        if self.read_session.bind.dialect.name != "postgresql":
+            return None
+        result = await self.read_session.execute(
+            text(
+                "SELECT (sum(reltuples) FILTER (WHERE reltuples >= 0))::bigint FROM pg_class "
+                "WHERE oid = CAST(:table AS regclass) OR oid IN "
+                "(SELECT inhrelid FROM pg_inherits WHERE inhparent = CAST(:table AS regclass))"
+            ),
+            {"table": Prediction.__tablename__},
+        )
+        value = result.scalar_one_or_none()
+        return value if value is not None and value >= 0 else None
+
+    async def stream(
+        self, filters: PredictionFilterSchema | None = None, chunk_size: int = 5000
+    ) -> AsyncIterator[Sequence[Row]]:
+        """Yield all matching rows oldest-first, ``chunk_size`` at a time, via a server-side cursor."""
+        stmt = self._filter(select(*Prediction.__table__.columns), filters)
+        stmt = stmt.order_by(Prediction.created_at, Prediction.id)
+        result = await self.read_session.stream(stmt.execution_options(yield_per=chunk_size))
+        async for partition in result.partitions(chunk_size):
+            yield partition
+
+    @staticmethod
+    def _filter(stmt: Select, filters: PredictionFilterSchema | None) -> Select:
+        if filters is None:
+            return stmt
+        if filters.model_name is not None:
+            stmt = stmt.where(Prediction.model_name == filters.model_name)
+        if filters.carrier is not None:
+            stmt = stmt.where(Prediction.carrier == filters.carrier)
+        if filters.origin is not None:
+            stmt = stmt.where(Prediction.origin == filters.origin)
+        if filters.dest is not None:
+            stmt = stmt.where(Prediction.dest == filters.dest)
+        if filters.created_from is not None:
+            stmt = stmt.where(Prediction.created_at >= filters.created_from)
+        if filters.created_to is not None:
+            stmt = stmt.where(Prediction.created_at < filters.created_to)
+        return stmt
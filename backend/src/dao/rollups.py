@@ -0,0 +1,247 @@
+import asyncio
+import logging
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import ColumnElement, Select, func, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.enums import AnalyticsBucketEnum, AnalyticsDimensionEnum, AnalyticsMetricEnum
+from src.core.models import Prediction, PredictionRollup
+from src.core.schemas.predictions import PredictionFilterSchema
+
+logger = logging.getLogger(__name__)
+
+_KEY = ("model_name", "carrier", "origin", "dest")
+_DIMENSIONS = {
+    AnalyticsDimensionEnum.MODEL: ("model_name",),
+    AnalyticsDimensionEnum.CARRIER: ("carrier",),
+    AnalyticsDimensionEnum.ROUTE: ("origin", "dest"),
+}
+# SQLite fallback for the bench and load-test databases; timestamps there
+# are stored as naive UTC strings.
+_SQLITE_BUCKETS = {
+    AnalyticsBucketEnum.HOUR: ("%Y-%m-%d %H:00:00",),
+    AnalyticsBucketEnum.DAY: ("%Y-%m-%d 00:00:00",),
+    AnalyticsBucketEnum.WEEK: ("%Y-%m-%d 00:00:00", "weekday 0", "-6 days"),
+    AnalyticsBucketEnum.MONTH: ("%Y-%m-01 00:00:00",),
+}
+
+
+def hour_floor(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _field(prediction: Prediction | Mapping[str, Any], name: str) -> Any:
+    if isinstance(prediction, Mapping):
+        return prediction.get(name)
+    return getattr(prediction, name)
+
+
+def _accumulate(
+    totals: dict[tuple, list], predictions: Iterable[Prediction | Mapping[str, Any]]
+) -> dict[tuple, list]:
+    now = datetime.now(timezone.utc)
+    for p in predictions:
+        key = (hour_floor(_field(p, "created_at") or now), *(_field(p, c) for c in _KEY))
+        total = totals[key]
+        total[0] += 1
+        total[1] += bool(_field(p, "predicted_delayed"))
+        total[2] += _field(p, "delay_probability")
+    return totals
+
+
+class RollupDAO:
+    """``add`` writes through ``session``; ``summarize`` reads through
+    ``read_session``, which defaults to ``session``.
+    """
+
+    def __init__(self, session: AsyncSession, read_session: AsyncSession | None = None) -> None:
+        self.session = session
+        self.read_session = read_session or session
+
+    @staticmethod
+    def aggregate(predictions: Iterable[Prediction | Mapping[str, Any]]) -> list[dict[str, Any]]:
+        """Hourly rollup rows for a batch of predictions, sorted by key.
+
+        The sort gives concurrent transactions the same lock order on the
+        rows they share, so their upserts queue instead of deadlocking.
+        """
+        return RollupDAO._rows(_accumulate(defaultdict(lambda: [0, 0, 0.0]), predictions))
+
+    @staticmethod
+    def _rows(totals: dict[tuple, list]) -> list[dict[str, Any]]:
+        return [
+            {
+                "bucket": key[0],
+                **dict(zip(_KEY, key[1:])),
+                "predictions": n,
+                "delayed": delayed,
+                "delay_probability_sum": probability_sum,
+            }
+            for key, (n, delayed, probability_sum) in sorted(totals.items())
+        ]
+
+    async def add(self, predictions: Iterable[Prediction | Mapping[str, Any]]) -> None:
+        """Add a batch of predictions to the rollups; the caller commits."""
+        await self.upsert(self.aggregate(predictions))
+
+    async def upsert(self, rows: list[dict[str, Any]]) -> None:
+        """Add pre-aggregated rows from ``aggregate`` to the rollups."""
+        if not rows:
+            return
+        dialect = self.session.bind.dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            raise RuntimeError(f"Prediction rollups are not supported on {dialect}")
+        stmt = insert(PredictionRollup)
+        table = PredictionRollup.__table__
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[c.name for c in table.primary_key],
+            set_={
+                name: table.c[name] + stmt.excluded[name]
+                for name in ("predictions", "delayed", "delay_probability_sum")
+            },
+        )
+        await self.session.execute(stmt, rows)
+
+    async def summarize(
+        self,
+        group_by: list[AnalyticsDimensionEnum],
+        bucket: AnalyticsBucketEnum | None = None,
+        filters: PredictionFilterSchema | None = None,
+        min_predictions: int = 1,
+        order_by: AnalyticsMetricEnum | None = None,
+        limit: int = 1000,
+    ) -> list[dict[str, Any]]:
+        """Totals per ``bucket`` (if given) and ``group_by`` dimensions.
+
+        Without ``order_by`` rows come oldest bucket first; with it, highest
+        value first.
+        """
+        columns = [c for d in dict.fromkeys(group_by) for c in _DIMENSIONS[d]]
+        keys: list[ColumnElement] = [PredictionRollup.__table__.c[c] for c in columns]
+        if bucket is not None:
+            keys.insert(0, self._bucket(bucket).label("bucket"))
+
+        predictions = func.sum(PredictionRollup.predictions)
+        delayed = func.sum(PredictionRollup.delayed)
+        probability_sum = func.sum(PredictionRollup.delay_probability_sum)
+        metrics = {
+            AnalyticsMetricEnum.PREDICTIONS: predictions,
+            AnalyticsMetricEnum.DELAY_RATE: delayed * literal(1.0) / predictions,
+            AnalyticsMetricEnum.MEAN_DELAY_PROBABILITY: probability_sum / predictions,
+        }
+        stmt = select(
+            *keys,
+            predictions.label("predictions"),
+            delayed.label("delayed"),
+            probability_sum.label("delay_probability_sum"),
+        )
+        stmt = self._filter(stmt, filters).group_by(*keys)
+        if min_predictions > 1:
+            stmt = stmt.having(predictions >= min_predictions)
+        if order_by is not None:
+            stmt = stmt.order_by(metrics[order_by].desc(), *keys)
+        else:
+            stmt = stmt.order_by(*keys)
+        result = await self.read_session.execute(stmt.limit(limit))
+        return [dict(row) for row in result.mappings()]
+
+    def _bucket(self, bucket: AnalyticsBucketEnum) -> ColumnElement:
+        column = PredictionRollup.bucket
+        if bucket == AnalyticsBucketEnum.HOUR:
+            return column
+        if self.read_session.bind.dialect.name == "sqlite":
+            fmt, *modifiers = _SQLITE_BUCKETS[bucket]
+            return func.strftime(fmt, column, *modifiers)
+        # Truncate in UTC rather than the session's time zone.
+        return func.timezone("UTC", func.date_trunc(bucket.value, func.timezone("UTC", column)))
+
+    @staticmethod
+    def _filter(stmt: Select, filters: PredictionFilterSchema | None) -> Select:
+        if filters is None:
+            return stmt
+        for name in _KEY:
+            value = getattr(filters, name)
+            if value is not None:
+                stmt = stmt.where(PredictionRollup.__table__.c[name] == value)
+        # Rollups are hourly, so the range is widened to whole hours.
+        if filters.created_from is not None:
+            stmt = stmt.where(PredictionRollup.bucket >= hour_floor(filters.created_from))
+        if filters.created_to is not None:
+            stmt = stmt.where(PredictionRollup.bucket < filters.created_to)
+        return stmt
+
+
+class RollupBuffer:
+    """Merges rollup totals in memory and upserts them every ``flush_interval_ms``.
+
+    Used for predictions saved one request at a time, so the hot
+    per-hour rollup rows are locked once per flush rather than in every
+    insert transaction. Totals still buffered when the process dies are
+    lost, as with the write-behind writer.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        flush_interval_ms: float = 1000.0,
+    ) -> None:
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval_ms / 1000
+        self._totals: dict[tuple, list] = defaultdict(lambda: [0, 0, 0.0])
+        self._task: asyncio.Task | None = None
+
+        self.flushes = 0
+        self.failures = 0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="rollup-buffer")
+
+    def record(self, predictions: Iterable[Prediction | Mapping[str, Any]]) -> None:
+        _accumulate(self._totals, predictions)
+
+    async def close(self) -> None:
+        """Stop the flush loop and write what is still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        if not self._totals:
+            return
+        totals, self._totals = self._totals, defaultdict(lambda: [0, 0, 0.0])
+        try:
+            async with self.session_factory() as session:
+                await RollupDAO(session).upsert(RollupDAO._rows(totals))
+                await session.commit()
+        except Exception as e:
+            # Keep the totals for the next flush instead of losing them.
+            for key, (n, delayed, probability_sum) in totals.items():
+                total = self._totals[key]
+                total[0] += n
+                total[1] += delayed
+                total[2] += probability_sum
+            self.failures += 1
+            logger.error(f"Failed to flush {len(totals)} rollup rows: {e}")
+            return
+        self.flushes += 1
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
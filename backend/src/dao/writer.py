@@ -0,0 +1,151 @@
+import asyncio
+import logging
+import time
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.models import Prediction
+from src.dao.predictions import PredictionDAO
+from src.services import metrics
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = [column.key for column in Prediction.__table__.columns]
+
+
+def _as_row(prediction: Prediction | dict[str, Any]) -> dict[str, Any]:
+    if isinstance(prediction, dict):
+        return prediction
+    return {c: getattr(prediction, c) for c in _COLUMNS}
+
+
+class PredictionWriter:
+    """Write-behind sink that persists predictions in bulk off the request path.
+
+    Rows are flushed once ``batch_size`` are buffered or ``flush_interval_ms``
+    has passed since the first one. ``put`` blocks while ``max_buffer`` rows
+    are waiting, which pushes back on callers instead of growing memory.
+    A failed flush is retried ``max_retries`` times, ``retry_backoff_ms``
+    apart and doubling, before the batch is dropped and counted in
+    ``prediction_writer_dropped_total``. Rows are ``Prediction`` objects or
+    dicts that already hold every column.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        batch_size: int = 500,
+        flush_interval_ms: float = 100.0,
+        max_buffer: int = 10_000,
+        use_copy: bool = False,
+        max_retries: int = 3,
+        retry_backoff_ms: float = 200.0,
+    ) -> None:
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.use_copy = use_copy
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff_ms / 1000
+        self._queue: asyncio.Queue[Prediction | dict[str, Any]] = asyncio.Queue(maxsize=max_buffer)
+        self._task: asyncio.Task | None = None
+        self._closed = False
+
+        self.written = 0
+        self.dropped = 0
+        self.retries = 0
+        self.flushes = 0
+        self.flush_time_total = 0.0
+        self.flush_time_max = 0.0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="prediction-writer")
+
+    async def put(self, prediction: Prediction | dict[str, Any]) -> None:
+        if self._closed:
+            raise RuntimeError("Prediction writer is closed")
+        await self._queue.put(prediction)
+
+    async def put_many(self, predictions: list[Prediction] | list[dict[str, Any]]) -> None:
+        for prediction in predictions:
+            await self.put(prediction)
+
+    async def close(self) -> None:
+        """Stop accepting rows and flush everything still buffered."""
+        self._closed = True
+        if self._task is None:
+            return
+        await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info(f"Prediction writer closed after {self.written} rows")
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0 or self._closed:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except TimeoutError:
+                    break
+            try:
+                await self._flush(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _flush(self, batch: list[Prediction | dict[str, Any]]) -> None:
+        start = time.perf_counter()
+        rows = [_as_row(p) for p in batch]
+        attempt = 0
+        while True:
+            try:
+                async with self.session_factory() as session:
+                    await PredictionDAO(session).bulk_insert(rows, use_copy=self.use_copy)
+                break
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    self.dropped += len(batch)
+                    metrics.WRITER_DROPPED.inc(len(batch))
+                    logger.error(
+                        f"Failed to persist {len(batch)} predictions after {attempt + 1} attempts: {e}"
+                    )
+                    return
+                delay = self.retry_backoff * 2**attempt
+                attempt += 1
+                self.retries += 1
+                metrics.WRITER_RETRIES.inc()
+                logger.warning(f"Failed to persist {len(batch)} predictions, retrying in {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
+        elapsed = time.perf_counter() - start
+        self.written += len(batch)
+        self.flushes += 1
+        self.flush_time_total += elapsed
+        self.flush_time_max = max(self.flush_time_max, elapsed)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "buffered": self._queue.qsize(),
+            "max_buffer": self._queue.maxsize,
+            "written": self.written,
+            "dropped": self.dropped,
+            "retries": self.retries,
+            "flushes": self.flushes,
+            "mean_flush_size": self.written / self.flushes if self.flushes else 0.0,
+            "mean_flush_ms": self.flush_time_total / self.flushes * 1000 if self.flushes else 0.0,
+            "max_flush_ms": self.flush_time_max * 1000,
+        }
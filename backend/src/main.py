@@ -1,14 +1,28 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import CONTENT_TYPE_LATEST
 
+from src.api.dependencies import AgentsDep
 from src.api.router import router
 from src.core.config import settings
 from src.core.db_helper import db_helper
-from src.utils import agents_setup
+from src.core.schemas.agents import ModelReadinessSchema, ReadinessResponse
+from src.dao.rollups import RollupBuffer
+from src.dao.writer import PredictionWriter
+from src.services.cache import PredictionCache
+from src.services.counting import PredictionCounter
+from src.services import metrics
+from src.services.inference import InferenceExecutor
+from src.services.partitions import PartitionManager
+from src.services.profiling import ProfilingMiddleware, RequestProfiler
+from src.services.reload import ModelReloader
+from src.services.score_index import load_score_index
+from src.utils import agents_setup, batchers_setup
 
 logger = logging.getLogger(__name__)
 
@@ -17,11 +31,97 @@ logging.basicConfig(level=logging.INFO)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    
+    app.state.ready = False
     app.state.agents = agents_setup()
-    
+    app.state.executor = InferenceExecutor(
+        app.state.agents,
+        kind=settings.ml.inference_executor,
+        pool_size=settings.ml.inference_pool_size,
+        max_pending=settings.ml.inference_max_pending,
+    )
+    app.state.batchers = batchers_setup(app.state.agents, app.state.executor)
+    app.state.prediction_cache = (
+        PredictionCache(
+            max_entries=settings.ml.cache_max_entries,
+            ttl_seconds=settings.ml.cache_ttl_seconds,
+        )
+        if settings.ml.cache_enabled
+        else None
+    )
+    app.state.score_index = load_score_index(settings.ml.score_index_path)
+    app.state.request_profiler = RequestProfiler(
+        sample_rate=settings.app.profile_sample_rate,
+        header_enabled=settings.app.profile_header_enabled,
+        interval_ms=settings.app.profile_interval_ms,
+        capacity=settings.app.profile_buffer_size,
+        max_concurrent=settings.app.profile_max_concurrent,
+    )
+    app.state.prediction_counter = PredictionCounter(
+        mode=settings.db.history_count_mode,
+        max_age_seconds=settings.db.history_count_max_age_seconds,
+        max_entries=settings.db.history_count_max_entries,
+    )
+    app.state.partition_manager = None
+    if settings.db.partition_maintenance_enabled and db_helper.engine.dialect.name == "postgresql":
+        app.state.partition_manager = PartitionManager(
+            db_helper.session_factory,
+            months_ahead=settings.db.partition_months_ahead,
+            retention_months=settings.db.partition_retention_months,
+            retention_mode=settings.db.partition_retention_mode,
+            archive_schema=settings.db.partition_archive_schema,
+            interval_seconds=settings.db.partition_maintenance_interval_seconds,
+        )
+        # Make sure this month's partition exists before the first insert.
+        await app.state.partition_manager.run_once()
+        app.state.partition_manager.start()
+    app.state.rollup_buffer = RollupBuffer(
+        db_helper.session_factory,
+        flush_interval_ms=settings.db.rollup_flush_interval_ms,
+    )
+    app.state.rollup_buffer.start()
+    app.state.prediction_writer = None
+    if settings.db.write_behind_enabled:
+        app.state.prediction_writer = PredictionWriter(
+            db_helper.session_factory,
+            batch_size=settings.db.write_behind_batch_size,
+            flush_interval_ms=settings.db.write_behind_flush_interval_ms,
+            max_buffer=settings.db.write_behind_max_buffer,
+            use_copy=settings.db.write_behind_use_copy,
+            max_retries=settings.db.write_behind_max_retries,
+            retry_backoff_ms=settings.db.write_behind_retry_backoff_ms,
+        )
+        app.state.prediction_writer.start()
+    app.state.model_reloader = ModelReloader(
+        app.state.agents,
+        app.state.executor,
+        cache=app.state.prediction_cache,
+        watch_interval=(
+            settings.ml.reload_watch_interval_seconds
+            if settings.ml.reload_watch_enabled
+            else None
+        ),
+    )
+    for batcher in app.state.batchers.values():
+        batcher.start()
+    if settings.ml.warmup_enabled:
+        await app.state.executor.warmup()
+    app.state.model_reloader.start()
+    app.state.ready = True
+
     yield
 
+    app.state.ready = False
+    await app.state.model_reloader.stop()
+
+    for batcher in app.state.batchers.values():
+        await batcher.stop()
+    # Joining the pool blocks until running inference finishes.
+    await asyncio.to_thread(app.state.executor.shutdown)
+    if app.state.prediction_writer is not None:
+        await app.state.prediction_writer.close()
+    await app.state.rollup_buffer.close()
+    if app.state.partition_manager is not None:
+        await app.state.partition_manager.stop()
     await db_helper.dispose()
 
 
@@ -37,7 +137,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count"],
 )
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(metrics.MetricsMiddleware)
 
 app.include_router(router)
 
@@ -47,6 +150,23 @@ async def health():
     return {"status": "ok"}
 
 
+@app.get("/ready", tags=["health"], response_model=ReadinessResponse)
+async def ready(request: Request, agents: AgentsDep):
+    """Ready once every eagerly loaded model has finished warming up."""
+    models = [ModelReadinessSchema(name=name, **agent.status()) for name, agent in agents.items()]
+    warm = not settings.ml.warmup_enabled or all(
+        m.warmed_up or m.lazy or not m.is_loaded for m in models
+    )
+    is_ready = request.app.state.ready and warm and any(m.is_loaded or m.lazy for m in models)
+    content = ReadinessResponse(ready=is_ready, models=models)
+    return JSONResponse(status_code=200 if is_ready else 503, content=content.model_dump())
+
+
+@app.get("/metrics", tags=["health"], include_in_schema=False)
+async def prometheus_metrics():
+    return Response(content=metrics.render(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.exception_handler(ValueError)
 async def value_error_handler(request: Request, exc: ValueError):
     return JSONResponse(status_code=400, content={"error": str(exc)})
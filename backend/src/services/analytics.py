@@ -0,0 +1,53 @@
+from typing import Any
+
+from src.core.enums import AnalyticsBucketEnum, AnalyticsDimensionEnum, AnalyticsMetricEnum
+from src.core.schemas.analytics import DelayRateSchema
+from src.core.schemas.predictions import PredictionFilterSchema
+from src.dao.rollups import RollupDAO
+
+
+class AnalyticsService:
+    """Delay-rate aggregates served from the hourly prediction rollups."""
+
+    def __init__(self, dao: RollupDAO) -> None:
+        self.dao = dao
+
+    async def delay_rates(
+        self,
+        bucket: AnalyticsBucketEnum,
+        group_by: list[AnalyticsDimensionEnum],
+        filters: PredictionFilterSchema | None = None,
+        limit: int = 1000,
+    ) -> list[DelayRateSchema]:
+        rows = await self.dao.summarize(group_by, bucket=bucket, filters=filters, limit=limit)
+        return [self._to_schema(row) for row in rows]
+
+    async def ranking(
+        self,
+        group_by: list[AnalyticsDimensionEnum],
+        order_by: AnalyticsMetricEnum,
+        filters: PredictionFilterSchema | None = None,
+        min_predictions: int = 1,
+        limit: int = 50,
+    ) -> list[DelayRateSchema]:
+        if not group_by:
+            raise ValueError("Ranking needs at least one group_by dimension")
+        rows = await self.dao.summarize(
+            group_by,
+            filters=filters,
+            min_predictions=min_predictions,
+            order_by=order_by,
+            limit=limit,
+        )
+        return [self._to_schema(row) for row in rows]
+
+    @staticmethod
+    def _to_schema(row: dict[str, Any]) -> DelayRateSchema:
+        n = row.pop("predictions")
+        probability_sum = row.pop("delay_probability_sum")
+        return DelayRateSchema(
+            **row,
+            predictions=n,
+            delay_rate=row["delayed"] / n,
+            mean_delay_probability=probability_sum / n,
+        )
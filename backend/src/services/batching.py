@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import time
+from typing import Any
+
+from src.services.inference import InferenceExecutor
+
+logger = logging.getLogger(__name__)
+
+_Pending = tuple[dict[str, Any], asyncio.Future, float]
+
+
+class MicroBatcher:
+    """Coalesces concurrent single-row predictions into one ``predict_batch`` call.
+
+    A batch is flushed as soon as ``max_batch_size`` requests are queued or
+    ``max_wait_ms`` has passed since the first one arrived, whichever comes first.
+    Flushes run as concurrent tasks, each holding one of the executor's
+    admission slots, so batches of one model overlap on a larger pool. While
+    no slot is free, requests keep queueing and the next batch grows.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        executor: InferenceExecutor,
+        max_batch_size: int,
+        max_wait_ms: float,
+    ) -> None:
+        self.model_name = model_name
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: asyncio.Queue[_Pending] = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+        # The batch being collected, and the batches being scored.
+        self._collecting: list[_Pending] = []
+        self._flushing: dict[asyncio.Task, list[_Pending]] = {}
+
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name=f"microbatcher:{self.model_name}")
+
+    async def stop(self) -> None:
+        """Cancel collection and in-flight batches; their callers get an error."""
+        if self._task is None:
+            return
+        # Finished flushes drop out of _flushing, so take the batches first.
+        in_flight = [item for batch in self._flushing.values() for item in batch]
+        tasks = [self._task, *self._flushing]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+
+        pending = [*self._collecting, *in_flight]
+        self._collecting = []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for _, future, _ in pending:
+            if not future.done():
+                future.set_exception(RuntimeError(f"Model '{self.model_name}' is shutting down"))
+
+    async def submit(self, data: dict[str, Any]) -> dict[str, Any]:
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((data, future, time.perf_counter()))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._collecting = batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except TimeoutError:
+                    break
+            await self.executor.reserve()
+            # Requests that arrived while waiting for a slot join this batch.
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            self._collecting = []
+            task = asyncio.create_task(self._flush(batch))
+            self._flushing[task] = batch
+            task.add_done_callback(lambda done: self._flushing.pop(done, None))
+
+    async def _flush(self, batch: list[_Pending]) -> None:
+        """Score ``batch`` with the admission slot reserved by ``_run``."""
+        batch = [item for item in batch if not item[1].cancelled()]
+        if not batch:
+            self.executor.release()
+            return
+
+        now = time.perf_counter()
+        for _, _, enqueued in batch:
+            wait = now - enqueued
+            self.queue_wait_total += wait
+            self.queue_wait_max = max(self.queue_wait_max, wait)
+        self.batches += 1
+        self.items += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+
+        try:
+            results = await self.executor.predict_batch(
+                self.model_name, [data for data, _, _ in batch], reserved=True
+            )
+        except Exception as e:
+            logger.error(f"Batch of {len(batch)} failed on {self.model_name}: {e}")
+            results = [e] * len(batch)
+
+        for (_, future, _), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "queue_depth": self._queue.qsize(),
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+            "max_batch_size": self.largest_batch,
+            "mean_queue_wait_ms": self.queue_wait_total / self.items * 1000 if self.items else 0.0,
+            "max_queue_wait_ms": self.queue_wait_max * 1000,
+        }
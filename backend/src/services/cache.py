@@ -0,0 +1,125 @@
+import asyncio
+import functools
+import sys
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+_CacheKey = tuple[str, Hashable]
+
+
+def _entry_size(key: _CacheKey, value: dict[str, Any]) -> int:
+    size = sys.getsizeof(key) + sys.getsizeof(key[1]) + sys.getsizeof(value)
+    if isinstance(key[1], tuple):
+        size += sum(sys.getsizeof(item) for item in key[1])
+    return size + sum(sys.getsizeof(v) for v in value.values())
+
+
+class PredictionCache:
+    """Bounded LRU + TTL cache of agent results keyed on (model_name, features).
+
+    Concurrent misses for the same key and model version share a single
+    computation. Entries of a model are dropped as soon as it is seen with a
+    different artifact version, and results computed by the old version are
+    not stored, so a retrained model never serves stale results.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self._entries: OrderedDict[_CacheKey, tuple[float, int, dict[str, Any]]] = OrderedDict()
+        self._inflight: dict[tuple[_CacheKey, str | None], asyncio.Task] = {}
+        self._versions: dict[str, str | None] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.bytes = 0
+
+    async def get_or_compute(
+        self,
+        model_name: str,
+        version: str | None,
+        features: Hashable,
+        compute: Callable[[], Awaitable[dict[str, Any]]],
+    ) -> dict[str, Any]:
+        if self._versions.get(model_name, version) != version:
+            self.invalidate(model_name)
+        self._versions[model_name] = version
+
+        key = (model_name, features)
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires, _, value = entry
+            if expires > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self._remove(key)
+            self.expirations += 1
+
+        # The computation runs in its own task so that a cancelled caller
+        # (e.g. a disconnected client) does not cancel the others waiting on it.
+        task = self._inflight.get((key, version))
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.create_task(compute())
+            task.add_done_callback(functools.partial(self._settle, key, version))
+            self._inflight[key, version] = task
+        return await asyncio.shield(task)
+
+    def _settle(self, key: _CacheKey, version: str | None, task: asyncio.Task) -> None:
+        if self._inflight.get((key, version)) is task:
+            del self._inflight[key, version]
+        if task.cancelled() or task.exception() is not None:
+            return
+        # The model was reloaded while this ran; the result is the old version's.
+        if self._versions.get(key[0]) != version:
+            return
+        self._put(key, task.result())
+
+    def invalidate(self, model_name: str | None = None) -> None:
+        keys = [k for k in self._entries if model_name is None or k[0] == model_name]
+        for key in keys:
+            self._remove(key)
+        self.invalidations += len(keys)
+
+    def _put(self, key: _CacheKey, value: dict[str, Any]) -> None:
+        if self.max_entries <= 0:
+            return
+        if key in self._entries:
+            self._remove(key)
+        size = _entry_size(key, value)
+        self._entries[key] = (time.monotonic() + self.ttl, size, value)
+        self.bytes += size
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: _CacheKey) -> None:
+        _, size, _ = self._entries.pop(key)
+        self.bytes -= size
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "in_flight": len(self._inflight),
+            "memory_bytes": self.bytes,
+        }
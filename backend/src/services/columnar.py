@@ -0,0 +1,297 @@
+"""Columnar request and response bodies for large scoring batches.
+
+A request carries one array per ``FlightPredictionRequestSchema`` field, as
+an Arrow IPC stream, a MessagePack map of arrays or a JSON object of arrays.
+Columns are checked with vectorized comparisons against the bounds declared
+on the schema's fields, so no per-row model objects are built. Responses use
+the same column layout and are written with pyarrow, msgpack or orjson.
+"""
+import json
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from pydantic import BaseModel
+
+from src.core.enums import ColumnarFormatEnum
+from src.core.schemas.predictions import FlightPredictionRequestSchema
+
+MEDIA_TYPES = {
+    ColumnarFormatEnum.ARROW: "application/vnd.apache.arrow.stream",
+    ColumnarFormatEnum.MSGPACK: "application/msgpack",
+    ColumnarFormatEnum.JSON: "application/json",
+}
+_FORMATS = {
+    **{media_type: fmt for fmt, media_type in MEDIA_TYPES.items()},
+    "application/x-msgpack": ColumnarFormatEnum.MSGPACK,
+    "application/vnd.msgpack": ColumnarFormatEnum.MSGPACK,
+}
+_BOUNDS = ("ge", "gt", "le", "lt", "min_length", "max_length")
+
+
+@dataclass(frozen=True)
+class ColumnSpec:
+    name: str
+    kind: type
+    ge: Any = None
+    gt: Any = None
+    le: Any = None
+    lt: Any = None
+    min_length: int | None = None
+    max_length: int | None = None
+
+
+def column_specs(schema: type[BaseModel]) -> list[ColumnSpec]:
+    """One spec per field, with the bounds from its ``Field(...)`` constraints."""
+    specs = []
+    for name, field in schema.model_fields.items():
+        bounds = {
+            attr: getattr(constraint, attr)
+            for constraint in field.metadata
+            for attr in _BOUNDS
+            if hasattr(constraint, attr)
+        }
+        specs.append(ColumnSpec(name, field.annotation, **bounds))
+    return specs
+
+
+REQUEST_COLUMNS = column_specs(FlightPredictionRequestSchema)
+
+
+def format_for(media_type: str | None) -> ColumnarFormatEnum | None:
+    if not media_type:
+        return None
+    return _FORMATS.get(media_type.split(";")[0].strip().lower())
+
+
+def accepted_format(accept: str | None, default: ColumnarFormatEnum) -> ColumnarFormatEnum:
+    """First supported media type in ``Accept``, else the request's own format."""
+    for part in (accept or "").split(","):
+        fmt = format_for(part)
+        if fmt is not None:
+            return fmt
+    return default
+
+
+def _require(module: str) -> Any:
+    try:
+        return __import__(module)
+    except ImportError:
+        raise RuntimeError(f"This columnar format requires the '{module}' package") from None
+
+
+def read_columns(body: bytes, fmt: ColumnarFormatEnum) -> dict[str, Any]:
+    module = {ColumnarFormatEnum.ARROW: "pyarrow", ColumnarFormatEnum.MSGPACK: "msgpack"}
+    if fmt in module:
+        _require(module[fmt])
+    try:
+        if fmt == ColumnarFormatEnum.ARROW:
+            import pyarrow as pa
+
+            columns = pa.ipc.open_stream(body).read_all()
+        elif fmt == ColumnarFormatEnum.MSGPACK:
+            import msgpack
+
+            columns = msgpack.unpackb(body)
+        else:
+            try:
+                import orjson
+            except ImportError:
+                columns = json.loads(body)
+            else:
+                columns = orjson.loads(body)
+    except Exception as e:
+        raise ValueError(f"Malformed {fmt.value} payload: {e}") from None
+
+    if fmt == ColumnarFormatEnum.ARROW:
+        table, columns = columns, {}
+        for name in table.column_names:
+            column = table.column(name)
+            if column.null_count:
+                raise ValueError(f"Column '{name}' contains nulls")
+            columns[name] = column.to_numpy()
+    if not isinstance(columns, Mapping):
+        raise ValueError(f"Expected a {fmt.value} map of column arrays")
+    return dict(columns)
+
+
+def _describe(spec: ColumnSpec) -> str:
+    if spec.kind is str:
+        return f"length {spec.min_length}..{spec.max_length}"
+    low = f">= {spec.ge}" if spec.ge is not None else f"> {spec.gt}" if spec.gt is not None else ""
+    high = f"<= {spec.le}" if spec.le is not None else f"< {spec.lt}" if spec.lt is not None else ""
+    return " and ".join(b for b in (low, high) if b)
+
+
+def _out_of_bounds(spec: ColumnSpec, subject: np.ndarray) -> np.ndarray:
+    bad = np.zeros(len(subject), dtype=bool)
+    for bound, op in (
+        (spec.ge, np.less), (spec.gt, np.less_equal),
+        (spec.le, np.greater), (spec.lt, np.greater_equal),
+        (spec.min_length, np.less), (spec.max_length, np.greater),
+    ):
+        if bound is not None:
+            bad |= op(subject, bound)
+    return bad
+
+
+def _as_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _check_rows(spec: ColumnSpec, raw: Any) -> tuple[np.ndarray, np.ndarray, str]:
+    """Like ``_check``, but returns a mask of failing rows instead of raising."""
+    values = np.asarray(raw)
+    if spec.kind is int:
+        if values.dtype.kind in "iuf":
+            numbers = values.astype(np.float64)
+        else:
+            numbers = np.fromiter((_as_float(v) for v in values), np.float64, count=len(values))
+        invalid = ~np.isfinite(numbers) | (numbers != np.floor(numbers))
+        numbers[invalid] = 0
+        values = numbers.astype(np.int64)
+        subject, expected = values, "an integer"
+    else:
+        invalid = np.fromiter((not isinstance(v, str) for v in values), bool, count=len(values))
+        values = np.where(invalid, "", values).astype(str)
+        subject, expected = np.char.str_len(values), "a string of"
+    return values, invalid | _out_of_bounds(spec, subject), expected
+
+
+def check_rows(columns: Mapping[str, Any]) -> tuple[dict[str, np.ndarray], list[str | None]]:
+    """Request columns checked row by row, for files that may hold bad rows.
+
+    Missing values (NaN, None), wrong types and out-of-bounds values mark
+    the row with a reason instead of rejecting the whole batch. Values of
+    marked rows in the returned columns are placeholders.
+    """
+    missing = [spec.name for spec in REQUEST_COLUMNS if spec.name not in columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+    n = len(columns[REQUEST_COLUMNS[0].name])
+    checked: dict[str, np.ndarray] = {}
+    errors: list[str | None] = [None] * n
+    for spec in REQUEST_COLUMNS:
+        checked[spec.name], bad, expected = _check_rows(spec, columns[spec.name])
+        if not bad.any():
+            continue
+        raw = np.asarray(columns[spec.name]).tolist()
+        for i in np.flatnonzero(bad):
+            if errors[i] is None:
+                errors[i] = f"{spec.name}: {raw[i]!r} must be {expected} {_describe(spec)}"
+    return checked, errors
+
+
+def _check(spec: ColumnSpec, raw: Any) -> tuple[np.ndarray, str | None]:
+    values = np.asarray(raw)
+    if values.ndim != 1:
+        raise ValueError(f"Column '{spec.name}' must be a flat array")
+    if spec.kind is int:
+        if values.dtype.kind not in "iu":
+            raise ValueError(f"Column '{spec.name}' must contain integers")
+        values = values.astype(np.int64, copy=False)
+        subject = values
+    else:
+        if values.dtype.kind == "O" and not all(isinstance(v, str) for v in values):
+            raise ValueError(f"Column '{spec.name}' must contain strings")
+        if values.dtype.kind not in "UO":
+            raise ValueError(f"Column '{spec.name}' must contain strings")
+        values = values.astype(str, copy=False)
+        subject = np.char.str_len(values)
+
+    bad = _out_of_bounds(spec, subject)
+    if not bad.any():
+        return values, None
+    rows = np.flatnonzero(bad)
+    return values, (
+        f"{spec.name}: {len(rows)} value(s) outside {_describe(spec)} "
+        f"(first at row {rows[0]}: {values[rows[0]].item()!r})"
+    )
+
+
+def validate_columns(columns: Mapping[str, Any], max_rows: int) -> dict[str, np.ndarray]:
+    """Typed, bounds-checked request columns; ``ValueError`` lists every failing column."""
+    missing = [spec.name for spec in REQUEST_COLUMNS if spec.name not in columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+    scalars = [
+        spec.name
+        for spec in REQUEST_COLUMNS
+        if not isinstance(columns[spec.name], (list, tuple, np.ndarray))
+    ]
+    if scalars:
+        raise ValueError(f"Columns must be arrays: {', '.join(scalars)}")
+    lengths = {len(columns[spec.name]) for spec in REQUEST_COLUMNS}
+    if len(lengths) != 1:
+        raise ValueError("All columns must have the same length")
+    n = lengths.pop()
+    if not 0 < n <= max_rows:
+        raise ValueError(f"Expected 1 to {max_rows} rows, got {n}")
+
+    checked, errors = {}, []
+    for spec in REQUEST_COLUMNS:
+        checked[spec.name], error = _check(spec, columns[spec.name])
+        if error:
+            errors.append(error)
+    if errors:
+        raise ValueError("; ".join(errors))
+    return checked
+
+
+def write_columns(result: Mapping[str, Any], fmt: ColumnarFormatEnum) -> bytes:
+    """Serialize a ``PredictionService.predict_columns`` result.
+
+    Per-row values are arrays; ``error`` holds ``None`` for scored rows and
+    the reason for the rest, whose probabilities are NaN. Scalars
+    (``model_used``, ``model_version``, ``created_at``) become schema
+    metadata in Arrow and top-level keys otherwise.
+    """
+    errors = result["error"]
+    failed = np.array([e is not None for e in errors], dtype=bool)
+    if fmt == ColumnarFormatEnum.ARROW:
+        _require("pyarrow")
+        import pyarrow as pa
+
+        batch = pa.record_batch(
+            {
+                "prediction_id": pa.array(result["prediction_id"], type=pa.string()),
+                "delayed": pa.array(result["delayed"], mask=failed),
+                "delay_probability": pa.array(result["delay_probability"], mask=failed),
+                "no_delay_probability": pa.array(result["no_delay_probability"], mask=failed),
+                "error": pa.array(errors, type=pa.string()),
+            },
+            metadata={
+                "model_used": result["model_used"],
+                "model_version": result["model_version"] or "",
+                "created_at": result["created_at"],
+            },
+        )
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, batch.schema) as writer:
+            writer.write_batch(batch)
+        return sink.getvalue().to_pybytes()
+
+    body = dict(result)
+    if failed.any():
+        for key in ("delayed", "delay_probability", "no_delay_probability"):
+            values = body[key].astype(object)
+            values[failed] = None
+            body[key] = values
+    if fmt == ColumnarFormatEnum.MSGPACK:
+        return _require("msgpack").packb(_as_lists(body))
+    try:
+        import orjson
+    except ImportError:
+        return json.dumps(_as_lists(body)).encode()
+    if not failed.any():
+        return orjson.dumps(body, option=orjson.OPT_SERIALIZE_NUMPY)
+    # Failed rows make object arrays, which OPT_SERIALIZE_NUMPY rejects.
+    return orjson.dumps(_as_lists(body))
+
+
+def _as_lists(body: Mapping[str, Any]) -> dict[str, Any]:
+    return {k: v.tolist() if isinstance(v, np.ndarray) else v for k, v in body.items()}
@@ -0,0 +1,84 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+from src.core.schemas.predictions import PredictionFilterSchema
+from src.dao.predictions import PredictionDAO
+
+
+class PredictionCounter:
+    """Serves history totals without counting the table on every request.
+
+    Unfiltered totals come from the planner estimate in ``estimate`` mode
+    (exact ``count`` otherwise). Any total is reused for ``max_age_seconds``,
+    and inserts made by this process are added to the cached unfiltered
+    total in the meantime. At most ``max_entries`` filter combinations are
+    kept, least recently used first out. Concurrent requests for the same
+    filters wait for one count; different filters count in parallel.
+    """
+
+    def __init__(
+        self, mode: str = "estimate", max_age_seconds: float = 30.0, max_entries: int = 1024
+    ) -> None:
+        self.mode = mode
+        self.max_age = max_age_seconds
+        self.max_entries = max_entries
+        self._totals: OrderedDict[str, tuple[float, int]] = OrderedDict()
+        # Per-key lock and the number of requests holding or waiting on it.
+        self._locks: dict[str, tuple[asyncio.Lock, int]] = {}
+
+    async def total(self, dao: PredictionDAO, filters: PredictionFilterSchema | None) -> int:
+        key = self._key(filters)
+        cached = self._fresh(key)
+        if cached is not None:
+            return cached
+
+        lock, users = self._locks.get(key) or (asyncio.Lock(), 0)
+        self._locks[key] = (lock, users + 1)
+        try:
+            async with lock:
+                cached = self._fresh(key)
+                if cached is not None:
+                    return cached
+
+                value = None
+                if self.mode == "estimate" and not key:
+                    value = await dao.estimate_count()
+                if value is None:
+                    value = await dao.count(filters)
+                self._store(key, value)
+                return value
+        finally:
+            lock, users = self._locks[key]
+            if users == 1:
+                del self._locks[key]
+            else:
+                self._locks[key] = (lock, users - 1)
+
+    def record_inserts(self, n: int) -> None:
+        cached = self._totals.get("")
+        if cached is not None:
+            self._totals[""] = (cached[0], cached[1] + n)
+
+    def _fresh(self, key: str) -> int | None:
+        cached = self._totals.get(key)
+        if cached is None:
+            return None
+        if time.monotonic() - cached[0] >= self.max_age:
+            del self._totals[key]
+            return None
+        self._totals.move_to_end(key)
+        return cached[1]
+
+    def _store(self, key: str, value: int) -> None:
+        self._totals[key] = (time.monotonic(), value)
+        self._totals.move_to_end(key)
+        while len(self._totals) > self.max_entries:
+            self._totals.popitem(last=False)
+
+    @staticmethod
+    def _key(filters: PredictionFilterSchema | None) -> str:
+        if filters is None:
+            return ""
+        key = filters.model_dump_json(exclude_none=True)
+        return "" if key == "{}" else key
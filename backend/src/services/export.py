@@ -0,0 +1,153 @@
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Boolean, DateTime, Float, Integer, Row, String, Uuid
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.enums import ExportFormatEnum
+from src.core.models import Prediction
+from src.core.schemas.predictions import PredictionFilterSchema
+from src.dao.predictions import PredictionDAO
+
+COLUMNS = [column.key for column in Prediction.__table__.columns]
+
+MEDIA_TYPES = {
+    ExportFormatEnum.NDJSON: "application/x-ndjson",
+    ExportFormatEnum.CSV: "text/csv",
+    ExportFormatEnum.PARQUET: "application/vnd.apache.parquet",
+}
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only stream that hands written bytes back chunk by chunk."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ExportService:
+    """Streams prediction history with memory bounded by ``chunk_size`` rows."""
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        self.session_factory = session_factory
+
+    def export(
+        self,
+        fmt: ExportFormatEnum,
+        filters: PredictionFilterSchema | None = None,
+        chunk_size: int = 5000,
+    ) -> AsyncIterator[bytes]:
+        if fmt == ExportFormatEnum.NDJSON:
+            return self._ndjson(filters, chunk_size)
+        if fmt == ExportFormatEnum.CSV:
+            return self._csv(filters, chunk_size)
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise RuntimeError("Parquet export requires the 'pyarrow' package") from None
+        return self._parquet(filters, chunk_size)
+
+    async def _chunks(
+        self, filters: PredictionFilterSchema | None, chunk_size: int
+    ) -> AsyncIterator[Sequence[Row]]:
+        async with self.session_factory() as session:
+            async for chunk in PredictionDAO(session).stream(filters, chunk_size):
+                yield chunk
+
+    async def _ndjson(
+        self, filters: PredictionFilterSchema | None, chunk_size: int
+    ) -> AsyncIterator[bytes]:
+        async for chunk in self._chunks(filters, chunk_size):
+            lines = [
+                json.dumps(dict(zip(COLUMNS, row)), default=_json_default) for row in chunk
+            ]
+            yield ("\n".join(lines) + "\n").encode()
+
+    async def _csv(
+        self, filters: PredictionFilterSchema | None, chunk_size: int
+    ) -> AsyncIterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(COLUMNS)
+        async for chunk in self._chunks(filters, chunk_size):
+            writer.writerows(chunk)
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+
+    async def _parquet(
+        self, filters: PredictionFilterSchema | None, chunk_size: int
+    ) -> AsyncIterator[bytes]:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = _arrow_schema()
+        sink = _ChunkSink()
+        with pq.ParquetWriter(sink, schema) as writer:
+            async for chunk in self._chunks(filters, chunk_size):
+                columns = list(zip(*chunk))
+                arrays = [
+                    pa.array(
+                        [None if v is None else str(v) for v in values]
+                        if pa.types.is_string(field.type)
+                        else values,
+                        type=field.type,
+                    )
+                    for field, values in zip(schema, columns)
+                ]
+                writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+                yield sink.drain()
+        yield sink.drain()
+
+
+def _arrow_schema():
+    import pyarrow as pa
+
+    def arrow_type(column):
+        if isinstance(column.type, Boolean):
+            return pa.bool_()
+        if isinstance(column.type, Integer):
+            return pa.int32()
+        if isinstance(column.type, Float):
+            return pa.float64()
+        if isinstance(column.type, DateTime):
+            return pa.timestamp("us", tz="UTC")
+        if isinstance(column.type, (String, Uuid)):
+            return pa.string()
+        raise TypeError(f"No Arrow type for column {column.key} ({column.type})")
+
+    return pa.schema(
+        [
+            pa.field(column.key, arrow_type(column), nullable=column.nullable)
+            for column in Prediction.__table__.columns
+        ]
+    )
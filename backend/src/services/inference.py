@@ -0,0 +1,243 @@
+import asyncio
+import logging
+import multiprocessing
+import time
+from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any
+
+from src.agents.base import BaseMLAgent
+from src.agents.categories import CategoryIndex
+from src.agents.features import FeatureBatch
+from src.services import metrics
+
+logger = logging.getLogger(__name__)
+
+BatchResults = list[dict[str, Any] | Exception]
+
+# Agents owned by a process-pool worker, loaded once by ``init_worker``.
+_worker_agents: dict[str, BaseMLAgent] = {}
+# Category lookups and unknowns per feature counted in a worker since its
+# last result; the parent adds them to its metrics.
+_worker_categories: defaultdict[str, list[int]] = defaultdict(lambda: [0, 0])
+
+
+def worker_agent(model_name: str) -> BaseMLAgent | None:
+    """Agent loaded by ``init_worker``, for functions running in a pool worker."""
+    return _worker_agents.get(model_name)
+
+
+def _count_worker_categories(feature: str, lookups: int, unknown: int) -> None:
+    counts = _worker_categories[feature]
+    counts[0] += lookups
+    counts[1] += unknown
+
+
+def init_worker() -> None:
+    from src.utils import agents_setup
+
+    # Workers have no /metrics of their own; report to the parent instead.
+    CategoryIndex.listeners[:] = [_count_worker_categories]
+    _worker_agents.update(agents_setup())
+
+
+def _timed_call(
+    agents: dict[str, BaseMLAgent], model_name: str, method: str, payload: Any
+) -> tuple[BatchResults, float, dict[str, float]]:
+    """Returns the results, the total seconds and the agent's per-stage seconds."""
+    start = time.perf_counter()
+    agent = agents.get(model_name)
+    if agent is None:
+        raise RuntimeError(f"Model '{model_name}' is not available in the inference worker")
+    agent.ensure_loaded()
+    timings: dict[str, float] = {}
+    results = getattr(agent, method)(payload, timings)
+    return results, time.perf_counter() - start, timings
+
+
+def _worker_call(
+    model_name: str, method: str, payload: Any
+) -> tuple[BatchResults, float, dict[str, float], dict[str, tuple[int, int]]]:
+    """``_timed_call`` plus the worker's category counts since its last call."""
+    result = _timed_call(_worker_agents, model_name, method, payload)
+    categories = {feature: tuple(counts) for feature, counts in _worker_categories.items()}
+    _worker_categories.clear()
+    return *result, categories
+
+
+def _worker_warmup() -> dict[str, float]:
+    return {
+        name: agent.warmup_ms if agent.warmed_up else agent.warmup()
+        for name, agent in _worker_agents.items()
+        if agent.is_loaded()
+    }
+
+
+class InferenceExecutor:
+    """Runs blocking model inference off the event loop.
+
+    ``thread`` suits predictors that release the GIL (CatBoost, LightGBM);
+    ``process`` gives every worker its own preloaded copy of the agents.
+    At most ``pool_size + max_pending`` calls are admitted at once, the rest
+    wait on the event loop.
+    """
+
+    def __init__(
+        self,
+        agents: dict[str, BaseMLAgent],
+        kind: str = "thread",
+        pool_size: int = 4,
+        max_pending: int = 256,
+    ) -> None:
+        self.agents = agents
+        self.kind = kind
+        self.pool_size = pool_size
+        self._pool: Executor = self._create_pool()
+        self._slots = asyncio.Semaphore(pool_size + max_pending)
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.exec_time_total = 0.0
+        self.exec_time_max = 0.0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+
+    def _create_pool(self) -> Executor:
+        if self.kind == "process":
+            return ProcessPoolExecutor(
+                max_workers=self.pool_size,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_worker,
+            )
+        if self.kind == "thread":
+            return ThreadPoolExecutor(
+                max_workers=self.pool_size, thread_name_prefix="inference"
+            )
+        raise ValueError(f"Unknown inference executor '{self.kind}'")
+
+    async def reserve(self) -> None:
+        """Wait for an admission slot ahead of a call that passes ``reserved=True``.
+
+        The call releases the slot; ``release`` returns one that goes unused.
+        """
+        await self._slots.acquire()
+
+    def release(self) -> None:
+        self._slots.release()
+
+    async def predict_batch(
+        self, model_name: str, rows: list[dict[str, Any]], reserved: bool = False
+    ) -> BatchResults:
+        return await self._run(model_name, "predict_batch", rows, reserved)
+
+    async def predict_features(self, model_name: str, batch: FeatureBatch) -> BatchResults:
+        """Score rows that were already encoded, e.g. once for several models."""
+        return await self._run(model_name, "predict_features", batch)
+
+    async def _run(
+        self, model_name: str, method: str, payload: Any, reserved: bool = False
+    ) -> BatchResults:
+        loop = asyncio.get_running_loop()
+        self.submitted += 1
+        start = time.perf_counter()
+        if not reserved:
+            await self._slots.acquire()
+        try:
+            if self.kind == "process":
+                results, exec_time, timings, categories = await loop.run_in_executor(
+                    self._pool, _worker_call, model_name, method, payload
+                )
+                for feature, (lookups, unknown) in categories.items():
+                    metrics.count_categories(feature, lookups, unknown)
+            else:
+                results, exec_time, timings = await loop.run_in_executor(
+                    self._pool, _timed_call, self.agents, model_name, method, payload
+                )
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self._slots.release()
+
+        for stage, seconds in timings.items():
+            metrics.observe(model_name, stage, seconds)
+
+        queue_wait = time.perf_counter() - start - exec_time
+        self.completed += 1
+        self.exec_time_total += exec_time
+        self.exec_time_max = max(self.exec_time_max, exec_time)
+        self.queue_wait_total += queue_wait
+        self.queue_wait_max = max(self.queue_wait_max, queue_wait)
+        return results
+
+    async def predict(self, model_name: str, data: dict[str, Any]) -> dict[str, Any]:
+        result = (await self.predict_batch(model_name, [data]))[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def warmup(self) -> None:
+        """Run a synthetic prediction per loaded agent through the pool.
+
+        Besides the models' own first-call costs this starts the pool's
+        threads, or spawns and loads every worker process, before the
+        first real request does.
+        """
+        loop = asyncio.get_running_loop()
+        loaded = {name: agent for name, agent in self.agents.items() if agent.is_loaded()}
+        if self.kind == "process":
+            per_worker = await asyncio.gather(
+                *(loop.run_in_executor(self._pool, _worker_warmup) for _ in range(self.pool_size))
+            )
+            for name, agent in loaded.items():
+                timings = [t[name] for t in per_worker if name in t]
+                agent.warmup_ms = max(timings) if timings else None
+        else:
+            await asyncio.gather(
+                *(loop.run_in_executor(self._pool, agent.warmup) for agent in loaded.values())
+            )
+        for name, agent in loaded.items():
+            logger.info(f"{name} warmed up in {agent.warmup_ms or 0:.1f} ms")
+
+    async def replace_pool(self) -> None:
+        """Start and warm a fresh process pool, then retire the old one.
+
+        Workers load artifacts from disk, so this is how process mode picks
+        up reloaded models. Calls already submitted finish on the old
+        workers.
+        """
+        if self.kind != "process":
+            return
+        loop = asyncio.get_running_loop()
+        pool = self._create_pool()
+        try:
+            await asyncio.gather(
+                *(loop.run_in_executor(pool, _worker_warmup) for _ in range(self.pool_size))
+            )
+        except Exception as e:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise RuntimeError(f"New inference workers failed to start: {e}") from e
+        old, self._pool = self._pool, pool
+        old.shutdown(wait=False)
+        logger.info("Inference process pool replaced")
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        logger.info("Inference executor shut down")
+
+    def stats(self) -> dict[str, Any]:
+        in_flight = self.submitted - self.completed - self.failed
+        return {
+            "kind": self.kind,
+            "pool_size": self.pool_size,
+            "in_flight": in_flight,
+            "queue_depth": max(in_flight - self.pool_size, 0),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "mean_exec_ms": self.exec_time_total / self.completed * 1000 if self.completed else 0.0,
+            "max_exec_ms": self.exec_time_max * 1000,
+            "mean_queue_wait_ms": self.queue_wait_total / self.completed * 1000 if self.completed else 0.0,
+            "max_queue_wait_ms": self.queue_wait_max * 1000,
+        }
@@ -0,0 +1,213 @@
+"""Prometheus metrics for the prediction path.
+
+Stage histograms are observed where each stage runs: ``validation``,
+``persist`` and ``total`` in ``PredictionService``, ``preprocess`` and
+``inference`` in ``InferenceExecutor`` from timings the agents report.
+Pool checkout waits are observed per engine by ``TimedQueuePool`` and
+category lookups by ``CategoryIndex``, through their listeners; pool
+occupancy is read at scrape time. Process-mode inference workers send their
+category counts back with each result.
+
+With ``PROMETHEUS_MULTIPROC_DIR`` set (an empty directory, before the app
+starts) counters and histograms are aggregated across pre-forked workers;
+the scrape-time gauges always describe the worker that answered.
+"""
+import os
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+from src.agents.categories import CategoryIndex
+from src.core.db_helper import TimedQueuePool, db_helper
+
+# Spans a cached lookup (~50 us) to a slow 10k-row batch (~seconds).
+BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+STAGE_SECONDS = Histogram(
+    "prediction_stage_seconds",
+    "Time spent per prediction stage.",
+    ["model", "stage"],
+    buckets=BUCKETS,
+)
+REQUESTS = Counter(
+    "prediction_requests_total",
+    "Prediction requests handled by the service.",
+    ["model", "endpoint"],
+)
+ERRORS = Counter(
+    "prediction_errors_total",
+    "Prediction requests that failed, or batch rows that could not be scored.",
+    ["model", "endpoint"],
+)
+POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds",
+    "Time to check a connection out of the pool, including waiting for one.",
+    ["engine"],
+    buckets=BUCKETS,
+)
+CATEGORY_LOOKUPS = Counter(
+    "category_lookups_total",
+    "Categorical values encoded.",
+    ["feature"],
+)
+CATEGORY_UNKNOWN = Counter(
+    "category_unknown_total",
+    "Categorical values missing from the training encoders.",
+    ["feature"],
+)
+WRITER_DROPPED = Counter(
+    "prediction_writer_dropped_total",
+    "Acknowledged predictions the write-behind writer failed to persist.",
+)
+WRITER_RETRIES = Counter(
+    "prediction_writer_retries_total",
+    "Write-behind flushes retried after a database error.",
+)
+IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being handled.",
+    multiprocess_mode="livesum",
+)
+
+# Lookups and unknowns per feature since this process started, for
+# /stats/categories. Unlike counts kept on the index they survive a rebuilt
+# index and include what process-mode workers report.
+_category_totals: defaultdict[str, list[int]] = defaultdict(lambda: [0, 0])
+_category_lock = threading.Lock()
+
+# perf_counter() at which the current HTTP request arrived, set by
+# MetricsMiddleware, so the service can tell how long parsing and
+# validating the body took before it was called.
+request_started: ContextVar[float | None] = ContextVar("request_started", default=None)
+
+
+def observe(model: str, stage: str, seconds: float) -> None:
+    STAGE_SECONDS.labels(model=model, stage=stage).observe(seconds)
+
+
+@contextmanager
+def stage(model: str, name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(model, name, time.perf_counter() - start)
+
+
+@contextmanager
+def track_request(model: str, endpoint: str) -> Iterator[None]:
+    """Count a service call and observe its validation and total time.
+
+    Both are measured from the moment the HTTP request arrived when
+    there is one, otherwise from the call itself.
+    """
+    entered = time.perf_counter()
+    started = request_started.get()
+    if started is not None:
+        observe(model, "validation", entered - started)
+    REQUESTS.labels(model=model, endpoint=endpoint).inc()
+    try:
+        yield
+    except Exception:
+        ERRORS.labels(model=model, endpoint=endpoint).inc()
+        raise
+    finally:
+        observe(model, "total", time.perf_counter() - (started or entered))
+
+
+def count_categories(feature: str, lookups: int, unknown: int) -> None:
+    with _category_lock:
+        totals = _category_totals[feature]
+        totals[0] += lookups
+        totals[1] += unknown
+    CATEGORY_LOOKUPS.labels(feature).inc(lookups)
+    if unknown:
+        CATEGORY_UNKNOWN.labels(feature).inc(unknown)
+
+
+def category_totals() -> dict[str, tuple[int, int]]:
+    """(lookups, unknown) per feature counted in this process."""
+    with _category_lock:
+        return {feature: tuple(totals) for feature, totals in _category_totals.items()}
+
+
+def count_errors(model: str, endpoint: str, n: int) -> None:
+    if n:
+        ERRORS.labels(model=model, endpoint=endpoint).inc(n)
+
+
+class MetricsMiddleware:
+    """Tracks in-flight HTTP requests and stamps their arrival time."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = request_started.set(time.perf_counter())
+        IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            IN_FLIGHT.dec()
+            request_started.reset(token)
+
+
+class DatabasePoolCollector(Collector):
+    def collect(self):
+        pools = [engine.pool for engine in db_helper.engines]
+        pools = [pool for pool in pools if isinstance(pool, TimedQueuePool)]
+        if not pools:
+            return
+        for name, doc, family in (
+            ("size", "Configured pool size.", GaugeMetricFamily),
+            ("checked_out", "Connections currently checked out.", GaugeMetricFamily),
+            ("checked_in", "Idle connections in the pool.", GaugeMetricFamily),
+            ("overflow", "Connections open beyond the pool size.", GaugeMetricFamily),
+            ("timeouts", "Checkouts that gave up waiting for a connection.", CounterMetricFamily),
+        ):
+            metric = family(f"db_pool_{name}", doc, labels=["engine"])
+            for pool in pools:
+                stats = pool.stats()
+                metric.add_metric([stats["name"]], stats[name])
+            yield metric
+
+
+TimedQueuePool.listeners.append(
+    lambda engine, seconds: POOL_CHECKOUT_SECONDS.labels(engine).observe(seconds)
+)
+CategoryIndex.listeners.append(count_categories)
+
+_collectors = (DatabasePoolCollector(),)
+for _collector in _collectors:
+    REGISTRY.register(_collector)
+
+
+def render() -> bytes:
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return generate_latest(REGISTRY)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    for collector in _collectors:
+        registry.register(collector)
+    return generate_latest(registry)
@@ -0,0 +1,209 @@
+"""Monthly partition maintenance for the ``predictions`` table.
+
+``predictions`` is range-partitioned on ``created_at`` with one partition per
+UTC month, named ``predictions_yYYYYmMM``. The manager keeps
+``months_ahead`` future partitions in place so inserts never miss one, and
+retires partitions that ended more than ``retention_months`` months before
+the current month: detached and moved to ``archive_schema`` (``archive``
+mode, for pg_dump or a later drop) or dropped outright (``drop``). Either
+way old rows disappear without a DELETE, so there is nothing to vacuum.
+
+Every worker may run it; a transaction-level advisory lock makes runs take
+turns, and ``lock_timeout`` keeps the DDL from queueing behind long queries.
+"""
+import asyncio
+import logging
+import re
+from datetime import datetime, timezone
+from typing import Any, Literal
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.models import Prediction
+
+logger = logging.getLogger(__name__)
+
+TABLE = Prediction.__tablename__
+_NAME = re.compile(rf"^{TABLE}_y(\d{{4}})m(\d{{2}})$")
+_LOCK_KEY = 0x7072_6564_7061_7274  # "predpart"
+
+
+def month_start(value: datetime, offset: int = 0) -> datetime:
+    """First instant (UTC) of the month ``offset`` months after ``value``'s."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    index = value.year * 12 + value.month - 1 + offset
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_name(start: datetime) -> str:
+    return f"{TABLE}_y{start.year}m{start.month:02d}"
+
+
+def partition_start(name: str) -> datetime | None:
+    match = _NAME.match(name)
+    if match is None:
+        return None
+    return datetime(int(match[1]), int(match[2]), 1, tzinfo=timezone.utc)
+
+
+class PartitionManager:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        months_ahead: int = 3,
+        retention_months: int | None = None,
+        retention_mode: Literal["drop", "archive"] = "archive",
+        archive_schema: str = "archive",
+        interval_seconds: float | None = 3600.0,
+        lock_timeout_ms: int = 5000,
+    ) -> None:
+        self.session_factory = session_factory
+        self.months_ahead = months_ahead
+        self.retention_months = retention_months
+        self.retention_mode = retention_mode
+        self.archive_schema = archive_schema
+        self.interval_seconds = interval_seconds
+        self.lock_timeout_ms = lock_timeout_ms
+        self._task: asyncio.Task | None = None
+
+        self.runs = 0
+        self.created = 0
+        self.retired = 0
+        self.last_run_at: datetime | None = None
+        self.last_error: str | None = None
+
+    def start(self) -> None:
+        if not self.interval_seconds or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._loop(), name="partition-manager")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def run_once(self) -> dict[str, list[str]] | None:
+        """``maintain`` that logs failures instead of raising; ``None`` on failure."""
+        try:
+            return await self.maintain()
+        except Exception as e:
+            self.last_error = str(e)
+            logger.error(f"Partition maintenance failed: {e}")
+            return None
+
+    async def maintain(self, dry_run: bool = False) -> dict[str, list[str]]:
+        """Create missing future partitions and retire expired ones.
+
+        Returns the partitions created and retired (or that would be, with
+        ``dry_run``). A table that is not partitioned is left alone.
+        """
+        now = datetime.now(timezone.utc)
+        async with self.session_factory() as session, session.begin():
+            if not await self._is_partitioned(session):
+                return {"create": [], "retire": []}
+            await session.execute(text(f"SET LOCAL lock_timeout = {int(self.lock_timeout_ms)}"))
+            await session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _LOCK_KEY})
+
+            existing = {row["name"] for row in await self._list(session)}
+            create = [
+                month_start(now, offset)
+                for offset in range(self.months_ahead + 1)
+                if partition_name(month_start(now, offset)) not in existing
+            ]
+            retire = []
+            if self.retention_months is not None:
+                cutoff = month_start(now, -self.retention_months)
+                retire = sorted(
+                    name
+                    for name in existing
+                    if (start := partition_start(name)) is not None
+                    and month_start(start, 1) <= cutoff
+                )
+            plan = {"create": [partition_name(s) for s in create], "retire": retire}
+            if dry_run:
+                return plan
+
+            for start in create:
+                await session.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {partition_name(start)} PARTITION OF {TABLE} "
+                    f"FOR VALUES FROM ('{start.isoformat()}') TO ('{month_start(start, 1).isoformat()}')"
+                ))
+            if retire and self.retention_mode == "archive":
+                await session.execute(text(f"CREATE SCHEMA IF NOT EXISTS {self._schema(session)}"))
+            for name in retire:
+                await session.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {name}"))
+                if self.retention_mode == "archive":
+                    await session.execute(
+                        text(f"ALTER TABLE {name} SET SCHEMA {self._schema(session)}")
+                    )
+                else:
+                    await session.execute(text(f"DROP TABLE {name}"))
+
+        self.runs += 1
+        self.created += len(create)
+        self.retired += len(retire)
+        self.last_run_at = now
+        self.last_error = None
+        if create or retire:
+            logger.info(
+                f"Partitions created: {plan['create'] or 'none'}; "
+                f"retired ({self.retention_mode}): {plan['retire'] or 'none'}"
+            )
+        return plan
+
+    async def partitions(self) -> list[dict[str, Any]]:
+        async with self.session_factory() as session:
+            rows = await self._list(session)
+        for row in rows:
+            start = partition_start(row["name"])
+            row["range_from"] = start
+            row["range_to"] = month_start(start, 1) if start is not None else None
+        return rows
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "months_ahead": self.months_ahead,
+            "retention_months": self.retention_months,
+            "retention_mode": self.retention_mode,
+            "runs": self.runs,
+            "created": self.created,
+            "retired": self.retired,
+            "last_run_at": self.last_run_at,
+            "last_error": self.last_error,
+        }
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            await self.run_once()
+
+    def _schema(self, session: AsyncSession) -> str:
+        return session.bind.dialect.identifier_preparer.quote(self.archive_schema)
+
+    @staticmethod
+    async def _is_partitioned(session: AsyncSession) -> bool:
+        result = await session.execute(
+            text("SELECT relkind FROM pg_class WHERE relname = :table AND pg_table_is_visible(oid)"),
+            {"table": TABLE},
+        )
+        return result.scalar_one_or_none() == "p"
+
+    @staticmethod
+    async def _list(session: AsyncSession) -> list[dict[str, Any]]:
+        result = await session.execute(
+            text(
+                "SELECT c.relname AS name, greatest(c.reltuples, 0)::bigint AS estimated_rows, "
+                "pg_total_relation_size(c.oid) AS size_bytes "
+                "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = CAST(:table AS regclass) ORDER BY c.relname"
+            ),
+            {"table": TABLE},
+        )
+        return [dict(row) for row in result.mappings()]
@@ -1,62 +1,235 @@
+import asyncio
+import base64
+import binascii
 import time
 import uuid
 from datetime import datetime, timezone
+from typing import Any
+
+import numpy as np
 
 from src.agents.base import BaseMLAgent
-from src.core.schemas.predictions import FlightPredictionRequestSchema, FlightPredictionResponseSchema
+from src.agents.features import FeatureBatch, flight_encoder
+from src.core.config import settings
+from src.core.enums import EnsembleAggregationEnum
+from src.core.ids import uuid7
+from src.core.schemas.predictions import (
+    BatchPredictionItemSchema,
+    EnsemblePredictionResponseSchema,
+    FlightBatchPredictionResponseSchema,
+    FlightPredictionRequestSchema,
+    FlightPredictionResponseSchema,
+    PredictionFilterSchema,
+)
 from src.dao.predictions import PredictionDAO
+from src.dao.rollups import RollupBuffer
+from src.dao.writer import PredictionWriter
 from src.core.models import Prediction
+from src.services.batching import MicroBatcher
+from src.services.cache import PredictionCache
+from src.services import metrics
+from src.services.counting import PredictionCounter
+from src.services.inference import InferenceExecutor
+from src.services.columnar import validate_columns
+from src.services.score_index import ScoreIndex, hash_columns, hash_key
 
 
 class PredictionService:
-    def __init__(self, agents: dict[str, BaseMLAgent], dao: PredictionDAO) -> None:
+    def __init__(
+        self,
+        agents: dict[str, BaseMLAgent],
+        dao: PredictionDAO,
+        executor: InferenceExecutor,
+        batchers: dict[str, MicroBatcher] | None = None,
+        cache: PredictionCache | None = None,
+        writer: PredictionWriter | None = None,
+        counter: PredictionCounter | None = None,
+        score_index: ScoreIndex | None = None,
+        rollups: RollupBuffer | None = None,
+    ) -> None:
         self.agents = agents
         self.dao = dao
+        self.executor = executor
+        self.batchers = batchers or {}
+        self.cache = cache
+        self.writer = writer
+        self.counter = counter or PredictionCounter(mode="exact", max_age_seconds=0)
+        self.score_index = score_index
+        self.rollups = rollups
 
     async def predict(
         self, request: FlightPredictionRequestSchema, model_name: str
     ) -> FlightPredictionResponseSchema:
-        agent = self.agents.get(model_name)
-        if agent is None:
-            available = list(self.agents.keys())
-            raise ValueError(f"Model '{model_name}' not found. Available: {available}")
+        with metrics.track_request(model_name, "predict"):
+            agent = await self._get_agent(model_name)
 
-        if not agent.is_loaded():
-            raise RuntimeError(f"Model '{model_name}' is not loaded")
+            data = request.model_dump()
+            key = flight_encoder.row_key(data)
 
-        data = request.model_dump()
+            start = time.perf_counter()
+            result = self._lookup(model_name, agent, key)
+            if result is None and self.cache is not None:
+                result = await self.cache.get_or_compute(
+                    model_name, agent.version, key, lambda: self._score(model_name, data)
+                )
+            elif result is None:
+                result = await self._score(model_name, data)
+            latency_ms = (time.perf_counter() - start) * 1000
 
-        start = time.perf_counter()
-        result = agent.predict(data)
-        latency_ms = int((time.perf_counter() - start) * 1000)
+            prediction = self._build_prediction(data, result, model_name, latency_ms)
 
-        prediction = Prediction(
-            id=uuid.uuid4(),
-            created_at=datetime.now(timezone.utc),
-            month=request.month,
-            day_of_month=request.day_of_month,
-            day_of_week=request.day_of_week,
-            dep_time=request.dep_time,
-            carrier=request.carrier,
-            origin=request.origin,
-            dest=request.dest,
-            distance=request.distance,
-            model_name=model_name,
-            predicted_delayed=result["delayed"],
-            delay_probability=result["delay_probability"],
-            latency_ms=latency_ms,
-        )
+            with metrics.stage(model_name, "persist"):
+                await self._save([prediction])
 
-        saved = await self.dao.create(prediction)
+            return self._to_response(prediction)
 
-        return FlightPredictionResponseSchema(
-            prediction_id=saved.id,
-            delayed=saved.predicted_delayed,
-            delay_probability=saved.delay_probability,
-            no_delay_probability=1.0 - saved.delay_probability,
-            model_used=saved.model_name,
-            created_at=saved.created_at,
-        )
+    async def predict_batch(
+        self, requests: list[FlightPredictionRequestSchema], model_name: str
+    ) -> FlightBatchPredictionResponseSchema:
+        with metrics.track_request(model_name, "batch"):
+            if len(requests) > settings.ml.batch_max_size:
+                raise ValueError(
+                    f"Batch of {len(requests)} exceeds the limit of {settings.ml.batch_max_size}"
+                )
+            agent = await self._get_agent(model_name)
+
+            rows = [request.model_dump() for request in requests]
+
+            start = time.perf_counter()
+            results = await self._score_batch(model_name, agent, rows)
+            latency_ms = (time.perf_counter() - start) * 1000
+
+            items: list[BatchPredictionItemSchema] = []
+            predictions: list[Prediction] = []
+            for index, (data, result) in enumerate(zip(rows, results)):
+                if isinstance(result, Exception):
+                    items.append(BatchPredictionItemSchema(index=index, error=str(result)))
+                    continue
+                prediction = self._build_prediction(data, result, model_name, latency_ms)
+                predictions.append(prediction)
+                items.append(
+                    BatchPredictionItemSchema(index=index, prediction=self._to_response(prediction))
+                )
+            metrics.count_errors(model_name, "batch", len(items) - len(predictions))
+
+            if predictions:
+                with metrics.stage(model_name, "persist"):
+                    await self._save(predictions)
+
+            return FlightBatchPredictionResponseSchema(
+                model_used=model_name,
+                succeeded=len(predictions),
+                failed=len(items) - len(predictions),
+                items=items,
+            )
+
+    async def predict_columns(
+        self, columns: dict[str, Any], model_name: str
+    ) -> dict[str, Any]:
+        """Score a columnar batch without per-row request or response objects.
+
+        ``columns`` holds one array per request field and is validated here
+        against the schema's bounds. Returns per-row arrays plus the shared
+        ``model_used``/``model_version``/``created_at`` for ``write_columns``.
+        """
+        with metrics.track_request(model_name, "columnar"):
+            columns = validate_columns(columns, settings.ml.columnar_max_rows)
+            agent = await self._get_agent(model_name)
+
+            start = time.perf_counter()
+            proba, errors = await self._score_columns(model_name, agent, columns)
+            latency_ms = (time.perf_counter() - start) * 1000
+
+            n = len(proba)
+            created_at = datetime.now(timezone.utc)
+            scored = np.flatnonzero(~np.isnan(proba))
+            metrics.count_errors(model_name, "columnar", n - len(scored))
+
+            ids: list[str | None] = [None] * n
+            if len(scored):
+                names = list(columns)
+                rows = []
+                fields = zip(*(columns[name][scored].tolist() for name in names))
+                for i, p, values in zip(scored.tolist(), proba[scored].tolist(), fields):
+                    prediction_id = uuid7()
+                    ids[i] = str(prediction_id)
+                    rows.append({
+                        "id": prediction_id,
+                        "created_at": created_at,
+                        **dict(zip(names, values)),
+                        "model_name": model_name,
+                        "model_version": agent.version,
+                        "predicted_delayed": p > 0.5,
+                        "delay_probability": p,
+                        "latency_ms": latency_ms,
+                    })
+                with metrics.stage(model_name, "persist"):
+                    await self._save_rows(rows)
+
+            return {
+                "model_used": model_name,
+                "model_version": agent.version,
+                "created_at": created_at.isoformat(),
+                "prediction_id": ids,
+                "delayed": proba > 0.5,
+                "delay_probability": proba,
+                "no_delay_probability": 1.0 - proba,
+                "error": [errors.get(i) for i in range(n)],
+            }
+
+    async def predict_ensemble(
+        self,
+        request: FlightPredictionRequestSchema,
+        model_names: list[str] | None = None,
+        aggregation: EnsembleAggregationEnum | None = None,
+    ) -> EnsemblePredictionResponseSchema:
+        """Score one flight on several models and aggregate the probabilities.
+
+        Features are encoded once and the same buffers are handed to every
+        agent; the agents run concurrently and all rows are saved together.
+        """
+        with metrics.track_request("ensemble", "ensemble"):
+            aggregation = aggregation or EnsembleAggregationEnum(settings.ml.ensemble_aggregation)
+            names = list(dict.fromkeys(model_names or self.available_models()))
+            if not names:
+                raise RuntimeError("No models are loaded")
+            agents = {name: await self._get_agent(name) for name in names}
+
+            data = request.model_dump()
+            batch = flight_encoder.encode([data])
+            key = flight_encoder.row_key(data)
+            outcomes = await asyncio.gather(
+                *(self._score_encoded(name, agent, batch, key) for name, agent in agents.items()),
+                return_exceptions=True,
+            )
+
+            predictions: list[Prediction] = []
+            errors: dict[str, str] = {}
+            for name, outcome in zip(names, outcomes):
+                if isinstance(outcome, Exception):
+                    errors[name] = str(outcome)
+                    metrics.count_errors(name, "ensemble", 1)
+                    continue
+                result, latency_ms = outcome
+                predictions.append(self._build_prediction(data, result, name, latency_ms))
+            if not predictions:
+                raise next(o for o in outcomes if isinstance(o, Exception))
+
+            # Before saving, so a bad weight setting fails without writing rows.
+            weights = self._ensemble_weights([p.model_name for p in predictions], aggregation)
+            with metrics.stage("ensemble", "persist"):
+                await self._save(predictions)
+
+            probability = sum(weights[p.model_name] * p.delay_probability for p in predictions)
+            return EnsemblePredictionResponseSchema(
+                delayed=probability > 0.5,
+                delay_probability=probability,
+                no_delay_probability=1.0 - probability,
+                aggregation=aggregation,
+                weights=weights,
+                predictions=[self._to_response(p) for p in predictions],
+                errors=errors,
+            )
 
     async def get_prediction(
         self, prediction_id: uuid.UUID
@@ -67,15 +240,185 @@ class PredictionService:
         return self._to_response(p)
 
     async def get_history(
-        self, limit: int = 100, offset: int = 0
-    ) -> tuple[list[FlightPredictionResponseSchema], int]:
-        predictions = await self.dao.get_all(limit=limit, offset=offset)
-        total = await self.dao.count()
-        return [self._to_response(p) for p in predictions], total
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: str | None = None,
+        filters: PredictionFilterSchema | None = None,
+        include_total: bool = False,
+    ) -> tuple[list[FlightPredictionResponseSchema], int | None, str | None]:
+        """Returns the page, the total (only if requested) and the next page cursor."""
+        predictions = await self.dao.get_all(
+            limit=limit,
+            offset=offset,
+            after=self._decode_cursor(cursor) if cursor else None,
+            filters=filters,
+        )
+        total = await self.counter.total(self.dao, filters) if include_total else None
+        next_cursor = self._encode_cursor(predictions[-1]) if len(predictions) == limit else None
+        return [self._to_response(p) for p in predictions], total, next_cursor
 
     def available_models(self) -> list[str]:
         return [name for name, agent in self.agents.items() if agent.is_loaded()]
 
+    async def _save(self, predictions: list[Prediction]) -> None:
+        if self.writer is not None:
+            await self.writer.put_many(predictions)
+        elif len(predictions) == 1:
+            await self.dao.create(predictions[0])
+        else:
+            await self.dao.create_many(predictions)
+        if self.writer is None and self.rollups is not None:
+            self.rollups.record(predictions)
+        self.counter.record_inserts(len(predictions))
+
+    async def _save_rows(self, rows: list[dict[str, Any]]) -> None:
+        if self.writer is not None:
+            await self.writer.put_many(rows)
+        else:
+            await self.dao.bulk_insert(rows, use_copy=settings.db.write_behind_use_copy)
+        self.counter.record_inserts(len(rows))
+
+    async def _score(self, model_name: str, data: dict[str, Any]) -> dict[str, Any]:
+        batcher = self.batchers.get(model_name)
+        if batcher is not None:
+            return await batcher.submit(data)
+        return await self.executor.predict(model_name, data)
+
+    def _lookup(self, model_name: str, agent: BaseMLAgent, key: tuple) -> dict[str, Any] | None:
+        if self.score_index is None:
+            return None
+        return self.score_index.lookup(model_name, agent.version, key)
+
+    async def _score_batch(
+        self, model_name: str, agent: BaseMLAgent, rows: list[dict[str, Any]]
+    ) -> list[dict[str, Any] | Exception]:
+        """Answer indexed rows from the score index and run inference on the rest."""
+        if self.score_index is None or not self.score_index.covers(model_name, agent.version):
+            return await self.executor.predict_batch(model_name, rows)
+
+        hashes = np.fromiter(
+            (hash_key(flight_encoder.row_key(row)) for row in rows), dtype=np.uint64, count=len(rows)
+        )
+        indexed = self.score_index.lookup_many(model_name, agent.version, hashes)
+        results: list[dict[str, Any] | Exception] = [
+            {
+                "delayed": p > 0.5,
+                "delay_probability": p,
+                "no_delay_probability": 1.0 - p,
+                "model_version": agent.version,
+            }
+            for p in indexed.tolist()
+        ]
+        misses = np.flatnonzero(np.isnan(indexed)).tolist()
+        if misses:
+            scored = await self.executor.predict_batch(model_name, [rows[i] for i in misses])
+            for i, result in zip(misses, scored):
+                results[i] = result
+        return results
+
+    async def _score_columns(
+        self, model_name: str, agent: BaseMLAgent, columns: dict[str, np.ndarray]
+    ) -> tuple[np.ndarray, dict[int, str]]:
+        """Delay probabilities (NaN where a row failed) and the failed rows' errors."""
+        n = len(columns["month"])
+        proba = np.full(n, np.nan)
+        pending = np.arange(n)
+        if self.score_index is not None and self.score_index.covers(model_name, agent.version):
+            hashes = hash_columns(columns)
+            proba[:] = self.score_index.lookup_many(model_name, agent.version, hashes)
+            pending = np.flatnonzero(np.isnan(proba))
+
+        errors: dict[int, str] = {}
+        if len(pending):
+            batch = flight_encoder.encode_columns(columns)
+            if len(pending) < n:
+                batch = batch.take(pending)
+            results = await self.executor.predict_features(model_name, batch)
+            for i, result in zip(pending.tolist(), results):
+                if isinstance(result, Exception):
+                    errors[i] = str(result)
+                else:
+                    proba[i] = result["delay_probability"]
+        return proba, errors
+
+    async def _score_encoded(
+        self, model_name: str, agent: BaseMLAgent, batch: FeatureBatch, key: tuple
+    ) -> tuple[dict[str, Any], float]:
+        async def compute() -> dict[str, Any]:
+            result = (await self.executor.predict_features(model_name, batch))[0]
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        start = time.perf_counter()
+        result = self._lookup(model_name, agent, key)
+        if result is None and self.cache is not None:
+            result = await self.cache.get_or_compute(model_name, agent.version, key, compute)
+        elif result is None:
+            result = await compute()
+        return result, (time.perf_counter() - start) * 1000
+
+    @staticmethod
+    def _ensemble_weights(
+        model_names: list[str], aggregation: EnsembleAggregationEnum
+    ) -> dict[str, float]:
+        if aggregation == EnsembleAggregationEnum.MEAN:
+            raw = {name: 1.0 for name in model_names}
+        else:
+            raw = {name: settings.ml.ensemble_weights.get(name, 1.0) for name in model_names}
+        total = sum(raw.values())
+        if total <= 0 or any(w < 0 for w in raw.values()):
+            raise ValueError(f"Invalid ensemble weights: {raw}")
+        return {name: w / total for name, w in raw.items()}
+
+    async def _get_agent(self, model_name: str) -> BaseMLAgent:
+        agent = self.agents.get(model_name)
+        if agent is None:
+            available = list(self.agents.keys())
+            raise ValueError(f"Model '{model_name}' not found. Available: {available}")
+
+        if agent.lazy and not agent.is_loaded():
+            await asyncio.to_thread(agent.ensure_loaded)
+        if not agent.is_loaded():
+            raise RuntimeError(f"Model '{model_name}' is not loaded")
+        return agent
+
+    @staticmethod
+    def _build_prediction(
+        data: dict[str, Any], result: dict[str, Any], model_name: str, latency_ms: float
+    ) -> Prediction:
+        return Prediction(
+            id=uuid7(),
+            created_at=datetime.now(timezone.utc),
+            month=data["month"],
+            day_of_month=data["day_of_month"],
+            day_of_week=data["day_of_week"],
+            dep_time=data["dep_time"],
+            carrier=data["carrier"],
+            origin=data["origin"],
+            dest=data["dest"],
+            distance=data["distance"],
+            model_name=model_name,
+            model_version=result.get("model_version"),
+            predicted_delayed=result["delayed"],
+            delay_probability=result["delay_probability"],
+            latency_ms=latency_ms,
+        )
+
+    @staticmethod
+    def _encode_cursor(p: Prediction) -> str:
+        raw = f"{p.created_at.isoformat()}|{p.id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+        try:
+            created_at, prediction_id = base64.urlsafe_b64decode(cursor).decode().split("|")
+            return datetime.fromisoformat(created_at), uuid.UUID(prediction_id)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise ValueError("Invalid history cursor") from None
+
     @staticmethod
     def _to_response(p: Prediction) -> FlightPredictionResponseSchema:
         return FlightPredictionResponseSchema(
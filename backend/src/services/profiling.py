@@ -0,0 +1,247 @@
+"""Opt-in sampling profiler for individual prediction requests.
+
+A profiled request gets its own sampler thread that, every
+``interval_ms``, records the Python stack of the event loop thread (request
+parsing, pydantic, the service, SQLAlchemy/asyncpg) and of every busy
+``inference`` pool thread (preprocessing and the model). Each stack is
+counted once per sample for the wall-clock profile and weighted by the CPU
+time its thread used since the previous sample for the CPU profile. Both are
+kept as folded stacks (``frame;frame;frame count``) that flamegraph.pl,
+speedscope and similar tools read directly.
+
+Samples are not scoped to the request. The event loop and the inference
+threads are shared, so a profile taken under concurrent load also shows the
+other requests' coroutines and inference that ran meanwhile; process-mode
+workers are not sampled. At most ``max_concurrent`` requests are profiled at
+once, since every sampler thread competes for the GIL with the loop it
+samples. Requests that are not profiled only pay for the sampling decision.
+"""
+import asyncio
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+_INFERENCE_PREFIX = "inference"
+_POOL_WORKER = ("_worker", str(Path("concurrent", "futures", "thread.py")))
+
+
+def _thread_cpu(ident: int) -> float | None:
+    try:
+        return time.clock_gettime(time.pthread_getcpuclockid(ident))
+    except (AttributeError, OSError, ProcessLookupError):
+        return None
+
+
+def _frame_name(code: Any) -> str:
+    path = Path(code.co_filename)
+    return f"{path.parent.name}/{path.name}:{code.co_qualname}"
+
+
+def _fold(frame: Any, root: str) -> str:
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame.f_code))
+        frame = frame.f_back
+    names.append(root)
+    return ";".join(reversed(names))
+
+
+def _idle_pool_thread(frame: Any) -> bool:
+    code = frame.f_code
+    return code.co_name == _POOL_WORKER[0] and code.co_filename.endswith(_POOL_WORKER[1])
+
+
+class _Sampler(threading.Thread):
+    def __init__(self, loop_ident: int, interval: float) -> None:
+        super().__init__(name="request-profiler", daemon=True)
+        self.loop_ident = loop_ident
+        self.interval = interval
+        self.wall: Counter[str] = Counter()
+        self.cpu: Counter[str] = Counter()
+        self.samples = 0
+        self.cpu_seconds = 0.0
+        self._done = threading.Event()
+        self._last_cpu = {
+            ident: cpu for ident, _ in self._targets() if (cpu := _thread_cpu(ident)) is not None
+        }
+
+    def _targets(self) -> list[tuple[int, str]]:
+        targets = [(self.loop_ident, "event-loop")]
+        for thread in threading.enumerate():
+            if thread.name.startswith(_INFERENCE_PREFIX) and thread.ident is not None:
+                targets.append((thread.ident, _INFERENCE_PREFIX))
+        return targets
+
+    def run(self) -> None:
+        while not self._done.wait(self.interval):
+            self._sample()
+        self._sample()
+
+    def stop(self) -> None:
+        self._done.set()
+        self.join()
+
+    def _sample(self) -> None:
+        frames = sys._current_frames()
+        self.samples += 1
+        for ident, root in self._targets():
+            frame = frames.get(ident)
+            cpu = _thread_cpu(ident)
+            used = 0.0
+            if cpu is not None:
+                used = cpu - self._last_cpu.get(ident, cpu)
+                self._last_cpu[ident] = cpu
+            if frame is None or (root == _INFERENCE_PREFIX and _idle_pool_thread(frame)):
+                continue
+            stack = _fold(frame, root)
+            self.wall[stack] += 1
+            if used > 0:
+                self.cpu[stack] += round(used * 1e6)
+                self.cpu_seconds += used
+
+
+class RequestProfiler:
+    """Decides which requests to profile and keeps the last ``capacity`` profiles.
+
+    A request is profiled with probability ``sample_rate``, or always when
+    it carries ``X-Profile: 1`` and ``header_enabled`` is set, unless
+    ``max_concurrent`` profiles are already running. CPU profile counts are
+    microseconds, wall-clock counts are samples.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 0.0,
+        header_enabled: bool = False,
+        interval_ms: float = 1.0,
+        capacity: int = 100,
+        max_concurrent: int = 4,
+        path_prefix: str = "/api/v1/predictions",
+    ) -> None:
+        self.sample_rate = sample_rate
+        self.header_enabled = header_enabled
+        self.interval = interval_ms / 1000
+        self.max_concurrent = max_concurrent
+        self.path_prefix = path_prefix
+        self.profiles: deque[dict[str, Any]] = deque(maxlen=capacity)
+        self.profiled = 0
+        self.skipped = 0
+        self._active = 0
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0 or self.header_enabled
+
+    def should_profile(self, scope: dict[str, Any]) -> bool:
+        if not self.enabled or scope["type"] != "http":
+            return False
+        if not scope["path"].startswith(self.path_prefix):
+            return False
+        if self.header_enabled and (b"x-profile", b"1") in scope["headers"]:
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def start(self) -> _Sampler | None:
+        """Start a sampler, or return None when ``max_concurrent`` are running."""
+        with self._lock:
+            if self._active >= self.max_concurrent:
+                self.skipped += 1
+                return None
+            self._active += 1
+        sampler = _Sampler(threading.get_ident(), self.interval)
+        sampler.start()
+        return sampler
+
+    async def finish(
+        self, sampler: _Sampler, scope: dict[str, Any], status: int | None, wall_seconds: float
+    ) -> None:
+        # The final sample and the join run off the loop so they don't stall it.
+        await asyncio.to_thread(sampler.stop)
+        with self._lock:
+            self._active -= 1
+            self._next_id += 1
+            self.profiled += 1
+            self.profiles.append({
+                "id": self._next_id,
+                "created_at": datetime.now(timezone.utc),
+                "method": scope["method"],
+                "path": scope["path"],
+                "query": scope["query_string"].decode(errors="replace"),
+                "status": status,
+                "wall_ms": wall_seconds * 1000,
+                "cpu_ms": sampler.cpu_seconds * 1000,
+                "samples": sampler.samples,
+                "wall": sampler.wall,
+                "cpu": sampler.cpu,
+            })
+
+    def summaries(self) -> list[dict[str, Any]]:
+        with self._lock:
+            profiles = list(self.profiles)
+        return [
+            {k: v for k, v in p.items() if k not in ("wall", "cpu")} for p in reversed(profiles)
+        ]
+
+    def folded(self, kind: str, profile_id: int | None = None) -> str:
+        """Folded stacks of one profile, or of all buffered profiles merged."""
+        with self._lock:
+            profiles = [p for p in self.profiles if profile_id is None or p["id"] == profile_id]
+        if profile_id is not None and not profiles:
+            raise KeyError(profile_id)
+        merged: Counter[str] = Counter()
+        for p in profiles:
+            merged.update(p[kind])
+        return "".join(f"{stack} {count}\n" for stack, count in merged.most_common())
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "header_enabled": self.header_enabled,
+            "interval_ms": self.interval * 1000,
+            "capacity": self.profiles.maxlen,
+            "max_concurrent": self.max_concurrent,
+            "active": self._active,
+            "buffered": len(self.profiles),
+            "profiled": self.profiled,
+            "skipped": self.skipped,
+        }
+
+
+class ProfilingMiddleware:
+    """Profiles the requests ``app.state.request_profiler`` selects."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        profiler: RequestProfiler | None = getattr(scope["app"].state, "request_profiler", None)
+        if profiler is None or not profiler.should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        status: int | None = None
+
+        async def send_with_status(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        sampler = profiler.start()
+        if sampler is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            await profiler.finish(sampler, scope, status, time.perf_counter() - start)
@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import math
+import time
+from typing import Any
+
+from src.agents.base import WARMUP_ROW, BaseMLAgent
+from src.services.cache import PredictionCache
+from src.services.inference import InferenceExecutor
+from src.utils.agents_setup import AGENT_CLASSES, create_agent
+
+logger = logging.getLogger(__name__)
+
+_ArtifactState = tuple[tuple[str, int, int], ...]
+
+
+class ModelReloader:
+    """Replaces agents with freshly loaded artifacts without a restart.
+
+    The new agent is loaded and smoke-tested off the event loop and only
+    then assigned into the shared ``agents`` dict. Requests that already
+    picked up the old agent finish on it. With ``watch_interval`` set, the
+    artifacts are polled and reloaded once they change and have been stable
+    for one interval.
+    """
+
+    def __init__(
+        self,
+        agents: dict[str, BaseMLAgent],
+        executor: InferenceExecutor,
+        cache: PredictionCache | None = None,
+        watch_interval: float | None = None,
+    ) -> None:
+        self.agents = agents
+        self.executor = executor
+        self.cache = cache
+        self.watch_interval = watch_interval
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self._seen: dict[str, _ArtifactState] = {}
+
+        self.reloads = 0
+        self.failures = 0
+        self.last_error: str | None = None
+
+    def start(self) -> None:
+        if not self.watch_interval or self._task is not None:
+            return
+        for name, agent in self.agents.items():
+            self._seen[name] = self._artifact_state(agent)
+        self._task = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def reload(self, name: str) -> dict[str, Any]:
+        if name not in AGENT_CLASSES:
+            raise ValueError(f"Model '{name}' not found. Available: {list(AGENT_CLASSES)}")
+
+        async with self._lock:
+            old = self.agents.get(name)
+            previous = old.version if old is not None and old.is_loaded() else None
+            try:
+                agent = await asyncio.to_thread(self._load_validated, name)
+                if agent.version != previous:
+                    await self.executor.replace_pool()
+            except Exception as e:
+                self.failures += 1
+                self.last_error = f"{name}: {e}"
+                logger.error(f"Reload of {name} failed, keeping the current model: {e}")
+                raise
+
+            self._seen[name] = self._artifact_state(agent)
+            reloaded = agent.version != previous
+            if reloaded:
+                self.agents[name] = agent
+                if self.cache is not None:
+                    self.cache.invalidate(name)
+                self.reloads += 1
+                logger.info(f"{name} reloaded: {previous} -> {agent.version}")
+
+        return {
+            "name": name,
+            "reloaded": reloaded,
+            "version": agent.version,
+            "previous_version": previous,
+            "load_ms": agent.load_ms,
+        }
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "watching": self._task is not None,
+            "reloads": self.reloads,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "versions": {name: agent.version for name, agent in self.agents.items()},
+        }
+
+    @staticmethod
+    def _load_validated(name: str) -> BaseMLAgent:
+        agent = create_agent(name)
+        if not agent.is_loaded():
+            raise RuntimeError(f"Could not load new artifacts: {agent.load_error}")
+        agent.warmup()
+        result = agent.predict_batch([WARMUP_ROW])[0]
+        if isinstance(result, Exception):
+            raise RuntimeError(f"Smoke prediction failed: {result}")
+        p = result["delay_probability"]
+        if not (math.isfinite(p) and 0.0 <= p <= 1.0):
+            raise RuntimeError(f"Smoke prediction returned an invalid probability: {p}")
+        return agent
+
+    @staticmethod
+    def _artifact_state(agent: BaseMLAgent) -> _ArtifactState:
+        state = []
+        for path in agent.artifact_paths():
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            state.append((str(path), st.st_mtime_ns, st.st_size))
+        return tuple(state)
+
+    async def _watch(self) -> None:
+        pending: dict[str, _ArtifactState] = {}
+        while True:
+            await asyncio.sleep(self.watch_interval)
+            for name, agent in list(self.agents.items()):
+                if agent.lazy and not agent.is_loaded():
+                    continue
+                state = await asyncio.to_thread(self._artifact_state, agent)
+                if state == self._seen.get(name):
+                    pending.pop(name, None)
+                    continue
+                # Wait for one quiet interval so a half-copied file is not loaded.
+                if pending.get(name) != state:
+                    pending[name] = state
+                    continue
+                del pending[name]
+                start = time.perf_counter()
+                try:
+                    await self.reload(name)
+                except Exception:
+                    # Don't retry the same broken artifact every interval.
+                    self._seen[name] = state
+                    continue
+                logger.info(f"{name} picked up by the artifact watcher in {time.perf_counter() - start:.1f}s")
@@ -0,0 +1,110 @@
+import hashlib
+import json
+import logging
+import threading
+from collections.abc import Iterable, Mapping, Sequence
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from src.agents.features import flight_encoder
+
+logger = logging.getLogger(__name__)
+
+KEYS_FILE = "keys.npy"
+META_FILE = "meta.json"
+
+
+def hash_key(key: Iterable[Any]) -> int:
+    """Stable 64-bit hash of a ``flight_encoder.row_key`` tuple."""
+    raw = "\x1f".join(map(str, key)).encode()
+    return int.from_bytes(hashlib.blake2b(raw, digest_size=8).digest(), "little")
+
+
+def hash_columns(columns: Mapping[str, Sequence[Any]]) -> np.ndarray:
+    rows = zip(*(columns[source] for source in flight_encoder.sources))
+    n = len(columns[flight_encoder.sources[0]])
+    return np.fromiter(map(hash_key, rows), dtype=np.uint64, count=n)
+
+
+class ScoreIndex:
+    """Read-only, memory-mapped delay probabilities for pre-scored flights.
+
+    Built by ``python -m src.cli.build_index``: ``keys.npy`` holds the sorted
+    64-bit hashes of the scored feature rows, ``<model>.npy`` the matching
+    ``float32`` probabilities and ``meta.json`` the model versions they came
+    from. A model is only answered from the index while its loaded version
+    matches, so a reload turns its lookups into misses instead of stale hits.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.meta: dict[str, Any] = json.loads((self.path / META_FILE).read_text())
+        self.keys = np.load(self.path / KEYS_FILE, mmap_mode="r")
+        self.probabilities = {
+            name: np.load(self.path / f"{name}.npy", mmap_mode="r")
+            for name in self.meta["models"]
+        }
+        self.size_bytes = sum(f.stat().st_size for f in self.path.iterdir() if f.is_file())
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        logger.info(
+            f"Score index loaded from {self.path}: {len(self.keys)} rows, "
+            f"{len(self.probabilities)} models, {self.size_bytes / 1e6:.1f} MB"
+        )
+
+    def covers(self, model_name: str, version: str | None) -> bool:
+        return version is not None and self.meta["models"].get(model_name) == version
+
+    def lookup(self, model_name: str, version: str | None, key: tuple) -> dict[str, Any] | None:
+        p = self.lookup_many(model_name, version, np.array([hash_key(key)], dtype=np.uint64))[0]
+        if np.isnan(p):
+            return None
+        p = float(p)
+        return {
+            "delayed": p > 0.5,
+            "delay_probability": p,
+            "no_delay_probability": 1.0 - p,
+            "model_version": version,
+        }
+
+    def lookup_many(
+        self, model_name: str, version: str | None, hashes: np.ndarray
+    ) -> np.ndarray:
+        """Probabilities for ``hashes``, NaN where the flight is not indexed."""
+        out = np.full(len(hashes), np.nan)
+        if self.covers(model_name, version) and len(self.keys):
+            pos = np.minimum(np.searchsorted(self.keys, hashes), len(self.keys) - 1)
+            found = self.keys[pos] == hashes
+            out[found] = self.probabilities[model_name][pos[found]]
+        hits = int(np.count_nonzero(~np.isnan(out)))
+        with self._lock:
+            self.hits += hits
+            self.misses += len(hashes) - hits
+        return out
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "path": str(self.path),
+            "rows": len(self.keys),
+            "size_bytes": self.size_bytes,
+            "built_at": self.meta.get("built_at"),
+            "build_seconds": self.meta.get("build_seconds"),
+            "models": self.meta["models"],
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def load_score_index(path: str | None) -> ScoreIndex | None:
+    if not path:
+        return None
+    try:
+        return ScoreIndex(path)
+    except FileNotFoundError as e:
+        logger.warning(f"Score index not available at {path}: {e}")
+        return None
@@ -1 +1,2 @@
-from .agents_setup import agents_setup
\ No newline at end of file
+from .agents_setup import agents_setup
+from .batchers_setup import batchers_setup
@@ -1,27 +1,60 @@
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from src.agents import (
+    BaseMLAgent,
     CatBoostDefaultAgent,
     CatBoostOptimizedAgent,
     LightGBMDefaultAgent,
     LightGBMOptimizedAgent,
 )
+from src.agents.categories import load_category_index
+from src.core.config import settings
 
 logger = logging.getLogger(__name__)
 
-def agents_setup():
-    agent_classes = {
-        "catboost_default": CatBoostDefaultAgent,
-        "catboost_optimized": CatBoostOptimizedAgent,
-        "lightgbm_default": LightGBMDefaultAgent,
-        "lightgbm_optimized": LightGBMOptimizedAgent,
-    }
+AGENT_CLASSES: dict[str, type[BaseMLAgent]] = {
+    "catboost_default": CatBoostDefaultAgent,
+    "catboost_optimized": CatBoostOptimizedAgent,
+    "lightgbm_default": LightGBMDefaultAgent,
+    "lightgbm_optimized": LightGBMOptimizedAgent,
+}
 
-    agents = {}
-    for name, cls in agent_classes.items():
+# Set by a pre-fork launcher so forked workers reuse the parent's models.
+_preloaded: dict[str, BaseMLAgent] | None = None
+
+
+def preload_agents() -> dict[str, BaseMLAgent]:
+    global _preloaded
+    _preloaded = agents_setup()
+    return _preloaded
+
+
+def create_agent(name: str, lazy: bool = False) -> BaseMLAgent:
+    return AGENT_CLASSES[name](lazy=lazy, compiled=name in settings.ml.compiled_models)
+
+
+def agents_setup() -> dict[str, BaseMLAgent]:
+    if _preloaded is not None:
+        return dict(_preloaded)
+    lazy = set(settings.ml.lazy_models)
+
+    def create(name: str) -> BaseMLAgent | None:
         try:
-            agents[name] = cls()
+            return create_agent(name, lazy=name in lazy)
         except Exception as e:
             logger.warning(f"Could not load {name}: {e}")
-    
-    return agents
\ No newline at end of file
+            return None
+
+    # Unpickling spends most of its time in native code, so the models
+    # load in parallel rather than one after another.
+    start = time.perf_counter()
+    # Build the shared category index up front; the agents then all get
+    # this instance from the cache instead of racing to build it.
+    load_category_index(settings.ml.label_encoders_path)
+    with ThreadPoolExecutor(max_workers=max(settings.ml.model_load_workers, 1)) as pool:
+        created = dict(zip(AGENT_CLASSES, pool.map(create, AGENT_CLASSES)))
+    logger.info(f"Agents set up in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    return {name: agent for name, agent in created.items() if agent is not None}
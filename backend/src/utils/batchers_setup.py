@@ -0,0 +1,22 @@
+from src.agents import BaseMLAgent
+from src.core.config import settings
+from src.services.batching import MicroBatcher
+from src.services.inference import InferenceExecutor
+
+
+def batchers_setup(
+    agents: dict[str, BaseMLAgent], executor: InferenceExecutor
+) -> dict[str, MicroBatcher]:
+    if not settings.ml.microbatch_enabled:
+        return {}
+
+    return {
+        name: MicroBatcher(
+            name,
+            executor,
+            max_batch_size=settings.ml.microbatch_max_size,
+            max_wait_ms=settings.ml.microbatch_max_wait_ms,
+        )
+        for name, agent in agents.items()
+        if agent.is_loaded() or agent.lazy
+    }
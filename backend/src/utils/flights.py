@@ -0,0 +1,36 @@
+from typing import Any
+
+import numpy as np
+
+from src.agents.base import WARMUP_ROW
+from src.agents.categories import load_category_index
+from src.core.config import settings
+
+
+def synthetic_flights(n: int, seed: int = 0) -> list[dict[str, Any]]:
+    """Random flights that pass the request schema, for benchmarks and parity checks.
+
+    Carriers and airports come from the label encoders when available, plus
+    one unseen carrier and origin to exercise the unknown-category path.
+    """
+    rng = np.random.default_rng(seed)
+    index = load_category_index(settings.ml.label_encoders_path)
+    pools = {
+        field: index.values(feature) if index is not None else [WARMUP_ROW[field]]
+        for field, feature in (("carrier", "UniqueCarrier"), ("origin", "Origin"), ("dest", "Dest"))
+    }
+    pools["carrier"].append("ZZ")
+    pools["origin"].append("ZZZ")
+    return [
+        {
+            "month": int(rng.integers(1, 13)),
+            "day_of_month": int(rng.integers(1, 32)),
+            "day_of_week": int(rng.integers(1, 8)),
+            "dep_time": int(rng.integers(0, 24) * 100 + rng.integers(0, 60)),
+            "carrier": str(rng.choice(pools["carrier"])),
+            "origin": str(rng.choice(pools["origin"])),
+            "dest": str(rng.choice(pools["dest"])),
+            "distance": int(rng.integers(30, 5000)),
+        }
+        for _ in range(n)
+    ]
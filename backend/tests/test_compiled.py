@@ -0,0 +1,33 @@
+"""Parity of the compiled tree engines with the library predictors.
+
+Only LightGBM models are compiled. The test runs against the configured
+artifacts and skips models that are not present, so it only checks
+something where the models are available.
+"""
+import numpy as np
+import pytest
+
+from src.agents.features import flight_encoder
+from src.utils.agents_setup import AGENT_CLASSES
+from src.utils.flights import synthetic_flights
+
+TOLERANCE = 1e-9
+
+
+@pytest.fixture(scope="module")
+def flights():
+    return synthetic_flights(2000)
+
+
+@pytest.mark.parametrize("name", [name for name in AGENT_CLASSES if name.startswith("lightgbm")])
+def test_compiled_matches_predict_proba(name, flights):
+    agent = AGENT_CLASSES[name](compiled=True)
+    if not agent.is_loaded():
+        pytest.skip(f"{name} is not available: {agent.load_error}")
+    assert agent.engine is not None, f"{name} did not compile"
+
+    for size in (1, 16, len(flights)):
+        X = agent.build_input(flight_encoder.encode(flights[:size]))
+        np.testing.assert_allclose(
+            agent.engine.predict_proba(X), agent.model.predict_proba(X), rtol=0, atol=TOLERANCE
+        )